@@ -0,0 +1,71 @@
+# benchmarks/bench_artifacts.py
+"""
+Custo de registrar o mesmo artefato em vários runs: cópia no MLflow
+(`client.log_artifact`) contra o `ArtifactStore` (blob único + referência).
+Mede tempo por run e disco ocupado após `--n-runs` registros de um arquivo de
+`--size-mb` MB, em diretórios temporários.
+
+    python benchmarks/bench_artifacts.py --size-mb 50 --n-runs 10
+"""
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+
+from forecasting_workflow_engine.artifact_store import ArtifactStore
+
+app = typer.Typer()
+
+
+def _disk_usage(root: Path) -> int:
+    seen, total = set(), 0
+    for path in root.rglob("*"):
+        stat = path.stat()
+        if path.is_file() and stat.st_ino not in seen:
+            seen.add(stat.st_ino)
+            total += stat.st_size
+    return total
+
+
+@app.command()
+def main(size_mb: int = 50, n_runs: int = 10):
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    work = Path(tempfile.mkdtemp(prefix="fwe_bench_artifacts_"))
+    try:
+        model_file = work / "model.bin"
+        model_file.write_bytes(os.urandom(size_mb * 2 ** 20))
+        mlflow.set_tracking_uri(f"sqlite:///{work / 'mlflow.db'}")
+        client = MlflowClient()
+        experiment_id = client.create_experiment("bench_artifacts",
+                                                 artifact_location=(work / "mlruns").as_uri())
+        store = ArtifactStore(work / "store")
+
+        copy_times, store_times = [], []
+        for _ in range(n_runs):
+            run_id = client.create_run(experiment_id).info.run_id
+            start = time.perf_counter()
+            client.log_artifact(run_id, str(model_file), artifact_path="model")
+            copy_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            store.store(model_file, owner=run_id, name="model/model.bin")
+            store_times.append(time.perf_counter() - start)
+
+        print(f"{n_runs} runs registrando o mesmo arquivo de {size_mb} MB")
+        print(f"  cópia no MLflow : 1º {copy_times[0] * 1e3:8.1f} ms | demais "
+              f"{sum(copy_times[1:]) / max(n_runs - 1, 1) * 1e3:8.1f} ms | disco "
+              f"{_disk_usage(work / 'mlruns') / 2 ** 20:8.1f} MB")
+        print(f"  ArtifactStore   : 1º {store_times[0] * 1e3:8.1f} ms | demais "
+              f"{sum(store_times[1:]) / max(n_runs - 1, 1) * 1e3:8.1f} ms | disco "
+              f"{_disk_usage(store.root) / 2 ** 20:8.1f} MB")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    app()
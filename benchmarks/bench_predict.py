@@ -0,0 +1,90 @@
+# benchmarks/bench_predict.py
+"""
+Previsão pontual rápida (`fast_predict`) contra o `predict()` padrão do Prophet
+(com a simulação de incerteza) e o efeito no estudo do `optimize_prophet_params`.
+
+1. Para cada horizonte, mede `model.predict(future)` e `prophet_point_forecast`
+   (e os intervalos analíticos/simulados) em um modelo ajustado.
+2. Executa o estudo (que já usa a previsão pontual) e mede, nos mesmos folds,
+   quanto cada `predict()` padrão custaria a mais por ajuste; o tempo do estudo com
+   o caminho antigo é estimado como o tempo medido + ajustes x diferença média.
+
+    python benchmarks/bench_predict.py --length 1000 --n-trials 10
+"""
+import time
+import warnings
+from typing import List
+
+import numpy as np
+import typer
+
+from forecasting_workflow_engine.get_model import get_prophet_model
+from forecasting_workflow_engine.modeling.fast_predict import (
+    prophet_intervals,
+    prophet_point_forecast,
+)
+from forecasting_workflow_engine.synthetic import synthetic_frame
+
+app = typer.Typer()
+
+
+def _best_of(func, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@app.command()
+def main(length: int = 1000, horizons: List[int] = typer.Option([30, 365, 3650], "--horizon"),
+         n_trials: int = 10, n_splits: int = 3, repeats: int = 3, seed: int = 0):
+    import logging
+
+    import optuna
+    from sklearn.model_selection import TimeSeriesSplit
+
+    from forecasting_workflow_engine.modeling.hyperparam_optimization import (
+        optimize_prophet_params,
+    )
+
+    logging.getLogger("cmdstanpy").disabled = True
+    logging.getLogger("prophet").disabled = True
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    warnings.simplefilter("ignore")
+    df = synthetic_frame(length=length, seed=seed)
+
+    # --- Previsão por horizonte ---
+    model = get_prophet_model().fit(df)
+    print(f"Prophet em {length} pontos ({model.uncertainty_samples} amostras no predict padrão)")
+    for horizon in horizons:
+        future = model.make_future_dataframe(horizon, include_history=False)
+        default = _best_of(lambda: model.predict(future), repeats)
+        fast = _best_of(lambda: prophet_point_forecast(model, future), repeats)
+        analytic = _best_of(lambda: prophet_intervals(model, future, method="analytic"), repeats)
+        sample = _best_of(lambda: prophet_intervals(model, future, method="sample"), repeats)
+        print(f"  horizonte {horizon:>6}: predict {default * 1e3:8.1f} ms | pontual "
+              f"{fast * 1e3:7.1f} ms ({default / fast:5.1f}x) | intervalo analítico "
+              f"{analytic * 1e3:7.1f} ms | simulado {sample * 1e3:7.1f} ms")
+
+    # --- Estudo ---
+    extra = []
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(df):
+        fold_model = get_prophet_model().fit(df.iloc[train_idx])
+        val = df.iloc[val_idx][["ds"]]
+        extra.append(_best_of(lambda: fold_model.predict(val), repeats)
+                     - _best_of(lambda: prophet_point_forecast(fold_model, val["ds"]), repeats))
+
+    start = time.perf_counter()
+    _, report = optimize_prophet_params(df, n_trials=n_trials, n_splits=n_splits, seed=seed,
+                                        pruner="none", return_report=True)
+    wall = time.perf_counter() - start
+    n_fits = report["n_trials"] * n_splits
+    legacy = wall + n_fits * float(np.mean(extra))
+    print(f"Estudo ({n_trials} trials x {n_splits} folds): {wall:.1f}s com previsão pontual; "
+          f"~{legacy:.1f}s estimados com predict() padrão ({legacy / wall:.2f}x)")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,89 @@
+# benchmarks/bench_startup.py
+"""
+Mede o tempo de inicialização (import e `--help` dos executáveis) em processos novos
+e falha quando algum alvo passa do orçamento ou importa um backend pesado sem que
+nenhum modelo tenha sido pedido. Pensado para rodar na CI como guarda de regressão.
+
+    python benchmarks/bench_startup.py --budget 1.0
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import typer
+
+app = typer.Typer()
+
+# Módulos do pacote importados em um processo novo
+IMPORT_TARGETS = [
+    "forecasting_workflow_engine.get_model",
+    "forecasting_workflow_engine.modeling.train",
+    "forecasting_workflow_engine.modeling.predict",
+    "forecasting_workflow_engine.pipeline",
+]
+
+# Executáveis de terminal medidos com `--help`
+CLI_TARGETS = [
+    "forecasting_workflow_engine.modeling.train",
+    "forecasting_workflow_engine.pipeline",
+]
+
+# Bibliotecas que só podem ser importadas quando o backend correspondente é usado
+HEAVY_MODULES = ["prophet", "pmdarima", "statsmodels", "mlflow", "matplotlib",
+                 "sklearn", "scipy", "torch", "optuna"]
+
+_PROBE = (
+    "import importlib, json, sys; importlib.import_module({module!r}); "
+    "print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+)
+
+
+def _time_command(args: list, repeats: int) -> float:
+    """Mediana do tempo de parede de `args` em `repeats` processos novos."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def _heavy_imports(module: str) -> list:
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", probe], check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+@app.command()
+def main(repeats: int = 5, budget: float = 1.0):
+    baseline = _time_command([sys.executable, "-c", "pass"], repeats)
+    print(f"Interpretador vazio: {baseline * 1e3:8.1f} ms")
+
+    failures = []
+    for module in IMPORT_TARGETS:
+        elapsed = _time_command([sys.executable, "-c", f"import {module}"], repeats)
+        heavy = _heavy_imports(module)
+        print(f"  import {module:<48} {elapsed * 1e3:8.1f} ms  pesados={heavy or '-'}")
+        if elapsed > budget:
+            failures.append(f"import {module}: {elapsed:.2f}s > {budget:.2f}s")
+        if heavy:
+            failures.append(f"import {module} carregou {heavy}")
+
+    for module in CLI_TARGETS:
+        elapsed = _time_command([sys.executable, "-m", module, "--help"], repeats)
+        print(f"  {module + ' --help':<55} {elapsed * 1e3:8.1f} ms")
+        if elapsed > budget:
+            failures.append(f"{module} --help: {elapsed:.2f}s > {budget:.2f}s")
+
+    if failures:
+        for failure in failures:
+            print(f"FALHA: {failure}")
+        raise typer.Exit(code=1)
+    print(f"Todos os alvos dentro do orçamento de {budget:.2f}s")
+
+
+if __name__ == "__main__":
+    app()
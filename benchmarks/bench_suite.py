@@ -0,0 +1,237 @@
+# benchmarks/bench_suite.py
+"""
+Suíte de benchmarks offline sobre séries sintéticas (`synthetic.generate_series`).
+
+Mede fit/predict de cada backend registrado em `get_model.MODEL_BACKENDS`,
+`optimize_prophet_params`, `optimize_arima_order`, `evaluate_forecast`/
+`forecast_metrics` e `plot_forecast` em vários tamanhos, e grava um JSON que pode
+ser comparado entre commits.
+
+    python benchmarks/bench_suite.py run --length 100 --length 1000 --n-series 1000
+    python benchmarks/bench_suite.py compare reports/benchmarks/base.json \
+        reports/benchmarks/head.json
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+import warnings
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import typer
+
+from forecasting_workflow_engine.config import REPORTS_DIR
+from forecasting_workflow_engine.get_model import MODEL_BACKENDS, get_model, get_prophet_model
+from forecasting_workflow_engine.synthetic import generate_series
+
+app = typer.Typer()
+
+HORIZON = 30
+
+# Maior tamanho de série medido em cada caso (acima disso o caso é marcado como "skipped")
+MAX_LENGTH = {
+    "fit_predict:prophet": 100_000,
+    "fit_predict:arima": 100_000,
+    "fit_predict:autoarima": 10_000,
+    "fit_predict:global_mlp": 100_000,
+    "optimize_prophet_params": 10_000,
+    "optimize_arima_order": 10_000,
+    "evaluate_forecast": 1_000_000,
+    "forecast_metrics": 1_000_000,
+    "plot_forecast": 1_000_000,
+}
+
+
+# -------------------------------
+# Casos (uma chamada = uma medição)
+# -------------------------------
+def _fit_predict_prophet(ds, y, n_series):
+    model = get_prophet_model(seasonality={"daily_seasonality": False})
+    model.fit(pd.DataFrame({"ds": ds, "y": y[0]}))
+    model.predict(model.make_future_dataframe(HORIZON, include_history=False))
+
+
+def _fit_predict_arima(ds, y, n_series):
+    get_model("arima", y[0], order=(1, 1, 1)).fit().forecast(HORIZON)
+
+
+def _fit_predict_autoarima(ds, y, n_series):
+    get_model("autoarima", y[0], seasonal=False, stepwise=True, suppress_warnings=True,
+              error_action="ignore").predict(HORIZON)
+
+
+def _fit_predict_global_mlp(ds, y, n_series):
+    # Modelo global: um único ajuste com todas as séries
+    get_model("global_mlp", window=min(56, y.shape[1] // 2), horizon=HORIZON,
+              epochs=1).fit(y).predict(y)
+
+
+# Backend de `get_model` -> (caso de fit/predict, usa todas as séries?)
+def _fit_predict_baseline(method, ds, y, n_series):
+    # Baselines vetorizados: um único ajuste com todas as séries
+    get_model(method, season_length=7).fit(y).predict(HORIZON)
+
+
+BACKEND_CASES = {
+    "prophet": (_fit_predict_prophet, False),
+    "arima": (_fit_predict_arima, False),
+    "autoarima": (_fit_predict_autoarima, False),
+    "global_mlp": (_fit_predict_global_mlp, True),
+    **{method: (partial(_fit_predict_baseline, method), True)
+       for method in ("naive", "snaive", "drift", "ses", "holt", "holt_winters")},
+}
+
+
+def _optimize_prophet(ds, y, n_series):
+    from forecasting_workflow_engine.modeling.hyperparam_optimization import (
+        optimize_prophet_params,
+    )
+
+    optimize_prophet_params(pd.DataFrame({"ds": ds, "y": y[0]}), n_trials=3, seed=0)
+
+
+def _optimize_arima(ds, y, n_series):
+    from forecasting_workflow_engine.modeling.hyperparam_optimization import optimize_arima_order
+
+    optimize_arima_order(y[0], n_trials=5, p_range=(0, 2), d_range=(0, 1), q_range=(0, 2),
+                         seed=0, persist=False)
+
+
+def _evaluate_forecast(ds, y, n_series):
+    from forecasting_workflow_engine.modeling.evaluator import evaluate_forecast
+
+    for row in y:
+        evaluate_forecast(row, row * 1.01)
+
+
+def _forecast_metrics(ds, y, n_series):
+    from forecasting_workflow_engine.modeling.evaluator import forecast_metrics
+
+    forecast_metrics(y, y * 1.01, y_train=y)
+
+
+def _plot_forecast(ds, y, n_series):
+    from forecasting_workflow_engine.plots import plot_forecast
+
+    # Previsão com início NaN, como os valores ajustados dos baselines
+    y_pred = y[0].copy()
+    y_pred[:30] = np.nan
+    plot_forecast(pd.DataFrame({"ds": ds}), y[0], y_pred).canvas.draw()
+
+
+# nome -> (função, usa todas as séries?)
+CASES = {
+    **{f"fit_predict:{name}": case for name, case in BACKEND_CASES.items()},
+    "optimize_prophet_params": (_optimize_prophet, False),
+    "optimize_arima_order": (_optimize_arima, False),
+    "evaluate_forecast": (_evaluate_forecast, True),
+    "forecast_metrics": (_forecast_metrics, True),
+    "plot_forecast": (_plot_forecast, False),
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(func, ds, y, n_series: int, repeats: int) -> list:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(ds, y, n_series)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# -------------------------------
+# Comandos
+# -------------------------------
+@app.command()
+def run(
+    lengths: List[int] = typer.Option([100, 1000, 10000], "--length"),
+    n_series: int = 100,
+    repeats: int = 3,
+    cases: Optional[List[str]] = typer.Option(None, "--case"),
+    output: Optional[Path] = None,
+    seed: int = 0
+):
+    """Executa os casos e grava os tempos (mediana e mínimo) em JSON."""
+    commit = _git_commit()
+    output = output or REPORTS_DIR / "benchmarks" / f"{commit or 'local'}.json"
+    selected = cases or list(CASES)
+    missing = sorted(set(MODEL_BACKENDS) - set(BACKEND_CASES))
+    if missing:
+        print(f"Backends sem caso de benchmark: {missing}")
+
+    results = []
+    for length in lengths:
+        ds, Y = generate_series(n_series=n_series, length=length, seed=seed)
+        for name in selected:
+            func, all_series = CASES[name]
+            count = n_series if all_series else 1
+            row = {"case": name, "length": length, "n_series": count, "repeats": repeats}
+            if length > MAX_LENGTH.get(name, float("inf")):
+                results.append({**row, "status": "skipped"})
+                continue
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    times = _measure(func, ds, Y if all_series else Y[:1], count, repeats)
+            except Exception as e:
+                results.append({**row, "status": "failed", "error": f"{type(e).__name__}: {e}"})
+                print(f"  {name:<28} length={length:<8} FALHOU ({type(e).__name__})")
+                continue
+            results.append({**row, "status": "ok", "median_s": statistics.median(times),
+                            "min_s": min(times)})
+            print(f"  {name:<28} length={length:<8} séries={count:<6} "
+                  f"{statistics.median(times) * 1e3:10.1f} ms")
+
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Resultados gravados em {output}")
+
+
+@app.command()
+def compare(base: Path, head: Path, threshold: float = 1.2):
+    """
+    Compara dois arquivos de resultados por (caso, tamanho, séries) e falha quando
+    algum caso ficou mais de `threshold` vezes mais lento.
+    """
+    def load(path):
+        rows = json.loads(path.read_text())["results"]
+        return {(r["case"], r["length"], r["n_series"]): r for r in rows if r["status"] == "ok"}
+
+    base_rows, head_rows = load(base), load(head)
+    regressions = []
+    for key in sorted(set(base_rows) & set(head_rows)):
+        ratio = head_rows[key]["median_s"] / base_rows[key]["median_s"]
+        flag = "REGRESSÃO" if ratio > threshold else ""
+        print(f"  {key[0]:<28} length={key[1]:<8} séries={key[2]:<6} "
+              f"{base_rows[key]['median_s'] * 1e3:10.1f} ms -> "
+              f"{head_rows[key]['median_s'] * 1e3:10.1f} ms  ({ratio:5.2f}x) {flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
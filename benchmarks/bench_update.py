@@ -0,0 +1,72 @@
+# benchmarks/bench_update.py
+"""
+Paridade da atualização incremental do ARIMA (`modeling/update.py`): um modelo salvo
+e restaurado que recebe as novas observações (`_append_arima`, repetido em
+`--n-updates` lotes com save/load entre eles) deve prever o mesmo que o ajuste
+original com `append` no histórico completo. Reporta a maior diferença nas previsões
+e a latência de cada atualização.
+
+    python benchmarks/bench_update.py --length 365 --n-updates 3 --batch 14
+"""
+import shutil
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import typer
+
+from forecasting_workflow_engine.modeling.serialization import load_model, save_model
+from forecasting_workflow_engine.modeling.update import _append_arima
+
+app = typer.Typer()
+
+# (ordem, ordem sazonal, tendência) comparados
+CASES = [
+    ((1, 1, 1), (0, 0, 0, 0), None),
+    ((1, 0, 1), (0, 0, 0, 0), "ct"),
+    ((2, 1, 1), (1, 1, 0, 12), None),
+]
+
+
+@app.command()
+def main(length: int = 240, n_updates: int = 3, batch: int = 12, horizon: int = 24,
+         tolerance: float = 1e-6, seed: int = 0):
+    import pmdarima as pm
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(length + n_updates * batch)
+    y = 100 + 0.5 * t + 10 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 3, len(t))
+    work = Path(tempfile.mkdtemp(prefix="fwe_bench_update_"))
+
+    try:
+        failed = False
+        for order, seasonal_order, trend in CASES:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                fitted = pm.ARIMA(order=order, seasonal_order=seasonal_order,
+                                  trend=trend).fit(y[:length])
+                reference = fitted.arima_res_.append(y[length:], refit=False).forecast(horizon)
+
+                model, latencies = fitted, []
+                for i in range(n_updates):
+                    forecaster = load_model(save_model(model, work / "model.json.gz"))
+                    start = time.perf_counter()
+                    y_new = y[length + i * batch:length + (i + 1) * batch]
+                    model = _append_arima(forecaster, y_new)
+                    latencies.append(time.perf_counter() - start)
+                diff = float(np.max(np.abs(model.forecast(horizon) - reference)))
+
+            failed |= diff > tolerance
+            print(f"  ARIMA{order}{seasonal_order} tendência={trend}: "
+                  f"diferença máxima {diff:.2e} | "
+                  f"atualização {np.mean(latencies) * 1e3:.1f} ms "
+                  f"({'ok' if diff <= tolerance else 'DIVERGE'})")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    raise typer.Exit(code=int(failed))
+
+
+if __name__ == "__main__":
+    app()
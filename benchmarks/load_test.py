@@ -0,0 +1,126 @@
+# benchmarks/load_test.py
+"""
+Teste de carga do serviço de previsões (`modeling/serve.py`) em localhost.
+
+Sobe o servidor em um subprocesso (ou usa um já em execução com `--no-spawn`),
+abre `--concurrency` conexões keep-alive e dispara `GET /forecast` por `--duration`
+segundos, escolhendo modelo e horizonte ao acaso entre `--horizon` (horizontes
+repetidos: respostas do cache) ou, com `--unique-horizons`, entre 1 e
+`--max-horizon` (mais cálculos, agrupados em micro-lotes). Reporta p50/p99 e
+requisições/s vistos pelo cliente e as estatísticas do servidor (`/stats`).
+
+    python benchmarks/load_test.py --concurrency 64 --duration 10
+    python benchmarks/load_test.py --unique-horizons --max-horizon 365
+"""
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import List
+
+import numpy as np
+import typer
+
+app = typer.Typer()
+
+
+async def _get(reader, writer, host: str, target: str) -> tuple:
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = next(int(line.split(b":", 1)[1]) for line in head.split(b"\r\n")
+                  if line.lower().startswith(b"content-length:"))
+    return status, await reader.readexactly(length)
+
+
+async def _wait_ready(host: str, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await _get(reader, writer, host, "/health")
+            writer.close()
+            return
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Servidor em {host}:{port} não respondeu em {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+async def _client(host: str, port: int, models: list, horizons, deadline: float, rng,
+                  intervals: str, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    suffix = f"&intervals={intervals}" if intervals else ""
+    try:
+        while time.monotonic() < deadline:
+            target = f"/forecast?model={rng.choice(models)}&horizon={horizons(rng)}{suffix}"
+            start = time.perf_counter()
+            status, _ = await _get(reader, writer, host, target)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _run(host: str, port: int, concurrency: int, duration: float, horizons,
+               intervals: str, seed: int) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    models = json.loads((await _get(reader, writer, host, "/models"))[1])["models"]
+    if not models:
+        raise RuntimeError("O servidor não tem modelos carregados (rode `train()` antes)")
+    latencies, errors = [], []
+    start = time.monotonic()
+    await asyncio.gather(*(
+        _client(host, port, models, horizons, start + duration, random.Random(seed + i),
+                intervals, latencies, errors)
+        for i in range(concurrency)))
+    elapsed = time.monotonic() - start
+    server_stats = json.loads((await _get(reader, writer, host, "/stats"))[1])
+    writer.close()
+    latencies = np.asarray(latencies) * 1e3
+    return {"models": len(models), "requests": len(latencies), "errors": len(errors),
+            "rps": len(latencies) / elapsed, "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)), "server": server_stats}
+
+
+@app.command()
+def main(host: str = "127.0.0.1", port: int = 8765, spawn: bool = True, concurrency: int = 32,
+         duration: float = 10.0, horizons: List[int] = typer.Option([7, 14, 30], "--horizon"),
+         unique_horizons: bool = False, max_horizon: int = 365, intervals: str = None,
+         batch_window_ms: float = 2.0, seed: int = 0):
+    server = None
+    if spawn:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "forecasting_workflow_engine.modeling.serve", "--host", host,
+             "--port", str(port), "--batch-window-ms", str(batch_window_ms)],
+            stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(_wait_ready(host, port, timeout=120))
+        if unique_horizons:
+            pick = lambda rng: rng.randint(1, max_horizon)  # noqa: E731
+        else:
+            pick = lambda rng: rng.choice(horizons)  # noqa: E731
+        result = asyncio.run(_run(host, port, concurrency, duration, pick, intervals, seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    server_stats = result.pop("server")
+    print(f"{result['requests']} requisições em {duration:.0f}s, {concurrency} conexões, "
+          f"{result['models']} modelos ({result['errors']} erros)")
+    print(f"  cliente : {result['rps']:9.1f} req/s | p50 {result['p50_ms']:7.2f} ms | "
+          f"p99 {result['p99_ms']:7.2f} ms")
+    print(f"  servidor: {server_stats['rps']:9.1f} req/s | p50 {server_stats['p50_ms']:7.2f} ms | "
+          f"p99 {server_stats['p99_ms']:7.2f} ms | respostas em cache "
+          f"{server_stats['response_hits']} | previsões fatiadas "
+          f"{server_stats['forecast_hits']} | lotes {server_stats['batches']} "
+          f"(média {server_stats['mean_batch_size']:.1f} req/lote)")
+
+
+if __name__ == "__main__":
+    app()
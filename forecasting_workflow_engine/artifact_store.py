@@ -0,0 +1,249 @@
+# forecasting_workflow_engine/artifact_store.py
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from forecasting_workflow_engine.config import ARTIFACT_STORE_DIR, configure_logging
+
+# Tamanho dos blocos lidos ao calcular o hash/copiar (arquivos grandes não vão
+# inteiros para a memória)
+CHUNK_SIZE = 1 << 20
+
+# Blobs mais novos que isso não são coletados (podem ter acabado de ser gravados
+# por um processo que ainda não escreveu a referência)
+GC_MIN_AGE_S = 3600.0
+
+
+def file_digest(path) -> str:
+    """sha256 do arquivo, lido em blocos de `CHUNK_SIZE`."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_hashing(src: Path, dst: Path) -> str:
+    """Copia `src` para `dst` em blocos calculando o sha256 do que foi copiado."""
+    digest = hashlib.sha256()
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        for chunk in iter(lambda: fin.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            fout.write(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Armazenamento local de artefatos endereçado por conteúdo.
+
+    Cada arquivo é guardado uma única vez em `blobs/<ab>/<sha256>` (somente leitura);
+    quem o registra grava uma referência pequena em `refs/<dono>/<caminho>.json`
+    (ex.: o run do MLflow e o caminho do artefato). Registrar de novo um arquivo
+    idêntico só calcula o hash e grava a referência, então retreinos que produzem o
+    mesmo modelo não ocupam mais disco nem tempo de envio. `gc()` remove os blobs
+    que nenhuma referência usa.
+
+    Args:
+        root: diretório do armazenamento.
+    """
+
+    def __init__(self, root: Path = ARTIFACT_STORE_DIR):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.refs = self.root / "refs"
+
+    def path(self, digest: str) -> Path:
+        return self.blobs / digest[:2] / digest
+
+    def put(self, local_path) -> tuple:
+        """
+        Guarda o arquivo (se o conteúdo ainda não estiver no armazenamento).
+
+        Returns:
+            tuple: (sha256, tamanho em bytes, True se o blob já existia)
+        """
+        local_path = Path(local_path)
+        digest = file_digest(local_path)
+        blob = self.path(digest)
+        if blob.exists():
+            return digest, blob.stat().st_size, True
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = blob.with_name(f".{digest}.{os.getpid()}")
+        copied = _copy_hashing(local_path, temp_file)
+        if copied != digest:
+            # O arquivo mudou entre o hash e a cópia: vale o conteúdo copiado
+            digest, blob = copied, self.path(copied)
+            blob.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(temp_file, 0o444)
+        os.replace(temp_file, blob)
+        return digest, blob.stat().st_size, False
+
+    def add_ref(self, owner: str, name: str, digest: str, size: int, **extra) -> dict:
+        """Grava (ou substitui) a referência `owner/name` para o blob `digest`."""
+        ref = {"sha256": digest, "size": size, "name": Path(name).name, **extra}
+        ref_file = self.refs / owner / f"{name}.json"
+        ref_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = ref_file.with_name(f".{ref_file.name}.{os.getpid()}")
+        temp_file.write_text(json.dumps(ref))
+        os.replace(temp_file, ref_file)
+        return ref
+
+    def store(self, local_path, owner: str, name: str = None, **extra) -> dict:
+        """`put` + `add_ref`; `name` padrão: o nome do arquivo."""
+        start = time.perf_counter()
+        digest, size, existed = self.put(local_path)
+        ref = self.add_ref(owner, name or Path(local_path).name, digest, size, **extra)
+        logger.debug(f"Artefato {ref['name']} -> {digest[:12]} "
+                     f"({'reaproveitado' if existed else 'novo'}, "
+                     f"{time.perf_counter() - start:.3f}s)")
+        return {**ref, "deduplicated": existed}
+
+    def fetch(self, ref: dict, destination) -> Path:
+        """Copia o blob de uma referência para `destination` (arquivo ou diretório)."""
+        destination = Path(destination)
+        if destination.is_dir():
+            destination = destination / ref["name"]
+        shutil.copyfile(self.path(ref["sha256"]), destination)
+        return destination
+
+    # -------------------------------
+    # Manutenção
+    # -------------------------------
+    def _ref_files(self) -> list:
+        return list(self.refs.rglob("*.json")) if self.refs.exists() else []
+
+    def _blob_files(self) -> list:
+        if not self.blobs.exists():
+            return []
+        return [f for f in self.blobs.glob("*/*") if f.is_file() and not f.name.startswith(".")]
+
+    def _ref_entries(self):
+        """Referências individuais e as entradas dos manifestos de `dedupe`."""
+        for ref_file in self._ref_files():
+            try:
+                doc = json.loads(ref_file.read_text())
+            except (OSError, ValueError):
+                logger.warning(f"Referência ilegível ignorada: {ref_file}")
+                continue
+            yield from doc["files"].values() if "files" in doc else [doc]
+
+    def referenced(self) -> set:
+        return {ref["sha256"] for ref in self._ref_entries()}
+
+    def drop_owner(self, owner: str):
+        """Remove todas as referências de um dono (ex.: um run apagado)."""
+        shutil.rmtree(self.refs / owner, ignore_errors=True)
+
+    def gc(self, min_age_s: float = GC_MIN_AGE_S) -> dict:
+        """Remove os blobs sem referência gravados há mais de `min_age_s` segundos."""
+        referenced = self.referenced()
+        now = time.time()
+        removed, freed = 0, 0
+        for blob in self._blob_files():
+            stat = blob.stat()
+            if blob.name in referenced or now - stat.st_mtime < min_age_s:
+                continue
+            blob.unlink()
+            removed += 1
+            freed += stat.st_size
+        logger.info(f"GC do armazenamento de artefatos: {removed} blobs removidos "
+                    f"({freed / 2 ** 20:.1f} MiB)")
+        return {"removed": removed, "freed_bytes": freed}
+
+    def stats(self) -> dict:
+        """Tamanho físico (blobs) contra o lógico (soma das referências)."""
+        blobs = self._blob_files()
+        stored = sum(f.stat().st_size for f in blobs)
+        refs = list(self._ref_entries())
+        logical = sum(ref["size"] for ref in refs)
+        return {"blobs": len(blobs), "refs": len(refs), "stored_bytes": stored,
+                "logical_bytes": logical, "dedup_ratio": logical / stored if stored else 1.0}
+
+    def dedupe(self, directory) -> dict:
+        """
+        Guarda cada arquivo de `directory` (ex.: `notebooks/mlartifacts`) e substitui as
+        cópias por hard links para o blob, liberando o espaço das duplicatas.
+        Arquivos em outro sistema de arquivos são apenas referenciados.
+        """
+        directory = Path(directory)
+        files, linked, freed = {}, 0, 0
+        for path in sorted(p for p in directory.rglob("*") if p.is_file() and not p.is_symlink()):
+            digest, size, existed = self.put(path)
+            files[str(path.relative_to(directory))] = {"sha256": digest, "size": size}
+            blob = self.path(digest)
+            if path.stat().st_ino == blob.stat().st_ino:
+                continue
+            temp_link = path.with_name(f".{path.name}.link")
+            try:
+                os.link(blob, temp_link)
+            except OSError:
+                continue
+            os.replace(temp_link, path)
+            linked += 1
+            freed += size if existed else 0
+
+        # Um manifesto por diretório (e não uma referência por arquivo)
+        key = hashlib.sha1(str(directory.resolve()).encode()).hexdigest()[:12]
+        manifest = self.refs / "dedupe" / f"{key}.json"
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps({"directory": str(directory.resolve()), "files": files}))
+        logger.info(f"{directory}: {linked} arquivos ligados ao armazenamento "
+                    f"(~{freed / 2 ** 20:.1f} MiB de duplicatas liberados)")
+        return {"linked": linked, "freed_bytes": freed}
+
+
+def _deleted_runs(owners: list) -> list:
+    """Runs do MLflow (entre `owners`) apagados ou inexistentes."""
+    from mlflow.exceptions import MlflowException
+    from mlflow.tracking import MlflowClient
+
+    client, deleted = MlflowClient(), []
+    for run_id in owners:
+        try:
+            if client.get_run(run_id).info.lifecycle_stage == "deleted":
+                deleted.append(run_id)
+        except MlflowException:
+            deleted.append(run_id)
+    return deleted
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def gc(
+        prune_runs: bool = typer.Option(
+            False, help="Remove antes as referências de runs apagados"),
+        min_age_s: float = GC_MIN_AGE_S
+    ):
+        store = ArtifactStore()
+        if prune_runs and store.refs.exists():
+            owners = [p.name for p in store.refs.iterdir() if p.is_dir() and p.name != "dedupe"]
+            for run_id in _deleted_runs(owners):
+                store.drop_owner(run_id)
+                logger.info(f"Referências do run apagado {run_id} removidas")
+        store.gc(min_age_s)
+        logger.success(f"Armazenamento: {store.stats()}")
+
+    @app.command()
+    def stats():
+        logger.success(f"Armazenamento: {ArtifactStore().stats()}")
+
+    @app.command()
+    def dedupe(directory: Path):
+        ArtifactStore().dedupe(directory)
+
+    configure_logging()
+    app()
@@ -4,7 +4,6 @@ import os
 
 # --- Diretório raiz do projeto ---
 PROJ_ROOT = Path(__file__).resolve().parent.parent
-logger.info(f"PROJ_ROOT path is: {PROJ_ROOT}")
 
 # --- Diretórios de dados ---
 RAW_DATA_DIR = PROJ_ROOT / "data/raw"
@@ -15,14 +14,27 @@ PROCESSED_DATA_DIR = PROJ_ROOT / "data/processed"
 MODELS_DIR = PROJ_ROOT / "models"
 REPORTS_DIR = PROJ_ROOT / "reports"
 
+# --- Diretório de caches locais (reaproveitados entre execuções) ---
+CACHE_DIR = PROJ_ROOT / ".cache"
+
+# --- Armazenamento de artefatos por conteúdo (não é cache: runs apontam para ele) ---
+ARTIFACT_STORE_DIR = Path(os.environ.get("FWE_ARTIFACT_STORE", PROJ_ROOT / "artifacts"))
+
 # --- Configuração segura do Loguru ---
-# Remove todos os handlers existentes para evitar erros
-logger.remove()  
+def configure_logging(level: str = "INFO"):
+    """
+    Configura o handler de console do Loguru. Chamada pelos executáveis de terminal
+    (não no import), para que importar o pacote não tenha efeitos colaterais.
+    """
+    # Remove todos os handlers existentes para evitar erros
+    logger.remove()
 
-# Adiciona handler padrão para console com nível INFO
-logger.add(
-    sink=os.sys.stdout,
-    level="INFO",
-    colorize=True,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | <cyan>{module}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - {message}"
-)
+    # Adiciona handler padrão para console com nível INFO
+    logger.add(
+        sink=os.sys.stdout,
+        level=level,
+        colorize=True,
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | "
+               "<cyan>{module}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - {message}"
+    )
+    logger.info(f"PROJ_ROOT path is: {PROJ_ROOT}")
@@ -1,72 +1,194 @@
 # forecasting_workflow_engine/dataset.py
+import json
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import typer
 from loguru import logger
 from pathlib import Path
 from tqdm import tqdm
 
-from forecasting_workflow_engine.config import PROCESSED_DATA_DIR
+from forecasting_workflow_engine.config import CACHE_DIR, PROCESSED_DATA_DIR, configure_logging
+from forecasting_workflow_engine.profiling import span
 
 app = typer.Typer()
 
 # --- Criar pasta processed caso não exista ---
 PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+DATASET_CACHE_DIR = CACHE_DIR / "datasets"
+
+
+# ---- Cache binário ----
+@contextmanager
+def _replacing(path: Path):
+    """Arquivo temporário (binário) que substitui `path` atomicamente ao fechar sem erro."""
+    temp_file = path.with_name(f".{path.name}.{os.getpid()}")
+    try:
+        with open(temp_file, "wb") as f:
+            yield f
+        os.replace(temp_file, path)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+def _write_binary_cache(file_path: Path, date_col: str, value_col: str, stat) -> dict:
+    """
+    Lê o CSV uma única vez (datas já convertidas) e grava cada coluna como `.npy`,
+    com um sidecar JSON descrevendo o schema e a versão (mtime/tamanho) do CSV.
+    """
+    df = pd.read_csv(file_path)
+    columns = {
+        date_col: pd.to_datetime(df[date_col], format="ISO8601").to_numpy(dtype="datetime64[ns]"),
+        value_col: df[value_col].to_numpy(),
+    }
+    DATASET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Cada arquivo é gravado em um temporário e trocado com `os.replace`; o schema vai
+    # por último, então um leitor concorrente nunca vê um schema novo com colunas antigas
+    # ou incompletas (e quem já mapeou o `.npy` antigo continua com ele)
+    for col, values in columns.items():
+        with _replacing(DATASET_CACHE_DIR / f"{file_path.stem}.{col}.npy") as f:
+            np.save(f, values)
+    schema = {
+        "source": str(file_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "columns": {col: str(values.dtype) for col, values in columns.items()},
+    }
+    with _replacing(DATASET_CACHE_DIR / f"{file_path.stem}.schema.json") as f:
+        f.write(json.dumps(schema).encode())
+    logger.info(f"Cache binário de {file_path.name} gravado em {DATASET_CACHE_DIR}")
+    return schema
+
+
+@lru_cache(maxsize=32)
+def _read_binary(file_path: Path, mtime_ns: int, size: int, date_col: str, value_col: str):
+    """
+    Carrega as colunas do cache binário via memory-map, regravando o cache quando o
+    CSV mudou. Memoizado por (arquivo, mtime, tamanho): um CSV alterado gera nova chave.
+    """
+    schema_file = DATASET_CACHE_DIR / f"{file_path.stem}.schema.json"
+    schema = json.loads(schema_file.read_text()) if schema_file.exists() else {}
+    if (schema.get("mtime_ns"), schema.get("size")) != (mtime_ns, size) \
+            or set(schema.get("columns", {})) != {date_col, value_col}:
+        _write_binary_cache(file_path, date_col, value_col, file_path.stat())
+    dates, values = (np.load(DATASET_CACHE_DIR / f"{file_path.stem}.{col}.npy", mmap_mode="r")
+                     for col in (date_col, value_col))
+    return pd.DataFrame({date_col: dates}), pd.Series(values, name=value_col)
+
+
+def _read_dataset(file_path: Path, date_col: str, value_col: str):
+    """
+    Retorna (X, y) do CSV processado sem reprocessar o texto: a primeira leitura grava
+    o cache binário, as seguintes usam memory-map e, no mesmo processo, o LRU em memória.
+    Devolve cópias para que o chamador possa alterar os dados livremente.
+    """
+    stat = file_path.stat()
+    X, y = _read_binary(file_path, stat.st_mtime_ns, stat.st_size, date_col, value_col)
+    return X.copy(), y.copy()
+
+
 # ---- Dataset loaders ----
+# nome -> (arquivo em PROCESSED_DATA_DIR, coluna de data, coluna de valor)
+DATASET_FILES = {
+    "air_passengers": ("air_passengers.csv", "Month", "Passengers"),
+    "sunspots": ("sunspots.csv", "Month", "Sunspots"),
+    "covid_us": ("us_covid_daily.csv", "Date", "Cases"),
+    "synthetic": ("synthetic_daily.csv", "Date", "Value"),
+}
+
 def _load_air_passengers():
-    file_path = PROCESSED_DATA_DIR / "air_passengers.csv"
+    file_path = PROCESSED_DATA_DIR / DATASET_FILES["air_passengers"][0]
     if not file_path.exists():
         url = "https://raw.githubusercontent.com/jbrownlee/Datasets/master/airline-passengers.csv"
         df = pd.read_csv(url)
         df.columns = ["Month", "Passengers"]
         df.to_csv(file_path, index=False)
         logger.info(f"AirPassengers dataset baixado e salvo em {file_path}")
-    else:
-        df = pd.read_csv(file_path)
-        logger.info(f"AirPassengers dataset carregado de {file_path}")
-    return df[["Month"]], df["Passengers"]
+    return _read_dataset(file_path, *DATASET_FILES["air_passengers"][1:])
 
 def _load_sunspots():
-    file_path = PROCESSED_DATA_DIR / "sunspots.csv"
+    file_path = PROCESSED_DATA_DIR / DATASET_FILES["sunspots"][0]
     if not file_path.exists():
         url = "https://raw.githubusercontent.com/jbrownlee/Datasets/master/monthly-sunspots.csv"
         df = pd.read_csv(url)
         df.columns = ["Month", "Sunspots"]
         df.to_csv(file_path, index=False)
         logger.info(f"Sunspots dataset baixado e salvo em {file_path}")
-    else:
-        df = pd.read_csv(file_path)
-        logger.info(f"Sunspots dataset carregado de {file_path}")
-    return df[["Month"]], df["Sunspots"]
+    return _read_dataset(file_path, *DATASET_FILES["sunspots"][1:])
 
 def _load_covid_us():
-    file_path = PROCESSED_DATA_DIR / "us_covid_daily.csv"
+    file_path = PROCESSED_DATA_DIR / DATASET_FILES["covid_us"][0]
     if not file_path.exists():
         url = "https://raw.githubusercontent.com/nytimes/covid-19-data/master/us.csv"
         df = pd.read_csv(url, parse_dates=["date"])
         df = df[["date", "cases"]].rename(columns={"date": "Date", "cases": "Cases"})
         df.to_csv(file_path, index=False)
         logger.info(f"US COVID dataset baixado e salvo em {file_path}")
-    else:
-        df = pd.read_csv(file_path)
-        logger.info(f"US COVID dataset carregado de {file_path}")
-    return df[["Date"]], df["Cases"]
+    return _read_dataset(file_path, *DATASET_FILES["covid_us"][1:])
+
+def _load_synthetic():
+    # Série diária gerada localmente (sem rede): tendência, sazonalidades semanal e anual
+    file_path = PROCESSED_DATA_DIR / DATASET_FILES["synthetic"][0]
+    if not file_path.exists():
+        from forecasting_workflow_engine.synthetic import synthetic_frame
+
+        df = synthetic_frame(length=3 * 365, seed=0)
+        df.columns = ["Date", "Value"]
+        df.to_csv(file_path, index=False)
+        logger.info(f"Dataset sintético gerado e salvo em {file_path}")
+    return _read_dataset(file_path, *DATASET_FILES["synthetic"][1:])
 
 DATASET_MAP = {
     "air_passengers": _load_air_passengers,
     "sunspots": _load_sunspots,
-    "covid_us": _load_covid_us
+    "covid_us": _load_covid_us,
+    "synthetic": _load_synthetic
 }
 
 # --- Funções públicas ---
 def fetch_dataset(name: str):
+    # Série de uma coleção em formato longo: "<coleção>:<id da série>"
+    if ":" in name:
+        from forecasting_workflow_engine.series_collection import fetch_series
+
+        collection, series_id = name.split(":", 1)
+        with span("fetch_dataset", dataset=name):
+            X, y = fetch_series(collection, series_id)
+        logger.info(f"Série '{series_id}' da coleção '{collection}' carregada com sucesso")
+        return X, y
+
     name = name.lower()
     if name not in DATASET_MAP:
         raise ValueError(f"Dataset '{name}' não suportado.")
-    X, y = DATASET_MAP[name]()
+    with span("fetch_dataset", dataset=name):
+        X, y = DATASET_MAP[name]()
     logger.info(f"Dataset '{name}' carregado com sucesso")
     return X, y
 
+def append_observations(name: str, new_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta novas observações ao CSV processado do dataset.
+    `new_rows` deve ter a coluna de data na primeira posição e a de valor na segunda;
+    datas que não são posteriores à última do arquivo são ignoradas.
+    Retorna as linhas efetivamente acrescentadas.
+    """
+    name = name.lower()
+    if name not in DATASET_FILES:
+        raise ValueError(f"Dataset '{name}' não suportado.")
+    file_name, date_col, value_col = DATASET_FILES[name]
+    X, y = fetch_dataset(name)
+    new = pd.DataFrame({date_col: pd.to_datetime(new_rows.iloc[:, 0]),
+                        value_col: new_rows.iloc[:, 1].to_numpy()})
+    new = new[new[date_col] > X[date_col].max()]
+    file_path = PROCESSED_DATA_DIR / file_name
+    new.to_csv(file_path, mode="a", header=False, index=False)
+    logger.info(f"{len(new)} observações acrescentadas a {file_path}")
+    return new
+
 def save_dataset(X: pd.DataFrame, y: pd.Series, dataset_name: str):
     output_path = PROCESSED_DATA_DIR / f"{dataset_name}_processed.csv"
     df_to_save = pd.concat([X, y], axis=1)
@@ -88,4 +210,5 @@ def main(dataset_name: str = "air_passengers"):
     logger.success(f"Dataset '{dataset_name}' processado e salvo com sucesso.")
 
 if __name__ == "__main__":
+    configure_logging()
     app()
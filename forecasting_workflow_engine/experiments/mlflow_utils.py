@@ -1,18 +1,33 @@
-import mlflow
+import atexit
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 from loguru import logger
 
+from forecasting_workflow_engine.artifact_store import ArtifactStore
+from forecasting_workflow_engine.profiling import is_enabled, span, stage_metrics, timed
+
 # -------------------------------
 # Experimento MLflow seguro
 # -------------------------------
-def start_experiment(experiment_name: str, run_name: str = None):
+@timed("mlflow_start_run")
+def start_experiment(experiment_name: str, run_name: str = None, parent_run_id: str = None):
     """
     Inicia um experimento MLflow de forma segura:
     - Cria ou seleciona experimento.
     - Não inicia novo run se já houver run ativo.
+    - Com `parent_run_id`, o novo run é registrado como filho (nested) desse run,
+      inclusive quando o pai foi aberto em outro processo.
     """
+    import mlflow
+
     # Cria ou seleciona experimento
     mlflow.set_experiment(experiment_name)
 
@@ -22,45 +37,281 @@ def start_experiment(experiment_name: str, run_name: str = None):
         logger.warning(f"Run ativo existente: {active_run.info.run_id}. Usando este run.")
         return active_run
     else:
-        run = mlflow.start_run(run_name=run_name)
+        tags = {"mlflow.parentRunId": parent_run_id} if parent_run_id else None
+        run = mlflow.start_run(run_name=run_name, tags=tags)
         logger.info(f"Novo run iniciado: {run.info.run_id} | Experimento: {experiment_name}")
         return run
 
+# -------------------------------
+# Logger assíncrono
+# -------------------------------
+class _AsyncLogger:
+    """
+    Bufferiza métricas, parâmetros e artefatos e os envia ao MLflow a partir de
+    uma thread de fundo: métricas/parâmetros via `log_batch` (em lotes dentro dos
+    limites da API) e artefatos via `log_artifact`. Figuras podem ser enfileiradas
+    como funções de renderização, executadas na própria thread. Arquivos temporários
+    ficam em um diretório privado, não no diretório de trabalho.
+
+    Artefatos enviados com `stored=True` vão para o `ArtifactStore` (um blob por
+    conteúdo) e o run recebe só a referência `<nome>.ref.json` e a tag
+    `artifact_sha256.<caminho>`, em vez de uma cópia do arquivo. Arquivos existentes
+    são guardados na chamada (só a referência é enviada em segundo plano).
+    """
+    MAX_METRICS = 1000
+    MAX_PARAMS = 100
+
+    def __init__(self, flush_interval: float = 2.0, store: ArtifactStore = None):
+        self.flush_interval = flush_interval
+        self.store = store or ArtifactStore()
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="fwe_mlflow_"))
+        self._reset()
+
+    def _reset(self):
+        # Também usado no filho após fork: a thread e o conteúdo da fila não são herdados
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._params = {}
+        self._tasks = queue.Queue()
+        self._thread = None
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="mlflow-logger", daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _run_id() -> str:
+        import mlflow
+
+        run = mlflow.active_run() or mlflow.start_run()
+        return run.info.run_id
+
+    def add_metrics(self, metrics: dict):
+        from mlflow.entities import Metric
+
+        run_id, ts = self._run_id(), int(time.time() * 1000)
+        with self._lock:
+            self._metrics.setdefault(run_id, []).extend(
+                Metric(k, float(v), ts, 0) for k, v in metrics.items())
+        self._ensure_worker()
+
+    def add_params(self, params: dict):
+        from mlflow.entities import Param
+
+        run_id = self._run_id()
+        with self._lock:
+            self._params.setdefault(run_id, []).extend(Param(k, str(v)) for k, v in params.items())
+        self._ensure_worker()
+
+    def add_artifact(self, local_path: Path, artifact_path: str = None, cleanup: bool = False,
+                     stored: bool = False):
+        run_id = self._run_id()
+        if stored:
+            # O conteúdo vai para o armazenamento já, na thread de quem chama: o arquivo
+            # pode ser sobrescrito logo depois (ex.: pelo próximo `train()` do mesmo
+            # dataset); só o envio da referência fica para a thread de fundo
+            ref_name, ref = self._store(run_id, str(local_path), artifact_path)
+            if cleanup:
+                shutil.rmtree(Path(local_path).parent, ignore_errors=True)
+            self._tasks.put(("ref", run_id, ref_name, ref))
+        else:
+            self._tasks.put(("artifact", run_id, str(local_path), artifact_path, cleanup))
+        self._ensure_worker()
+
+    def add_figure(self, render, artifact_name: str, save_to: Path = None, stored: bool = False):
+        self._tasks.put(("figure", self._run_id(), render, artifact_name, save_to, stored))
+        self._ensure_worker()
+
+    def private_path(self, file_name: str) -> Path:
+        """Caminho exclusivo no diretório temporário preservando o nome do arquivo."""
+        return Path(tempfile.mkdtemp(dir=self.tmp_dir)) / file_name
+
+    def _send_batches(self, client):
+        with self._lock:
+            metrics, self._metrics = self._metrics, {}
+            params, self._params = self._params, {}
+        if not metrics and not params:
+            return
+        with span("mlflow_log_batch"):
+            self._send_batch_items(client, metrics, params)
+
+    def _send_batch_items(self, client, metrics: dict, params: dict):
+        for run_id in set(metrics) | set(params):
+            run_metrics, run_params = metrics.get(run_id, []), params.get(run_id, [])
+            for i in range(0, len(run_metrics), self.MAX_METRICS):
+                client.log_batch(run_id, metrics=run_metrics[i:i + self.MAX_METRICS])
+            for i in range(0, len(run_params), self.MAX_PARAMS):
+                client.log_batch(run_id, params=run_params[i:i + self.MAX_PARAMS])
+
+    def _store(self, run_id: str, local_path: str, artifact_path: str) -> tuple:
+        name = Path(local_path).name
+        ref_name = f"{artifact_path}/{name}" if artifact_path else name
+        with span("artifact_store", artifact=name):
+            return ref_name, self.store.store(local_path, owner=run_id, name=ref_name)
+
+    @staticmethod
+    def _upload_ref(client, run_id: str, ref_name: str, ref: dict):
+        with span("mlflow_upload", artifact=f"{Path(ref_name).name}.ref.json"):
+            client.log_text(run_id, json.dumps(ref, indent=2), f"{ref_name}.ref.json")
+            client.set_tag(run_id, f"artifact_sha256.{ref_name}", ref["sha256"])
+
+    def _upload(self, client, run_id: str, local_path: str, artifact_path: str, stored: bool):
+        if stored:
+            self._upload_ref(client, run_id, *self._store(run_id, local_path, artifact_path))
+            return
+        with span("mlflow_upload", artifact=Path(local_path).name):
+            client.log_artifact(run_id, local_path, artifact_path=artifact_path)
+
+    def _run(self):
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        while True:
+            try:
+                task = self._tasks.get(timeout=self.flush_interval)
+            except queue.Empty:
+                task = None
+            try:
+                self._send_batches(client)
+                if task and task[0] == "artifact":
+                    _, run_id, local_path, artifact_path, cleanup = task
+                    self._upload(client, run_id, local_path, artifact_path, stored=False)
+                    if cleanup:
+                        shutil.rmtree(Path(local_path).parent, ignore_errors=True)
+                elif task and task[0] == "ref":
+                    self._upload_ref(client, *task[1:])
+                elif task and task[0] == "figure":
+                    _, run_id, render, artifact_name, save_to, stored = task
+                    temp_file = self.private_path(artifact_name)
+                    with span("plot", artifact=artifact_name):
+                        render().savefig(temp_file, bbox_inches="tight")
+                    if save_to is not None:
+                        shutil.copyfile(temp_file, save_to)
+                    self._upload(client, run_id, str(temp_file), None, stored)
+                    shutil.rmtree(temp_file.parent, ignore_errors=True)
+            except Exception:
+                logger.exception("Falha ao enviar logs para o MLflow")
+            finally:
+                if task and task[0] == "flush":
+                    task[1].set()
+                if task:
+                    self._tasks.task_done()
+
+    def flush(self, timeout: float = None):
+        """Bloqueia até que tudo o que foi enfileirado antes da chamada tenha sido enviado."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._tasks.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        self.flush()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+# Criado no primeiro uso (`_logger()`), e não no import: o diretório temporário, a
+# thread e os ganchos de saída/fork só existem em processos que de fato logam
+_ASYNC_LOGGER = None
+_ASYNC_LOGGER_LOCK = threading.Lock()
+
+
+def _logger() -> _AsyncLogger:
+    global _ASYNC_LOGGER
+    if _ASYNC_LOGGER is None:
+        with _ASYNC_LOGGER_LOCK:
+            if _ASYNC_LOGGER is None:
+                async_logger = _AsyncLogger()
+                atexit.register(async_logger.close)
+                os.register_at_fork(after_in_child=async_logger._reset)
+                _ASYNC_LOGGER = async_logger
+    return _ASYNC_LOGGER
+
+
+def flush(timeout: float = None):
+    """
+    Aguarda o envio de todas as métricas, parâmetros e artefatos pendentes.
+    Deve ser chamada antes de encerrar o run (ver `end_run`).
+    """
+    if _ASYNC_LOGGER is not None:
+        _ASYNC_LOGGER.flush(timeout)
+
+
+def end_run(status: str = "FINISHED"):
+    """
+    Envia os logs pendentes e encerra o run ativo. Com a coleta de spans ligada, as
+    métricas `stage_*` são logadas depois do envio, para incluir as etapas que correm
+    na thread de envio (gráfico, uploads, armazenamento de artefatos).
+    """
+    import mlflow
+
+    flush()
+    if is_enabled() and mlflow.active_run() is not None:
+        mlflow.log_metrics(stage_metrics())
+    mlflow.end_run(status=status)
+
 # -------------------------------
 # Logging de métricas
 # -------------------------------
 def log_metrics(metrics: dict):
-    for k, v in metrics.items():
-        mlflow.log_metric(k, v)
+    _logger().add_metrics(metrics)
 
 # -------------------------------
 # Logging de dicionários
 # -------------------------------
 def log_dict(d: dict, prefix: str = "params"):
-    for k, v in d.items():
-        mlflow.log_param(f"{prefix}_{k}", v)
+    _logger().add_params({f"{prefix}_{k}": v for k, v in d.items()})
 
 # -------------------------------
 # Logging de DataFrames (como CSV)
 # -------------------------------
 def log_dataframe(df: pd.DataFrame, artifact_name: str):
-    temp_file = Path(artifact_name)
+    temp_file = _logger().private_path(artifact_name)
     df.to_csv(temp_file, index=False)
-    mlflow.log_artifact(str(temp_file))
-    temp_file.unlink()  # remove arquivo temporário
+    _logger().add_artifact(temp_file, cleanup=True)
 
 # -------------------------------
 # Logging de figuras
 # -------------------------------
-def log_figure(fig: plt.Figure, artifact_name: str):
-    temp_file = Path(artifact_name)
+def log_figure(fig, artifact_name: str):
+    temp_file = _logger().private_path(artifact_name)
     fig.savefig(temp_file, bbox_inches="tight")
-    mlflow.log_artifact(str(temp_file))
-    plt.close(fig)
-    temp_file.unlink()
+    if fig.canvas.manager is not None:
+        # Figura criada pelo pyplot: libera o gerenciador
+        import matplotlib.pyplot as plt
+
+        plt.close(fig)
+    _logger().add_artifact(temp_file, cleanup=True)
+
+def log_figure_async(render, artifact_name: str, save_to: Path = None, stored: bool = False):
+    """
+    Enfileira `render` (função sem argumentos que retorna uma Figure) para ser
+    renderizada, salva e enviada pela thread de fundo; a chamada retorna imediatamente.
+    A figura não deve depender de pyplot (ver `plots.plot_forecast`).
+    Com `save_to`, uma cópia da imagem também é gravada nesse caminho; com `stored`,
+    a imagem vai para o `ArtifactStore` e o run guarda só a referência.
+    """
+    _logger().add_figure(render, artifact_name, save_to, stored)
+
+# -------------------------------
+# Logging de arquivos
+# -------------------------------
+def log_artifact(local_path, artifact_path: str = None, stored: bool = False):
+    """
+    Envia um arquivo já existente (que não é removido após o envio). Com `stored`, o
+    arquivo vai para o `ArtifactStore` e o run guarda só a referência.
+    """
+    _logger().add_artifact(local_path, artifact_path=artifact_path, stored=stored)
 
 # -------------------------------
 # Logging de arquivo de modelo
 # -------------------------------
-def log_model_file(local_path: str, artifact_name: str):
-    mlflow.log_artifact(local_path, artifact_path=artifact_name)
+def log_model_file(local_path: str, artifact_name: str, stored: bool = True):
+    """
+    Registra o arquivo do modelo no run. Por padrão o conteúdo vai para o
+    `ArtifactStore` (guardado uma vez, mesmo em vários runs) antes de a chamada
+    retornar, e o run recebe a referência; `stored=False` envia uma cópia ao MLflow
+    como antes.
+    """
+    _logger().add_artifact(local_path, artifact_path=artifact_name, stored=stored)
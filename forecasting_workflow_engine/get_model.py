@@ -1,15 +1,86 @@
-from prophet import Prophet
-from statsmodels.tsa.arima.model import ARIMA
+import importlib
+import re
+from pathlib import Path
 
 
+# -------------------------------
+# Registro de backends
+# -------------------------------
+# Tipo de modelo -> (módulo, atributo). A biblioteca só é importada quando o tipo
+# é pedido, então importar o pacote (ou rodar um `--help`) não paga por todos os backends.
+MODEL_BACKENDS = {
+    "prophet": ("prophet", "Prophet"),
+    "arima": ("statsmodels.tsa.arima.model", "ARIMA"),
+    "autoarima": ("pmdarima", "auto_arima"),
+    "global_mlp": ("forecasting_workflow_engine.modeling.global_mlp", "GlobalMLPForecaster"),
+    **{method: ("forecasting_workflow_engine.modeling.baselines", method)
+       for method in ("naive", "snaive", "drift", "ses", "holt", "holt_winters")},
+}
 
-def get_prophet_model(params=None):
+
+def register_backend(model_type: str, module: str, attr: str):
+    """Registra (ou substitui) o backend de um tipo de modelo, sem importá-lo."""
+    MODEL_BACKENDS[model_type.lower()] = (module, attr)
+
+
+def load_backend(model_type: str):
+    """
+    Importa e retorna a classe/fábrica registrada para `model_type`.
+    Imports repetidos saem do cache do interpretador (`sys.modules`).
+    """
+    try:
+        module, attr = MODEL_BACKENDS[model_type.lower()]
+    except KeyError:
+        raise ValueError(f"Modelo '{model_type}' não suportado.") from None
+    return getattr(importlib.import_module(module), attr)
+
+
+def get_model(model_type: str, *args, **kwargs):
+    """Instancia o modelo registrado para `model_type`."""
+    return load_backend(model_type)(*args, **kwargs)
+
+
+# -------------------------------
+# Fábricas
+# -------------------------------
+def get_prophet_model(params=None, seasonality=None):
     """
     Retorna uma instância do Prophet (versão >=1.1, sem stan_backend)
+
+    `seasonality` (ex.: saída de `spectral.prophet_seasonality`) liga/desliga as
+    sazonalidades embutidas e adiciona as de `extra_seasonalities`.
     """
-    params = params or {}
-    model = Prophet(**params)
+    params = dict(params or {})
+    seasonality = dict(seasonality or {})
+    extra = seasonality.pop("extra_seasonalities", [])
+    model = get_model("prophet", **{**seasonality, **params})
+    for s in extra:
+        model.add_seasonality(**s)
     return model
 
+def prophet_stan_init(model):
+    """
+    Extrai os parâmetros otimizados de um Prophet ajustado no formato aceito por
+    `Prophet.fit(df, init=...)`, para iniciar um novo ajuste a partir deles (warm start).
+    """
+    params = {name: model.params[name][0][0] for name in ("k", "m", "sigma_obs")}
+    params.update({name: model.params[name][0] for name in ("delta", "beta")})
+    return params
+
+# Linha de progresso do CmdStan: "  123   4567.8 ..." (LBFGS/BFGS) ou "Iteration 12. ..." (Newton)
+_STAN_ITERATION = re.compile(r"^\s*(?:Iteration\s+(\d+)\.|(\d+)\s+-?\d)")
+
+def prophet_fit_iterations(model):
+    """
+    Iterações do otimizador do Stan no último ajuste do Prophet, lidas do log do
+    CmdStan (None se o log não estiver disponível).
+    """
+    try:
+        lines = Path(model.stan_fit.runset.stdout_files[0]).read_text().splitlines()
+    except (AttributeError, IndexError, OSError):
+        return None
+    iterations = [int(m.group(1) or m.group(2)) for m in map(_STAN_ITERATION.match, lines) if m]
+    return iterations[-1] if iterations else None
+
 def get_arima_model(endog, order=(1, 1, 1)):
-    return ARIMA(endog, order=order)
+    return get_model("arima", endog, order=order)
@@ -0,0 +1,196 @@
+# forecasting_workflow_engine/modeling/arima_search.py
+import hashlib
+import itertools
+import json
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+import numpy as np
+
+# Memória do processo: fingerprint -> {ordem: resultado}
+_MEMORY = {}
+
+
+# -------------------------------
+# Divergência do otimizador
+# -------------------------------
+class ArimaDiverged(Exception):
+    """Sinaliza que o otimizador do ARIMA divergiu durante o ajuste."""
+
+
+def _divergence_callback(model, sigma2_limit: float, warmup: int = 5):
+    """
+    Callback do otimizador que aborta o ajuste quando os parâmetros deixam de ser
+    finitos ou quando, após `warmup` iterações, a variância das inovações implícita
+    passa de `sigma2_limit` (o modelo já é muito pior que prever a média).
+    """
+    iteration = 0
+
+    def callback(params):
+        nonlocal iteration
+        iteration += 1
+        if not np.all(np.isfinite(params)):
+            raise ArimaDiverged()
+        if iteration >= warmup:
+            sigma2 = model.transform_params(params)[-1]
+            if not np.isfinite(sigma2) or sigma2 > sigma2_limit:
+                raise ArimaDiverged()
+    return callback
+
+
+# -------------------------------
+# Ajuste de uma ordem
+# -------------------------------
+def fit_arima_order(y, order, start_params: dict = None, maxiter: int = 50,
+                    sigma2_limit: float = np.inf) -> dict:
+    """
+    Ajusta ARIMA(order) e retorna o resultado serializável da avaliação.
+
+    Args:
+        y: série temporal univariada (np.ndarray).
+        order: tupla (p,d,q).
+        start_params: parâmetros iniciais por nome (warm start); nomes ausentes
+            começam em zero (ar/ma) ou herdam o valor padrão do statsmodels.
+        maxiter: limite de iterações do otimizador.
+        sigma2_limit: variância de inovação acima da qual o ajuste é abortado.
+
+    Returns:
+        dict com 'order', 'status' ("ok", "diverged" ou "failed"), 'mse',
+        'params' (nome -> valor), 'iterations' e 'elapsed'.
+    """
+    from sklearn.metrics import mean_squared_error
+    from statsmodels.tsa.arima.model import ARIMA
+
+    start = time.perf_counter()
+    result = {"order": list(order), "status": "ok", "mse": float("inf"),
+              "params": {}, "iterations": None}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            model = ARIMA(y, order=tuple(order))
+            init = None
+            if start_params:
+                init = np.array([start_params.get(name,
+                                                  0.0 if name[:3] in ("ar.", "ma.") else np.nan)
+                                 for name in model.param_names])
+                if np.isnan(init).any():
+                    defaults = model.start_params
+                    init = np.where(np.isnan(init), defaults, init)
+            callback = _divergence_callback(model, sigma2_limit)
+            try:
+                model_fit = model.fit(start_params=init,
+                                      method_kwargs={"maxiter": maxiter, "callback": callback})
+            except ValueError:
+                # Warm start não estacionário/inversível: recomeça do zero
+                if init is None:
+                    raise
+                model_fit = model.fit(method_kwargs={"maxiter": maxiter, "callback": callback})
+            result["mse"] = float(mean_squared_error(y, model_fit.fittedvalues))
+            result["params"] = dict(zip(model.param_names, map(float, model_fit.params)))
+            result["iterations"] = model_fit.mle_retvals.get("iterations")
+        except ArimaDiverged:
+            result["status"] = "diverged"
+        except Exception:
+            result["status"] = "failed"
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def series_fingerprint(y, **settings) -> str:
+    """
+    Hash do conteúdo da série (e das configurações do ajuste) usado como chave do cache.
+    """
+    arr = np.ascontiguousarray(np.asarray(y, dtype=np.float64))
+    h = hashlib.sha1(arr.tobytes())
+    h.update(json.dumps(settings, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+# -------------------------------
+# Motor de busca de ordens
+# -------------------------------
+class ArimaOrderSearch:
+    """
+    Avalia ordens ARIMA com memoização por série.
+
+    - Cada ordem é ajustada no máximo uma vez por fingerprint da série; repetições
+      devolvem o resultado em cache.
+    - Cada ajuste parte dos parâmetros da ordem já ajustada mais próxima (warm start).
+    - O cache pode ser persistido em `cache_dir/<fingerprint>.json`, então uma nova
+      execução sobre os mesmos dados reaproveita todos os ajustes anteriores.
+    """
+
+    def __init__(self, y, maxiter: int = 50, divergence_factor: float = 10.0,
+                 cache_dir: Path = None):
+        self.y = np.asarray(y, dtype=float)
+        self.maxiter = maxiter
+        self.sigma2_limit = divergence_factor * max(float(np.var(self.y)), 1e-12)
+        self.fingerprint = series_fingerprint(self.y, maxiter=maxiter,
+                                              divergence_factor=divergence_factor)
+        self.cache_file = Path(cache_dir) / f"{self.fingerprint}.json" if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self.results = _MEMORY.setdefault(self.fingerprint, {})
+        if not self.results and self.cache_file and self.cache_file.exists():
+            stored = json.loads(self.cache_file.read_text())
+            self.results.update({tuple(r["order"]): r for r in stored})
+            logger.info(f"{len(self.results)} ordens ARIMA carregadas de {self.cache_file}")
+
+    def _nearest_params(self, order):
+        """Parâmetros da ordem ajustada mais próxima (mesmo d tem prioridade)."""
+        p, d, q = order
+        fitted = [o for o, r in self.results.items() if r["status"] == "ok"]
+        if not fitted:
+            return None
+        nearest = min(fitted, key=lambda o: (10 * abs(o[1] - d) + abs(o[0] - p) + abs(o[2] - q)))
+        return self.results[nearest]["params"]
+
+    def _store(self, result: dict):
+        self.results[tuple(result["order"])] = result
+        self.misses += 1
+
+    def evaluate(self, order) -> dict:
+        """Avalia uma ordem, usando o cache quando possível."""
+        order = tuple(order)
+        if order in self.results:
+            self.hits += 1
+            return self.results[order]
+        result = fit_arima_order(self.y, order, self._nearest_params(order),
+                                 self.maxiter, self.sigma2_limit)
+        self._store(result)
+        return result
+
+    def evaluate_many(self, orders, n_jobs: int = 1) -> list:
+        """
+        Avalia várias ordens em paralelo. As ordens são processadas em ondas de
+        complexidade crescente (p+q), e cada onda parte dos parâmetros das ondas anteriores.
+        """
+        orders = [tuple(o) for o in orders]
+        pending = [o for o in dict.fromkeys(orders) if o not in self.results]
+        self.hits += len(orders) - len(pending)
+        if pending:
+            if n_jobs == 1:
+                for order in sorted(pending, key=lambda o: (o[0] + o[2], o)):
+                    self.evaluate(order)
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    by_complexity = sorted(pending, key=lambda o: (o[0] + o[2], o))
+                    for _, wave in itertools.groupby(by_complexity, key=lambda o: o[0] + o[2]):
+                        wave = list(wave)
+                        futures = [executor.submit(fit_arima_order, self.y, order,
+                                                   self._nearest_params(order),
+                                                   self.maxiter, self.sigma2_limit)
+                                   for order in wave]
+                        for future in futures:
+                            self._store(future.result())
+        return [self.results[o] for o in orders]
+
+    def save(self):
+        """Persiste o cache de ordens avaliadas em disco."""
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps(list(self.results.values())))
@@ -0,0 +1,237 @@
+# forecasting_workflow_engine/modeling/backtest.py
+from concurrent.futures import ProcessPoolExecutor
+import warnings
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.dataset import fetch_dataset
+from forecasting_workflow_engine.experiments.mlflow_utils import (
+    start_experiment,
+    end_run,
+    log_metrics,
+    log_dataframe,
+    log_dict,
+)
+from forecasting_workflow_engine.get_model import get_prophet_model
+from forecasting_workflow_engine.modeling.fast_predict import prophet_point_forecast
+from forecasting_workflow_engine.modeling.hyperparam_optimization import _resolve_n_jobs
+
+
+def make_cutoffs(n_obs: int, horizon: int, initial: int, stride: int) -> list:
+    """Posições de corte (tamanho do treino) de cada origem do backtest."""
+    cutoffs = list(range(initial, n_obs - horizon + 1, stride))
+    if not cutoffs:
+        raise ValueError(f"Série com {n_obs} pontos é curta demais para initial={initial} "
+                         f"e horizon={horizon}.")
+    return cutoffs
+
+
+def _train_slice(cutoff: int, initial: int, window: str) -> slice:
+    return slice(cutoff - initial if window == "sliding" else 0, cutoff)
+
+
+# -------------------------------
+# ARIMA: estado reaproveitado entre origens
+# -------------------------------
+def _arima_block(y, cutoffs, horizon: int, initial: int, window: str, spec: dict,
+                 refit_every: int = None) -> list:
+    """
+    Avalia um bloco de origens consecutivas ajustando o ARIMA uma única vez (na primeira
+    origem). Nas seguintes o estado é avançado com `append` (janela expansível) ou o
+    modelo é reaplicado à nova janela com `apply` (janela deslizante), sem reestimar
+    parâmetros; `refit_every` força uma reestimação a cada k origens.
+    """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    forecasts = []
+    res, prev = None, None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for i, cutoff in enumerate(cutoffs):
+            refit = refit_every and i % refit_every == 0
+            if res is None or refit:
+                res = SARIMAX(y[_train_slice(cutoff, initial, window)], **spec).fit(
+                    disp=False, start_params=None if res is None else res.params)
+            elif window == "sliding":
+                res = res.apply(y[_train_slice(cutoff, initial, window)], refit=False)
+            else:
+                res = res.append(y[prev:cutoff], refit=False)
+            prev = cutoff
+            forecasts.append(np.asarray(res.forecast(horizon)))
+    return forecasts
+
+
+def _arima_spec(y_initial) -> dict:
+    """Especificação SARIMAX escolhida pelo AutoARIMA na primeira janela de treino."""
+    from pmdarima import auto_arima
+
+    model_fit = auto_arima(
+        y_initial,
+        start_p=1, start_q=1, max_p=5, max_q=5,
+        seasonal=False, stepwise=True, suppress_warnings=True,
+        error_action='ignore'
+    )
+    spec = model_fit.arima_res_.model._get_init_kwds()
+    spec.pop("exog", None)
+    return spec
+
+
+# -------------------------------
+# Prophet: uma origem por tarefa
+# -------------------------------
+def _prophet_origin(df_train: pd.DataFrame, future: pd.DataFrame, params: dict) -> np.ndarray:
+    model = get_prophet_model(params)
+    model.fit(df_train)
+    return prophet_point_forecast(model, future)
+
+
+# -------------------------------
+# Engine
+# -------------------------------
+def backtest(
+    y,
+    ds,
+    model_type: str = "Arima",
+    horizon: int = 12,
+    initial: int = None,
+    stride: int = None,
+    window: str = "expanding",
+    n_jobs: int = 1,
+    prophet_params: dict = None,
+    refit_every: int = None
+) -> pd.DataFrame:
+    """
+    Backtest com origens móveis (rolling origin).
+
+    Args:
+        y: série temporal univariada.
+        ds: datas correspondentes a `y`.
+        model_type: "Arima" ou "Prophet".
+        horizon: passos previstos a partir de cada origem.
+        initial: tamanho do primeiro treino (padrão: metade da série). Na janela
+            deslizante é também o tamanho fixo da janela.
+        stride: passos entre origens consecutivas (padrão: `horizon`).
+        window: "expanding" ou "sliding".
+        n_jobs: processos usados em paralelo entre origens (-1 = todos os núcleos).
+            No ARIMA as origens são divididas em blocos contíguos, um por processo,
+            e o estado é reaproveitado dentro de cada bloco.
+        prophet_params: hiperparâmetros do Prophet.
+        refit_every: no ARIMA, reestima os parâmetros a cada k origens (None = nunca).
+
+    Returns:
+        pd.DataFrame com uma linha por (origem, horizonte): origin, cutoff, h, ds,
+        y_true, y_pred, error e abs_error.
+    """
+    y = np.asarray(y, dtype=float)
+    ds = pd.to_datetime(pd.Series(ds)).reset_index(drop=True)
+    initial = initial or len(y) // 2
+    stride = stride or horizon
+    if window not in ("expanding", "sliding"):
+        raise ValueError(f"Janela '{window}' não suportada.")
+    cutoffs = make_cutoffs(len(y), horizon, initial, stride)
+    n_jobs = min(_resolve_n_jobs(n_jobs), len(cutoffs))
+    logger.info(f"Backtest {model_type}: {len(cutoffs)} origens, horizon={horizon}, "
+                f"janela={window}, n_jobs={n_jobs}")
+
+    if model_type.lower() == "arima":
+        spec = _arima_spec(y[:initial])
+        blocks = [list(block) for block in np.array_split(cutoffs, n_jobs)]
+        if n_jobs == 1:
+            forecasts = _arima_block(y, cutoffs, horizon, initial, window, spec, refit_every)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(_arima_block, y, block, horizon, initial, window,
+                                           spec, refit_every) for block in blocks]
+                forecasts = [f for future in futures for f in future.result()]
+    elif model_type.lower() == "prophet":
+        df = pd.DataFrame({"ds": ds, "y": y})
+        tasks = [(df.iloc[_train_slice(c, initial, window)], df.iloc[c:c + horizon][["ds"]],
+                  prophet_params or {}) for c in cutoffs]
+        if n_jobs == 1:
+            forecasts = [_prophet_origin(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                forecasts = list(executor.map(_prophet_origin, *zip(*tasks)))
+    else:
+        raise ValueError(f"Modelo '{model_type}' não suportado.")
+
+    # --- Tabela tidy: uma linha por (origem, horizonte) ---
+    cutoffs = np.asarray(cutoffs)
+    steps = np.arange(1, horizon + 1)
+    positions = (cutoffs[:, None] + steps[None, :] - 1).ravel()
+    y_pred = np.concatenate(forecasts)
+    y_true = y[positions]
+    return pd.DataFrame({
+        "origin": np.repeat(np.arange(len(cutoffs)), horizon),
+        "cutoff": ds.iloc[np.repeat(cutoffs - 1, horizon)].to_numpy(),
+        "h": np.tile(steps, len(cutoffs)),
+        "ds": ds.iloc[positions].to_numpy(),
+        "y_true": y_true,
+        "y_pred": y_pred,
+        "error": y_pred - y_true,
+        "abs_error": np.abs(y_pred - y_true),
+    })
+
+
+def summarize_backtest(results: pd.DataFrame) -> pd.DataFrame:
+    """MAE, RMSE e viés por horizonte."""
+    grouped = results.groupby("h")["error"]
+    return pd.DataFrame({
+        "mae": grouped.apply(lambda e: np.mean(np.abs(e))),
+        "rmse": grouped.apply(lambda e: np.sqrt(np.mean(e ** 2))),
+        "bias": grouped.mean(),
+    }).reset_index()
+
+
+def run_backtest(dataset_name: str, model_type: str = "Arima", log_to_mlflow: bool = True,
+                 **kwargs) -> pd.DataFrame:
+    """
+    Executa `backtest()` sobre um dataset de `DATASET_MAP` e registra a tabela por
+    origem/horizonte e as métricas agregadas em um run MLflow.
+    """
+    X, y = fetch_dataset(dataset_name)
+    results = backtest(y.to_numpy(), X.iloc[:, 0], model_type=model_type, **kwargs)
+    summary = summarize_backtest(results)
+    logger.info(f"Backtest {dataset_name} | {model_type}:\n{summary.to_string(index=False)}")
+
+    if log_to_mlflow:
+        from forecasting_workflow_engine.modeling.train import EXPERIMENT_NAME
+
+        start_experiment(EXPERIMENT_NAME, run_name=f"{dataset_name}_{model_type}_backtest")
+        log_dict({"model_type": model_type, **kwargs}, "backtest")
+        log_metrics({"backtest_mae": results["abs_error"].mean(),
+                     "backtest_rmse": float(np.sqrt(np.mean(results["error"] ** 2)))})
+        log_metrics({f"backtest_mae_h{row.h}": row.mae for row in summary.itertuples()})
+        log_dataframe(results, "backtest.csv")
+        end_run()
+    return results
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    from forecasting_workflow_engine.config import configure_logging
+    from typing import Optional
+
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def main(
+        dataset_name: str = "air_passengers",
+        model_type: str = "Arima",
+        horizon: int = 12,
+        initial: Optional[int] = None,
+        stride: Optional[int] = None,
+        window: str = "expanding",
+        n_jobs: int = 1
+    ):
+        run_backtest(dataset_name, model_type, horizon=horizon, initial=initial, stride=stride,
+                     window=window, n_jobs=n_jobs)
+
+    configure_logging()
+    app()
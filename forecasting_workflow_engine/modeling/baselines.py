@@ -0,0 +1,291 @@
+# forecasting_workflow_engine/modeling/baselines.py
+from functools import partial
+import itertools
+import time
+
+import numpy as np
+from loguru import logger
+
+# Métodos -> parâmetros de suavização otimizados
+METHOD_PARAMS = {
+    "naive": (),
+    "snaive": (),
+    "drift": (),
+    "ses": ("alpha",),
+    "holt": ("alpha", "beta"),
+    "holt_winters": ("alpha", "beta", "gamma"),
+}
+# Métodos sazonais -> equivalente sem sazonalidade (usado quando não há período)
+SEASONAL_METHODS = {"snaive": "naive", "holt_winters": "holt"}
+
+# Atributos ajustados necessários para prever (salvos por `serialization.save_model`)
+STATE_ATTRS = ("n_obs_", "n_columns_", "sigma_", "last_", "slope_", "last_season_",
+               "params_", "level_", "trend_", "season_")
+
+# Limites dos parâmetros de suavização
+_BOUNDS = (0.001, 0.999)
+
+
+def _as_padded(Y) -> np.ndarray:
+    """
+    Matriz (séries x tempo) float64 com todas as séries terminando na última coluna.
+    Aceita vetor 1-D, matriz 2-D (NaN à esquerda = série mais curta) ou lista de
+    vetores de tamanhos diferentes, completados com NaN à esquerda.
+    """
+    if isinstance(Y, (list, tuple)) and Y and np.ndim(Y[0]) == 1:
+        lengths = [len(y) for y in Y]
+        out = np.full((len(Y), max(lengths)), np.nan)
+        for i, y in enumerate(Y):
+            out[i, out.shape[1] - len(y):] = y
+        return out
+    return np.atleast_2d(np.asarray(Y, dtype=float))
+
+
+def _first_valid(Y: np.ndarray) -> np.ndarray:
+    return np.argmax(np.isfinite(Y), axis=1)
+
+
+def _take(Y: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Y[i, columns[i, j]] para cada série i."""
+    return np.take_along_axis(Y, np.clip(columns, 0, Y.shape[1] - 1), axis=1)
+
+
+# -------------------------------
+# Suavização exponencial em lote
+# -------------------------------
+def _initial_state(Y: np.ndarray, method: str, m: int):
+    """
+    Estado inicial por série (nível, tendência, sazonalidade indexada por t % m) e o
+    primeiro instante em que a recursão começa a ser aplicada.
+    """
+    n, T = Y.shape
+    first = _first_valid(Y)
+    if method == "holt_winters":
+        seasons = _take(Y, first[:, None] + np.arange(2 * m))
+        level = seasons[:, :m].mean(axis=1)
+        trend = (seasons[:, m:].mean(axis=1) - level) / m
+        season = np.zeros((n, m))
+        np.put_along_axis(season, (first[:, None] + np.arange(m)) % m,
+                          seasons[:, :m] - level[:, None], axis=1)
+        start = first + m
+    else:
+        # Tendência inicial: inclinação média da série (como no drift). Com beta pequeno
+        # ela quase não muda, e a primeira diferença seria ruidosa demais
+        level = _take(Y, first[:, None])[:, 0]
+        last = _take(Y, np.full((n, 1), T - 1))[:, 0]
+        trend = ((last - level) / np.maximum(T - 1 - first, 1) if method == "holt"
+                 else np.zeros(n))
+        season = np.zeros((n, m))
+        start = first + 1
+    return level, trend, season, start
+
+
+def _smooth(Y: np.ndarray, method: str, params: np.ndarray, m: int = 1,
+            return_fitted: bool = False):
+    """
+    Recursões de SES/Holt/Holt-Winters (aditivo) para todas as séries e todas as
+    combinações de parâmetros de uma vez: `params` tem forma (séries, G, P) e cada
+    passo de tempo é uma operação vetorizada sobre (séries, G). Valores ausentes
+    mantêm o estado.
+
+    Returns:
+        tuple: (SSE um passo à frente [séries, G], nível, tendência, sazonalidade
+        [séries, G, m], previsões um passo à frente [séries, T] se `return_fitted`)
+    """
+    n, T = Y.shape
+    G = params.shape[1]
+    alpha = params[..., 0]
+    beta = params[..., 1] if params.shape[2] > 1 else np.zeros((n, G))
+    gamma = params[..., 2] if params.shape[2] > 2 else np.zeros((n, G))
+    level0, trend0, season0, start = _initial_state(Y, method, m)
+    level = np.repeat(level0[:, None], G, axis=1)
+    trend = np.repeat(trend0[:, None], G, axis=1)
+    season = np.repeat(season0[:, None, :], G, axis=1)
+    sse = np.zeros((n, G))
+    fitted = np.full((n, T), np.nan) if return_fitted else None
+
+    for t in range(int(start.min()), T):
+        y = Y[:, t, None]
+        active = np.isfinite(y) & (t >= start)[:, None]
+        s = season[..., t % m]
+        forecast = level + trend + s
+        if return_fitted:
+            fitted[:, t] = forecast[:, 0]
+        error = np.where(active, y - forecast, 0.0)
+        sse += error * error
+        new_level = np.where(active, alpha * (y - s) + (1 - alpha) * (level + trend), level)
+        trend = np.where(active, beta * (new_level - level) + (1 - beta) * trend, trend)
+        season[..., t % m] = np.where(active, gamma * (y - new_level) + (1 - gamma) * s, s)
+        level = new_level
+    return sse, level, trend, season, fitted
+
+
+def _grid(n_params: int, size: int) -> np.ndarray:
+    values = np.linspace(*_BOUNDS, size)
+    return np.array(list(itertools.product(values, repeat=n_params)))
+
+
+def optimize_smoothing(Y: np.ndarray, method: str, m: int = 1, grid_size: int = None,
+                       refine: bool = True) -> np.ndarray:
+    """
+    Parâmetros de suavização que minimizam o SSE um passo à frente, por série.
+
+    Uma grade grossa comum a todas as séries é avaliada em um único `_smooth`; em
+    seguida, uma grade fina ao redor do melhor ponto de cada série (grades diferentes
+    por série, mesma forma) refina o resultado.
+
+    Returns:
+        np.ndarray [séries, P]
+    """
+    n_params = len(METHOD_PARAMS[method])
+    grid_size = grid_size or {1: 20, 2: 10, 3: 8}[n_params]
+    grid = _grid(n_params, grid_size)
+    params = np.broadcast_to(grid, (len(Y), *grid.shape))
+    sse = _smooth(Y, method, params, m)[0]
+    best = grid[np.argmin(sse, axis=1)]
+    if refine:
+        step = (_BOUNDS[1] - _BOUNDS[0]) / (grid_size - 1)
+        offsets = _grid(n_params, 5) - _grid(n_params, 5).mean(axis=0)
+        offsets *= step / (offsets.max() or 1.0)
+        params = np.clip(best[:, None, :] + offsets[None], *_BOUNDS)
+        sse = _smooth(Y, method, params, m)[0]
+        best = params[np.arange(len(Y)), np.argmin(sse, axis=1)]
+    return best
+
+
+# -------------------------------
+# Forecaster
+# -------------------------------
+class BaselineForecaster:
+    """
+    Baselines clássicos ajustados em lote sobre uma matriz (séries x tempo):
+    naive, naive sazonal ("snaive"), drift, SES, Holt e Holt-Winters aditivo.
+
+    Séries de tamanhos diferentes são completadas com NaN à esquerda (todas terminam
+    no mesmo instante). Os parâmetros de suavização de todas as séries são escolhidos
+    juntos por `optimize_smoothing`; previsões e valores ajustados são matrizes.
+
+    Args:
+        method: um de `METHOD_PARAMS`.
+        season_length: período sazonal (obrigatório em "snaive" e "holt_winters").
+        params: parâmetros fixos (dict nome -> valor); None = otimizados.
+        grid_size: pontos por parâmetro na grade grossa (padrão depende do método).
+    """
+
+    def __init__(self, method: str = "ses", season_length: int = None, params: dict = None,
+                 grid_size: int = None):
+        if method not in METHOD_PARAMS:
+            raise ValueError(f"Método '{method}' não suportado. Opções: {list(METHOD_PARAMS)}")
+        if method in SEASONAL_METHODS and not season_length:
+            raise ValueError(f"O método '{method}' precisa de `season_length`.")
+        self.method = method
+        self.season_length = int(season_length) if season_length else 1
+        self.params = params
+        self.grid_size = grid_size
+
+    def fit(self, Y):
+        Y = _as_padded(Y)
+        n, T = Y.shape
+        m = self.season_length
+        start = time.perf_counter()
+        first = _first_valid(Y)
+        self.last_ = _take(Y, np.full((n, 1), T - 1))[:, 0]
+
+        if self.method in ("naive", "drift"):
+            first_value = _take(Y, first[:, None])[:, 0]
+            self.slope_ = ((self.last_ - first_value) / np.maximum(T - 1 - first, 1)
+                           if self.method == "drift" else np.zeros(n))
+            self.fitted_ = np.full((n, T), np.nan)
+            self.fitted_[:, 1:] = Y[:, :-1] + self.slope_[:, None]
+        elif self.method == "snaive":
+            self.last_season_ = Y[:, T - m:]
+            self.fitted_ = np.full((n, T), np.nan)
+            self.fitted_[:, m:] = Y[:, :-m]
+        else:
+            names = METHOD_PARAMS[self.method]
+            if self.params is not None:
+                best = np.tile([self.params[name] for name in names], (n, 1)).astype(float)
+            else:
+                best = optimize_smoothing(Y, self.method, m, self.grid_size)
+            _, level, trend, season, fitted = _smooth(Y, self.method, best[:, None, :], m,
+                                                      return_fitted=True)
+            self.params_ = best
+            self.level_, self.trend_, self.season_ = level[:, 0], trend[:, 0], season[:, 0]
+            self.fitted_ = fitted
+        residuals = Y - self.fitted_
+        self.sigma_ = np.sqrt(np.nanmean(residuals ** 2, axis=1))
+        self.n_obs_ = T - first
+        self.n_columns_ = T
+        self.fit_time_ = time.perf_counter() - start
+        logger.info(f"Baseline {self.method}: {n} séries x {T} passos em {self.fit_time_:.2f}s")
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        """
+        Previsões dos próximos `horizon` passos de todas as séries.
+
+        Returns:
+            np.ndarray [séries, horizon]
+        """
+        if not hasattr(self, "n_obs_"):
+            raise RuntimeError("Modelo não treinado: chame fit() antes de predict().")
+        h = np.arange(1, horizon + 1)
+        m = self.season_length
+        if self.method in ("naive", "drift"):
+            return self.last_[:, None] + self.slope_[:, None] * h
+        if self.method == "snaive":
+            return self.last_season_[:, (h - 1) % m]
+        forecast = self.level_[:, None] + self.trend_[:, None] * h
+        if self.method == "holt_winters":
+            forecast = forecast + self.season_[:, (self.n_columns_ + h - 1) % m]
+        return forecast
+
+    def predict_interval(self, horizon: int, width: float = 0.95) -> tuple:
+        """
+        Previsões e intervalo normal com a variância de h passos de cada método,
+        a partir do desvio padrão dos resíduos um passo à frente (no Holt-Winters,
+        a fórmula do Holt mais o termo sazonal de cada ciclo completo).
+
+        Returns:
+            tuple: (yhat, lower, upper) como np.ndarray [séries, horizon]
+        """
+        from scipy.stats import norm
+
+        yhat = self.predict(horizon)
+        h = np.arange(1, horizon + 1, dtype=float)
+        k = np.floor((h - 1) / self.season_length)
+        params = self._params_matrix()
+        alpha, beta, gamma = (params[:, i, None] for i in range(3))
+        ratio = {
+            "naive": np.broadcast_to(h, yhat.shape),
+            "snaive": np.broadcast_to(k + 1, yhat.shape),
+            "drift": h * (1 + h / self.n_obs_[:, None]),
+            "ses": 1 + (h - 1) * alpha ** 2,
+            "holt": 1 + (h - 1) * (alpha ** 2 + alpha * beta * h
+                                   + beta ** 2 * h * (2 * h - 1) / 6),
+        }
+        ratio["holt_winters"] = ratio["holt"] + k * gamma * (2 * alpha + gamma)
+        half = norm.ppf((1 + width) / 2) * self.sigma_[:, None] * np.sqrt(ratio[self.method])
+        return yhat, yhat - half, yhat + half
+
+    def _params_matrix(self) -> np.ndarray:
+        """(alpha, beta, gamma) por série, com zeros nos parâmetros que o método não usa."""
+        params = np.zeros((len(self.sigma_), 3))
+        if hasattr(self, "params_"):
+            params[:, :self.params_.shape[1]] = self.params_
+        return params
+
+    def get_params(self, i: int = 0) -> dict:
+        """Parâmetros de suavização da série `i`."""
+        if not hasattr(self, "params_"):
+            return {}
+        return dict(zip(METHOD_PARAMS[self.method], self.params_[i].tolist()))
+
+
+# Fábricas registradas em `get_model.MODEL_BACKENDS` (um tipo de modelo por método)
+naive = partial(BaselineForecaster, "naive")
+snaive = partial(BaselineForecaster, "snaive")
+drift = partial(BaselineForecaster, "drift")
+ses = partial(BaselineForecaster, "ses")
+holt = partial(BaselineForecaster, "holt")
+holt_winters = partial(BaselineForecaster, "holt_winters")
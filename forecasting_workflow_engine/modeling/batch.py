@@ -0,0 +1,123 @@
+# forecasting_workflow_engine/modeling/batch.py
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.config import REPORTS_DIR, configure_logging
+from forecasting_workflow_engine.dataset import DATASET_MAP
+from forecasting_workflow_engine.experiments.mlflow_utils import (
+    start_experiment,
+    end_run,
+    log_metrics,
+    log_dataframe,
+)
+from forecasting_workflow_engine.modeling.train import EXPERIMENT_NAME, train
+
+
+def _train_job(dataset_name: str, model_type: str, parent_run_id: str, train_kwargs: dict) -> dict:
+    """
+    Executa um `train()` dentro de um run filho do run do lote.
+    Roda nos processos do pool, que são reaproveitados entre jobs (imports,
+    experimento MLflow e conexões ficam quentes).
+    """
+    row = {"dataset": dataset_name, "model_type": model_type, "status": "ok", "error": None}
+    start = time.perf_counter()
+    start_experiment(EXPERIMENT_NAME, run_name=f"{dataset_name}_{model_type}",
+                     parent_run_id=parent_run_id)
+    try:
+        row.update(train(dataset_name=dataset_name, model_type=model_type, **train_kwargs))
+    except Exception as e:
+        logger.exception(f"Falha no job {dataset_name} | {model_type}")
+        row.update(status="failed", error=f"{type(e).__name__}: {e}")
+        end_run(status="FAILED")
+    else:
+        end_run()
+    row["duration_s"] = time.perf_counter() - start
+    return row
+
+
+def train_many(
+    datasets: list = None,
+    model_types: list = ("Prophet",),
+    max_workers: int = 2,
+    optimize_params: bool = True,
+    n_trials: int = 20,
+    n_jobs: int = 1
+) -> pd.DataFrame:
+    """
+    Treina todas as combinações datasets x modelos em um pool de processos.
+
+    Um run pai "train_many" é aberto no MLflow e cada job vira um run filho.
+    Os processos do pool são reaproveitados entre jobs, então imports e a
+    configuração do MLflow são pagos uma vez por worker, não por série.
+
+    Args:
+        datasets: nomes dos datasets (None = todos de `DATASET_MAP`).
+        model_types: tipos de modelo aceitos por `train()`.
+        max_workers: número máximo de jobs simultâneos.
+        optimize_params, n_trials, n_jobs: repassados para `train()`.
+
+    Returns:
+        pd.DataFrame: uma linha por job com status, duração e métricas.
+    """
+    datasets = list(datasets or DATASET_MAP)
+    jobs = list(itertools.product(datasets, model_types))
+    train_kwargs = {"optimize_params": optimize_params, "n_trials": n_trials, "n_jobs": n_jobs}
+
+    parent = start_experiment(EXPERIMENT_NAME, run_name="train_many")
+    parent_run_id = parent.info.run_id
+    logger.info(f"train_many: {len(jobs)} jobs em até {max_workers} workers")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_train_job, dataset_name, model_type, parent_run_id,
+                                   train_kwargs)
+                   for dataset_name, model_type in jobs]
+        for future in as_completed(futures):
+            row = future.result()
+            logger.info(f"Job {row['dataset']} | {row['model_type']}: {row['status']} "
+                        f"({row['duration_s']:.1f}s)")
+            rows.append(row)
+
+    results = (pd.DataFrame(rows)
+               .sort_values(["dataset", "model_type"])
+               .reset_index(drop=True))
+    output_path = REPORTS_DIR / "train_many_metrics.csv"
+    results.to_csv(output_path, index=False)
+    log_dataframe(results, "train_many_metrics.csv")
+    log_metrics({"jobs_ok": int((results["status"] == "ok").sum()),
+                 "jobs_failed": int((results["status"] != "ok").sum())})
+    end_run()
+    logger.success(f"train_many concluído. Tabela consolidada em {output_path}")
+    return results
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    from typing import List, Optional
+
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def main(
+        datasets: Optional[List[str]] = typer.Option(None, "--dataset"),
+        model_types: List[str] = typer.Option(["Prophet"], "--model-type"),
+        max_workers: int = 2,
+        optimize_params: bool = True,
+        n_trials: int = 20,
+        n_jobs: int = 1
+    ):
+        results = train_many(datasets=datasets, model_types=model_types,
+                             max_workers=max_workers, optimize_params=optimize_params,
+                             n_trials=n_trials, n_jobs=n_jobs)
+        logger.success(f"Métricas consolidadas:\n{results.to_string(index=False)}")
+
+    configure_logging()
+    app()
@@ -1,12 +1,87 @@
 import numpy as np
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+
+def _as_2d(a) -> np.ndarray:
+    """
+    Converte a entrada em matriz (séries x tempo) float.
+    Aceita vetor 1-D, matriz 2-D ou lista de vetores de tamanhos diferentes
+    (ragged), completados com NaN à direita.
+    """
+    if isinstance(a, (list, tuple)) and a and np.ndim(a[0]) == 1:
+        lengths = [len(row) for row in a]
+        if len(set(lengths)) > 1:
+            out = np.full((len(a), max(lengths)), np.nan)
+            for i, row in enumerate(a):
+                out[i, :len(row)] = row
+            return out
+    return np.atleast_2d(np.asarray(a, dtype=float))
+
+
+def forecast_metrics(y_true, y_pred, y_train=None, season: int = 1,
+                     aggregate: bool = False) -> dict:
+    """
+    Calcula MSE, RMSE, MAE, MAPE, sMAPE, viés e (com `y_train`) MASE para várias
+    séries de uma vez, em uma única passada vetorizada do NumPy.
+
+    Pontos em que `y_true` ou `y_pred` são NaN são ignorados (máscara), o que permite
+    séries de tamanhos diferentes. MAPE e sMAPE são frações (não percentuais); no MAPE
+    os pontos com `y_true == 0` são ignorados.
+
+    Args:
+        y_true, y_pred: vetor 1-D, matriz (séries x tempo) ou lista ragged.
+        y_train: histórico de treino no mesmo formato, usado na escala do MASE.
+        season: defasagem do naive sazonal na escala do MASE (1 = naive simples);
+            deve ser menor que o número de colunas de `y_train`.
+        aggregate: se True, retorna escalares agregados em todos os pontos válidos
+            (MASE: média das séries); senão, um vetor por série.
+
+    Returns:
+        dict: métrica -> np.ndarray (uma posição por série) ou float.
+    """
+    y_true, y_pred = _as_2d(y_true), _as_2d(y_pred)
+    err = y_pred - y_true
+    mask = np.isfinite(err)
+    err = np.where(mask, err, 0.0)
+    abs_err = np.abs(err)
+    abs_true = np.where(mask, np.abs(y_true), 0.0)
+    abs_pred = np.where(mask, np.abs(y_pred), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mape_mask = mask & (abs_true > 0)
+        ape = np.where(mape_mask, abs_err / np.where(mape_mask, abs_true, 1.0), 0.0)
+        denom = abs_true + abs_pred
+        sape = np.where(mask & (denom > 0), 2.0 * abs_err / np.where(denom > 0, denom, 1.0), 0.0)
+
+        axis = None if aggregate else 1
+        n = mask.sum(axis=axis)
+        mse = (err * err).sum(axis=axis) / n
+        metrics = {
+            "mse": mse,
+            "mae": abs_err.sum(axis=axis) / n,
+            "rmse": np.sqrt(mse),
+            "mape": ape.sum(axis=axis) / mape_mask.sum(axis=axis),
+            "smape": sape.sum(axis=axis) / n,
+            "bias": err.sum(axis=axis) / n,
+        }
+
+        if y_train is not None:
+            y_train = _as_2d(y_train)
+            # season=0 daria escala nula e season >= colunas, uma fatia vazia (MASE NaN)
+            if not 1 <= season < y_train.shape[1]:
+                raise ValueError(f"`season` deve estar entre 1 e {y_train.shape[1] - 1} "
+                                 f"(tamanho do histórico de treino - 1), recebido {season}.")
+            naive_err = np.abs(y_train[:, season:] - y_train[:, :-season])
+            scale = np.nanmean(naive_err, axis=1)
+            mase = (abs_err.sum(axis=1) / mask.sum(axis=1)) / scale
+            metrics["mase"] = np.nanmean(mase) if aggregate else mase
+
+    if aggregate:
+        return {name: float(value) for name, value in metrics.items()}
+    return metrics
+
 
 def evaluate_forecast(y_true, y_pred):
     """
     Retorna dicionário com métricas de forecast
     """
-    return {
-        "mse": mean_squared_error(y_true, y_pred),
-        "mae": mean_absolute_error(y_true, y_pred),
-        "rmse": np.sqrt(mean_squared_error(y_true, y_pred))
-    }
+    return forecast_metrics(y_true, y_pred, aggregate=True)
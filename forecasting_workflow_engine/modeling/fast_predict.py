@@ -0,0 +1,132 @@
+# forecasting_workflow_engine/modeling/fast_predict.py
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------
+# Prophet: previsão pontual
+# -------------------------------
+def _prophet_frame(model, future) -> pd.DataFrame:
+    """Datas (Series/array) ou DataFrame com 'ds' (e 'cap'/regressores) preparado pelo Prophet."""
+    if not isinstance(future, pd.DataFrame):
+        future = pd.DataFrame({"ds": pd.to_datetime(np.asarray(future))})
+    if model.history is None:
+        raise ValueError("Modelo Prophet não ajustado.")
+    return model.setup_dataframe(future.reset_index(drop=True).copy())
+
+
+def _prophet_components(model, df: pd.DataFrame):
+    """
+    (tendência, termos aditivos, termos multiplicativos) como np.ndarray, com um único
+    produto matricial por modo.
+    """
+    # `predict_trend` devolve uma Series (nomeada "floor"), que vazaria para o `yhat`
+    trend = np.asarray(model.predict_trend(df), dtype=float)
+    features, _, component_cols, _ = model.make_all_seasonality_features(df)
+    beta = np.nanmean(model.params["beta"], axis=0)
+    X = features.to_numpy()
+    additive = X @ (beta * component_cols["additive_terms"].to_numpy()) * model.y_scale
+    multiplicative = X @ (beta * component_cols["multiplicative_terms"].to_numpy())
+    return trend, additive, multiplicative
+
+
+def prophet_point_forecast(model, future) -> np.ndarray:
+    """
+    `yhat` do Prophet sem a simulação de incerteza do `predict()` (que sorteia
+    `uncertainty_samples` trajetórias por chamada) e sem montar o DataFrame de
+    componentes: tendência + sazonalidades de todas as datas em dois produtos
+    matriciais. Igual ao `yhat` de `model.predict(future)`.
+
+    Args:
+        model: Prophet ajustado.
+        future: datas (Series/array) ou DataFrame com 'ds' (e 'cap'/regressores).
+
+    Returns:
+        np.ndarray com uma previsão por data.
+    """
+    trend, additive, multiplicative = _prophet_components(model, _prophet_frame(model, future))
+    return trend * (1 + multiplicative) + additive
+
+
+# -------------------------------
+# Prophet: intervalos sob demanda
+# -------------------------------
+def _prophet_analytic_sd(model, df: pd.DataFrame, multiplicative: np.ndarray) -> np.ndarray:
+    """
+    Desvio padrão aproximado de y: ruído de observação (`sigma_obs`) mais a incerteza
+    da tendência do Prophet, que sorteia mudanças futuras a uma taxa de S por
+    unidade de t (S = nº de changepoints, histórico em [0, 1]) com magnitude
+    Laplace(0, λ), λ = média de |delta|. A variância da tendência em t > 1 é
+    S * 2λ² * (t - 1)³ / 3.
+    """
+    sigma_obs = float(np.nanmean(model.params["sigma_obs"]))
+    horizon_t = np.maximum(df["t"].to_numpy() - 1.0, 0.0)
+    trend_var = np.zeros_like(horizon_t)
+    n_changepoints = len(model.changepoints_t) if model.changepoints_t is not None else 0
+    if model.growth == "linear" and n_changepoints:
+        scale = float(np.mean(np.abs(np.nanmean(model.params["delta"], axis=0)))) + 1e-8
+        trend_var = n_changepoints * 2 * scale ** 2 * horizon_t ** 3 / 3
+    trend_sd = np.sqrt(trend_var) * (1 + multiplicative)
+    return np.sqrt(sigma_obs ** 2 + trend_sd ** 2) * model.y_scale
+
+
+def prophet_intervals(model, future, width: float = None, method: str = "analytic",
+                      n_samples: int = 1000) -> tuple:
+    """
+    Previsão pontual e intervalo, calculado só quando pedido.
+
+    Args:
+        model: Prophet ajustado.
+        future: datas ou DataFrame com 'ds'.
+        width: cobertura do intervalo (padrão: `model.interval_width`).
+        method: "analytic" (aproximação normal, ver `_prophet_analytic_sd`) ou
+            "sample" (simulação do próprio Prophet com `n_samples` trajetórias).
+        n_samples: trajetórias usadas por `method="sample"`.
+
+    Returns:
+        tuple: (yhat, lower, upper) como np.ndarray
+    """
+    width = model.interval_width if width is None else width
+    df = _prophet_frame(model, future)
+    trend, additive, multiplicative = _prophet_components(model, df)
+    yhat = trend * (1 + multiplicative) + additive
+    if method == "analytic":
+        from scipy.stats import norm
+
+        half = norm.ppf((1 + width) / 2) * _prophet_analytic_sd(model, df, multiplicative)
+        return yhat, yhat - half, yhat + half
+    if method == "sample":
+        saved = model.uncertainty_samples, model.interval_width
+        model.uncertainty_samples, model.interval_width = n_samples, width
+        try:
+            df["trend"] = trend
+            intervals = model.predict_uncertainty(df, vectorized=True)
+        finally:
+            model.uncertainty_samples, model.interval_width = saved
+        return yhat, intervals["yhat_lower"].to_numpy(), intervals["yhat_upper"].to_numpy()
+    raise ValueError(f"Método de intervalo '{method}' não suportado.")
+
+
+# -------------------------------
+# ARIMA
+# -------------------------------
+def _arima_results(model):
+    """Resultado statsmodels de um pmdarima.ARIMA ou de um ARIMAResults."""
+    return getattr(model, "arima_res_", model)
+
+
+def arima_point_forecast(model, horizon: int) -> np.ndarray:
+    """Previsão pontual dos próximos `horizon` passos, sem montar intervalos."""
+    return np.asarray(_arima_results(model).forecast(horizon))
+
+
+def arima_intervals(model, horizon: int, width: float = 0.95) -> tuple:
+    """
+    Previsão pontual e intervalo analítico (variância do filtro de Kalman).
+
+    Returns:
+        tuple: (yhat, lower, upper) como np.ndarray
+    """
+    forecast = _arima_results(model).get_forecast(horizon)
+    bounds = np.asarray(forecast.conf_int(alpha=1 - width))
+    return np.asarray(forecast.predicted_mean), bounds[:, 0], bounds[:, 1]
@@ -0,0 +1,159 @@
+# forecasting_workflow_engine/modeling/global_mlp.py
+import time
+
+import numpy as np
+from loguru import logger
+import torch
+from torch import nn
+
+from forecasting_workflow_engine.utils import get_device
+
+
+def _flatten(Y):
+    """
+    Converte a entrada em (buffer float32 contíguo, offsets). Aceita matriz
+    (séries x tempo), lista de vetores de tamanhos diferentes ou `SeriesCollection`,
+    cujos buffers são usados diretamente (sem cópia).
+    """
+    if hasattr(Y, "offsets") and hasattr(Y, "values"):
+        return np.asarray(Y.values, dtype=np.float32), np.asarray(Y.offsets, dtype=np.int64)
+    if isinstance(Y, np.ndarray):
+        Y = np.atleast_2d(Y)
+        n_series, length = Y.shape
+        return (np.ascontiguousarray(Y, dtype=np.float32).ravel(),
+                np.arange(n_series + 1, dtype=np.int64) * length)
+    arrays = [np.asarray(y, dtype=np.float32).ravel() for y in Y]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([len(y) for y in arrays], out=offsets[1:])
+    return np.concatenate(arrays), offsets
+
+
+class GlobalMLPForecaster:
+    """
+    Forecaster neural global: um único MLP treinado com janelas de todas as séries,
+    que prevê `horizon` passos a partir dos últimos `window` valores.
+
+    As janelas são views (`sliding_window_view`) sobre um buffer contíguo com todas as
+    séries; só os lotes sorteados em cada passo são copiados. Cada janela é
+    normalizada pela média e desvio da sua entrada, então séries de escalas diferentes
+    compartilham o mesmo modelo. A previsão de todas as séries é um único forward.
+
+    Args:
+        window: tamanho da janela de entrada.
+        horizon: passos previstos.
+        hidden: tamanhos das camadas ocultas.
+        epochs: passagens (em número de janelas) pelo conjunto de treino.
+        batch_size: janelas por passo do otimizador.
+        lr: taxa de aprendizado do Adam.
+        n_threads: threads do PyTorch na CPU (None = padrão do PyTorch).
+        device: "cpu" (padrão), "auto" (`utils.get_device`) ou um torch.device.
+        seed: semente do PyTorch e do sorteio dos lotes.
+    """
+
+    def __init__(self, window: int = 24, horizon: int = 12, hidden=(128, 128), epochs: int = 10,
+                 batch_size: int = 1024, lr: float = 1e-3, n_threads: int = None,
+                 device="cpu", seed: int = 0):
+        self.window = window
+        self.horizon = horizon
+        self.hidden = tuple(hidden)
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.lr = lr
+        self.n_threads = n_threads
+        self.device = get_device(verbose=False) if device == "auto" else torch.device(device)
+        self.seed = seed
+        self.net = None
+        self.history_ = []
+
+    def _build(self) -> nn.Module:
+        layers, size = [], self.window
+        for units in self.hidden:
+            layers += [nn.Linear(size, units), nn.ReLU()]
+            size = units
+        layers.append(nn.Linear(size, self.horizon))
+        return nn.Sequential(*layers).to(self.device)
+
+    @staticmethod
+    def _scale(x: torch.Tensor):
+        mean = x.mean(dim=1, keepdim=True)
+        std = x.std(dim=1, keepdim=True).clamp_min(1e-6)
+        return mean, std
+
+    def fit(self, Y):
+        """
+        Treina com janelas de todas as séries. Séries com menos de `window + horizon`
+        pontos não geram janelas.
+        """
+        if self.n_threads:
+            torch.set_num_threads(self.n_threads)
+        torch.manual_seed(self.seed)
+        rng = np.random.default_rng(self.seed)
+
+        buffer, offsets = _flatten(Y)
+        span = self.window + self.horizon
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, span)
+        # Início válido: a janela inteira dentro de uma única série
+        starts = np.concatenate([np.arange(lo, hi - span + 1)
+                                 for lo, hi in zip(offsets[:-1], offsets[1:]) if hi - lo >= span])
+        if not len(starts):
+            raise ValueError(f"Nenhuma série tem ao menos window + horizon = {span} pontos.")
+
+        self.net = self._build()
+        optimizer = torch.optim.Adam(self.net.parameters(), lr=self.lr)
+        loss_fn = nn.MSELoss()
+        steps = max(1, len(starts) // self.batch_size)
+        start = time.perf_counter()
+        self.net.train()
+        for epoch in range(self.epochs):
+            total = 0.0
+            for _ in range(steps):
+                batch = windows[rng.choice(starts, self.batch_size)]
+                batch = torch.from_numpy(batch).to(self.device)
+                x, y = batch[:, :self.window], batch[:, self.window:]
+                mean, std = self._scale(x)
+                optimizer.zero_grad()
+                loss = loss_fn(self.net((x - mean) / std), (y - mean) / std)
+                loss.backward()
+                optimizer.step()
+                total += loss.item()
+            self.history_.append(total / steps)
+        self.fit_time_ = time.perf_counter() - start
+        logger.info(f"GlobalMLP: {len(starts)} janelas de {len(offsets) - 1} séries, "
+                    f"{self.epochs} épocas em {self.fit_time_:.1f}s "
+                    f"(loss {self.history_[-1]:.4f})")
+        return self
+
+    @torch.no_grad()
+    def predict(self, Y) -> np.ndarray:
+        """
+        Prevê `horizon` passos após o fim de cada série, em um único forward.
+        Todas as séries precisam de ao menos `window` pontos.
+
+        Returns:
+            np.ndarray [n_series, horizon]
+        """
+        if self.net is None:
+            raise RuntimeError("Modelo não treinado: chame fit() antes de predict().")
+        buffer, offsets = _flatten(Y)
+        if np.any(np.diff(offsets) < self.window):
+            raise ValueError(f"Todas as séries precisam de ao menos window = {self.window} "
+                             f"pontos.")
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.window)
+        x = torch.from_numpy(windows[offsets[1:] - self.window]).to(self.device)
+        mean, std = self._scale(x)
+        self.net.eval()
+        return (self.net((x - mean) / std) * std + mean).cpu().numpy()
+
+    def save(self, path):
+        torch.save({"config": {name: getattr(self, name) for name in
+                               ("window", "horizon", "hidden", "epochs", "batch_size", "lr",
+                                "n_threads", "seed")},
+                    "state_dict": self.net.state_dict()}, path)
+
+    @classmethod
+    def load(cls, path, device="cpu") -> "GlobalMLPForecaster":
+        checkpoint = torch.load(path, map_location="cpu")
+        model = cls(**checkpoint["config"], device=device)
+        model.net = model._build()
+        model.net.load_state_dict(checkpoint["state_dict"])
+        return model
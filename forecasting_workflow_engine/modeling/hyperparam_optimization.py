@@ -1,82 +1,453 @@
 # forecasting_workflow_engine/modeling/hyperparam_optimization.py
+import itertools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from loguru import logger
 import numpy as np
-import optuna
-from prophet import Prophet
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import mean_squared_error
+
+from forecasting_workflow_engine.config import CACHE_DIR
+from forecasting_workflow_engine.get_model import (
+    get_prophet_model,
+    prophet_fit_iterations,
+    prophet_stan_init,
+)
+from forecasting_workflow_engine.modeling.arima_search import ArimaOrderSearch
+from forecasting_workflow_engine.modeling.fast_predict import prophet_point_forecast
+from forecasting_workflow_engine.modeling.study_store import PlateauStopper, open_study, study_key
+from forecasting_workflow_engine.profiling import span, timed
+
+
+# -------------------------------
+# Pruning e relatório do estudo
+# -------------------------------
+def _make_pruner(pruner):
+    """
+    Converte o nome do pruner em uma instância do Optuna.
+    Aceita "median", "successive_halving", "none"/None ou um BasePruner pronto.
+    """
+    import optuna
+
+    if isinstance(pruner, optuna.pruners.BasePruner):
+        return pruner
+    if pruner is None or pruner == "none":
+        return optuna.pruners.NopPruner()
+    if pruner == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=3)
+    if pruner == "successive_halving":
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=1, reduction_factor=2)
+    raise ValueError(f"Pruner '{pruner}' não suportado.")
+
+
+def _create_study(kind: str, y, dataset: str = None, storage=None, seed: int = None,
+                  pruner=None, **config):
+    """
+    Estudo em memória (sem `dataset`) ou persistente e semeado por `study_store.open_study`.
+
+    Returns:
+        tuple: (study, trials semeados)
+    """
+    import optuna
+
+    create_kwargs = {"direction": "minimize", "sampler": optuna.samplers.TPESampler(seed=seed)}
+    if pruner is not None:
+        create_kwargs["pruner"] = pruner
+    if dataset is None:
+        return optuna.create_study(**create_kwargs), 0
+    name = study_key(kind, dataset, y, **config)
+    study, _, n_seeded = open_study(name, y, storage=storage, **create_kwargs)
+    return study, n_seeded
+
+
+def _study_report(study, wall_time: float, time_saved: float) -> dict:
+    """
+    Resume o estudo: trials completos/podados, tempo total e tempo de ajuste economizado.
+    """
+    import optuna
+
+    states = [t.state for t in study.trials]
+    report = {
+        "n_trials": len(states),
+        "n_complete": states.count(optuna.trial.TrialState.COMPLETE),
+        "n_pruned": states.count(optuna.trial.TrialState.PRUNED),
+        "wall_time_s": wall_time,
+        "time_saved_s": time_saved,
+    }
+    logger.info(
+        f"Estudo '{study.study_name}': {report['n_complete']} completos, "
+        f"{report['n_pruned']} podados em {wall_time:.1f}s "
+        f"(~{time_saved:.1f}s economizados)"
+    )
+    return report
+
 
 # -------------------------------
 # Otimização Prophet
 # -------------------------------
-def optimize_prophet_params(df, n_trials: int = 20, n_splits: int = 3):
+def _suggest_prophet_params(trial) -> dict:
+    return {
+        "changepoint_prior_scale": trial.suggest_float("changepoint_prior_scale", 0.001, 0.5,
+                                                       log=True),
+        "interval_width": trial.suggest_float("interval_width", 0.7, 0.95),
+    }
+
+
+# Sazonalidades usadas quando nenhuma é detectada/informada
+_DEFAULT_SEASONALITY = {
+    "daily_seasonality": False,
+    "weekly_seasonality": False,
+    "yearly_seasonality": True,
+}
+
+
+def _prophet_fold_mse(train_df, val_df, params: dict, seasonality: dict = None,
+                      init: dict = None) -> tuple:
+    """
+    Ajusta um Prophet em um fold (partindo de `init`, se informado) e retorna
+    (MSE da validação, tempo de ajuste, parâmetros do Stan ajustados, iterações).
+    Função de módulo para poder ser enviada a um pool de processos.
+    """
+    from sklearn.metrics import mean_squared_error
+
+    start = time.perf_counter()
+    model = get_prophet_model(params, seasonality or _DEFAULT_SEASONALITY)
+    with span("prophet_fold_fit", warm=init is not None):
+        model.fit(train_df, **({"init": init} if init is not None else {}))
+    y_pred = prophet_point_forecast(model, val_df['ds'])
+    return (mean_squared_error(val_df['y'], y_pred), time.perf_counter() - start,
+            prophet_stan_init(model), prophet_fit_iterations(model))
+
+
+class _WarmStarts:
+    """
+    Parâmetros do Stan dos ajustes já feitos em cada fold. Um novo ajuste parte do
+    ajuste do mesmo fold com `changepoint_prior_scale` mais próximo (em escala log).
+    Partir do fold anterior quase não reduz iterações (o histórico maior muda o
+    ótimo), então o primeiro trial ajusta a frio e serve de referência por fold para
+    estimar as iterações e o tempo economizados.
+    """
+
+    def __init__(self, n_folds: int):
+        self.fits = [[] for _ in range(n_folds)]
+        self.stats = [{True: [], False: []} for _ in range(n_folds)]
+
+    def closest(self, step: int, params: dict):
+        if not self.fits[step]:
+            return None
+        target = np.log(params["changepoint_prior_scale"])
+        return min(self.fits[step], key=lambda fit: abs(fit[0] - target))[1]
+
+    def add(self, step: int, params: dict, warm: bool, result: tuple):
+        _, elapsed, init, iterations = result
+        self.fits[step].append((np.log(params["changepoint_prior_scale"]), init))
+        if iterations is not None:
+            self.stats[step][warm].append((elapsed, iterations))
+
+    def report(self) -> dict:
+        """
+        Iterações do Stan e economia estimada: por fold, (iterações frias médias -
+        aquecidas médias) x ajustes aquecidos; o tempo usa os segundos por iteração
+        estimados pela inclinação de tempo ~ iterações (o custo fixo de cada ajuste,
+        como preparar os dados e prever, não muda com o warm start).
+        """
+        fits = [fit for stats in self.stats for fit in stats[True] + stats[False]]
+        saved = 0.0
+        for stats in self.stats:
+            cold, warm = stats[False], stats[True]
+            if cold and warm:
+                gain = np.mean([i for _, i in cold]) - np.mean([i for _, i in warm])
+                saved += len(warm) * max(gain, 0.0)
+        report = {"warm_fits": sum(len(stats[True]) for stats in self.stats),
+                  "stan_iterations": int(sum(i for _, i in fits)),
+                  "stan_iterations_saved": float(saved), "warm_time_saved_s": 0.0}
+        times, iterations = np.array(fits, dtype=float).reshape(-1, 2).T
+        if len(set(iterations)) > 1:
+            seconds_per_iteration = max(np.polyfit(iterations, times, 1)[0], 0.0)
+            report["warm_time_saved_s"] = float(saved * seconds_per_iteration)
+        return report
+
+
+def _init_to_attr(init: dict) -> dict:
+    return {name: np.asarray(value).tolist() for name, value in init.items()}
+
+
+def _init_from_attr(attr: dict) -> dict:
+    return {name: np.asarray(value) if isinstance(value, list) else value
+            for name, value in attr.items()}
+
+
+def _resolve_n_jobs(n_jobs: int) -> int:
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+@timed("optimize_prophet")
+def optimize_prophet_params(df, n_trials: int = 20, n_splits: int = 3,
+                            n_jobs: int = 1, executor: Executor = None, seed: int = None,
+                            pruner="median", seasonality: dict = None,
+                            dataset: str = None, storage=None, patience: int = None,
+                            min_delta: float = 1e-3, return_report: bool = False):
     """
     Otimiza hiperparâmetros do Prophet usando TimeSeriesSplit.
-    
+
+    Com `n_jobs > 1` (ou um `executor` externo) os trials continuam sequenciais
+    (ask/tell) e só os folds de cada trial são ajustados em paralelo, então `n_jobs`
+    é limitado a `n_splits` (processos além disso ficariam ociosos). Cada trial vê
+    exatamente o mesmo histórico que no caminho sequencial (`n_jobs=1`), e para um
+    mesmo `seed` o resultado não depende de `n_jobs`.
+
+    O MSE de cada fold é reportado ao Optuna como valor intermediário; trials que o
+    pruner considera ruins param sem ajustar os folds restantes.
+
+    Cada ajuste parte dos parâmetros do Stan do ajuste mais próximo já feito
+    (`_WarmStarts`: mesmo fold e `changepoint_prior_scale` vizinho). Os parâmetros
+    do último fold de cada trial ficam no atributo `stan_init` do trial, e o
+    relatório traz os do melhor trial, para aquecer o
+    ajuste final; iterações e tempo economizados também entram no relatório.
+
+    Com `dataset`, o estudo é persistido (`study_store`) com nome derivado do modelo,
+    do dataset e dos dados: um retreino com os mesmos dados continua o estudo anterior
+    e dados novos abrem um estudo semeado com os melhores trials do último estudo do
+    dataset (ou do dataset mais parecido). Com `patience`, a otimização para quando o
+    melhor MSE não melhora `min_delta` (relativo) em `patience` trials seguidos.
+
     Args:
         df: DataFrame com colunas 'ds' e 'y'.
         n_trials: número de tentativas da otimização.
         n_splits: número de splits para validação cruzada temporal.
+        n_jobs: número de processos (-1 usa todos os núcleos), no máximo `n_splits`.
+        executor: executor já existente (ex.: ProcessPoolExecutor) reaproveitado entre chamadas.
+        seed: semente do sampler TPE.
+        pruner: "median", "successive_halving", "none" ou um pruner do Optuna.
+        seasonality: sazonalidades do Prophet (ex.: `spectral.prophet_seasonality`);
+            padrão: apenas a anual.
+        dataset: nome do dataset; se informado, o estudo é persistente.
+        storage: arquivo journal ou URL do Optuna (padrão: `CACHE_DIR/optuna`).
+        patience: trials sem melhora antes de parar (None = usa todo o orçamento).
+        min_delta: melhora relativa mínima considerada pelo `patience`.
+        return_report: se True, retorna também o relatório do estudo.
 
     Returns:
-        dict: melhores parâmetros encontrados.
+        dict: melhores parâmetros encontrados
+        (ou tupla (params, relatório) quando `return_report=True`).
     """
-    def objective(trial):
-        cps = trial.suggest_float("changepoint_prior_scale", 0.001, 0.5, log=True)
-        interval_width = trial.suggest_float("interval_width", 0.7, 0.95)
-        tscv = TimeSeriesSplit(n_splits=n_splits)
-        mses = []
-
-        for train_idx, val_idx in tscv.split(df):
-            train_df, val_df = df.iloc[train_idx], df.iloc[val_idx]
-            model = Prophet(
-                changepoint_prior_scale=cps,
-                interval_width=interval_width,
-                daily_seasonality=False,
-                weekly_seasonality=False,
-                yearly_seasonality=True
-            )
-            model.fit(train_df)
-            y_pred = model.predict(val_df[['ds']])['yhat']
-            mses.append(mean_squared_error(val_df['y'], y_pred))
-
-        return np.mean(mses)
-
-    study = optuna.create_study(direction='minimize')
-    study.optimize(objective, n_trials=n_trials)
+    import optuna
+    from sklearn.model_selection import TimeSeriesSplit
+
+    n_jobs = _resolve_n_jobs(n_jobs)
+    if n_jobs > n_splits:
+        logger.info(f"n_jobs={n_jobs} limitado a {n_splits}: só os folds de cada trial "
+                    f"são ajustados em paralelo")
+        n_jobs = n_splits
+    folds = list(TimeSeriesSplit(n_splits=n_splits).split(df))
+    study, n_seeded = _create_study("prophet", df["y"].to_numpy(), dataset, storage, seed,
+                                    _make_pruner(pruner), n_splits=n_splits,
+                                    seasonality=seasonality)
+    stopper = PlateauStopper(patience, min_delta)
+    n_before = len(study.trials) - n_seeded  # trials semeados ficam na fila (WAITING)
+    warm_starts = _WarmStarts(len(folds))
+    fit_times, skipped = [], 0
+    start = time.perf_counter()
+    if stopper.should_stop(study):
+        n_trials = 0
+
+    if n_jobs == 1 and executor is None:
+        def objective(trial):
+            nonlocal skipped
+            params = _suggest_prophet_params(trial)
+            mses = []
+            for step, (train_idx, val_idx) in enumerate(folds):
+                init = warm_starts.closest(step, params)
+                result = _prophet_fold_mse(df.iloc[train_idx], df.iloc[val_idx], params,
+                                           seasonality, init)
+                warm_starts.add(step, params, init is not None, result)
+                mse, elapsed, init, _ = result
+                fit_times.append(elapsed)
+                mses.append(mse)
+                trial.report(mse, step)
+                if trial.should_prune():
+                    skipped += len(folds) - step - 1
+                    raise optuna.TrialPruned()
+            trial.set_user_attr("stan_init", _init_to_attr(init))
+            return np.mean(mses)
+
+        study.optimize(objective, n_trials=n_trials, callbacks=[stopper])
+    else:
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+        try:
+            for _ in range(n_trials):
+                if stopper.should_stop(study):
+                    break
+                trial = study.ask()
+                params = _suggest_prophet_params(trial)
+                # Os folds do trial correm em paralelo (e partem só de trials anteriores,
+                # como no caminho sequencial); os resultados são lidos na ordem dos folds
+                # para que o pruner decida no mesmo ponto e os folds seguintes de um
+                # trial podado que ainda estão na fila sejam cancelados.
+                inits = [warm_starts.closest(step, params) for step in range(len(folds))]
+                futures = [executor.submit(_prophet_fold_mse, df.iloc[train_idx],
+                                           df.iloc[val_idx], params, seasonality, inits[step])
+                           for step, (train_idx, val_idx) in enumerate(folds)]
+                mses = []
+                for step, future in enumerate(futures):
+                    result = future.result()
+                    warm_starts.add(step, params, inits[step] is not None, result)
+                    fit_times.append(result[1])
+                    mses.append(result[0])
+                    trial.report(result[0], step)
+                    if trial.should_prune():
+                        skipped += sum(f.cancel() for f in futures[step + 1:])
+                        study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+                        break
+                else:
+                    trial.set_user_attr("stan_init", _init_to_attr(result[2]))
+                    study.tell(trial, float(np.mean(mses)))
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    # Estimativa: cada fold não ajustado custaria um ajuste médio
+    time_saved = skipped * float(np.mean(fit_times)) if fit_times else 0.0
+    report = _study_report(study, time.perf_counter() - start, time_saved)
+    report.update({"n_new_trials": len(study.trials) - n_before, "n_seeded": n_seeded,
+                   "stopped_early": int(stopper.stopped), **warm_starts.report()})
+    logger.info(f"Warm start: {report['warm_fits']} ajustes aquecidos, "
+                f"~{report['stan_iterations_saved']:.0f} iterações e "
+                f"~{report['warm_time_saved_s']:.1f}s economizados")
+    if return_report:
+        best_init = study.best_trial.user_attrs.get("stan_init")
+        report["stan_init"] = _init_from_attr(best_init) if best_init else None
+        return study.best_params, report
     return study.best_params
 
 
 # -------------------------------
 # Otimização ARIMA
 # -------------------------------
-def optimize_arima_order(y, n_trials: int = 20, p_range=(0,5), d_range=(0,2), q_range=(0,5)):
+@timed("optimize_arima")
+def optimize_arima_order(y, n_trials: int = 20, p_range=(0,5), d_range=(0,2), q_range=(0,5),
+                         maxiter: int = 50, divergence_factor: float = 10.0,
+                         n_jobs: int = 1, seed: int = None, persist: bool = True,
+                         dataset: str = None, storage=None, patience: int = None,
+                         min_delta: float = 1e-3, return_report: bool = False):
     """
     Otimiza ordem do ARIMA (p,d,q) usando Optuna.
 
+    As avaliações passam pelo `ArimaOrderSearch`: cada ordem é ajustada uma única vez
+    por série (sugestões repetidas do Optuna usam o cache e não consomem o orçamento),
+    cada ajuste parte dos parâmetros da ordem vizinha já ajustada e, com `persist=True`,
+    o cache fica em `CACHE_DIR/arima_orders` para as próximas execuções. Quando o
+    espaço (p,d,q) tem no máximo `n_trials` pontos, a busca é exaustiva e paralela.
+
+    Ajustes que divergem são abortados e o trial é marcado como podado: o otimizador
+    é interrompido quando os parâmetros deixam de ser finitos ou a variância das
+    inovações passa de `divergence_factor` vezes a variância da série. Se todas as
+    ordens divergirem, um `ValueError` lista as ordens avaliadas.
+
+    `dataset`, `storage`, `patience` e `min_delta` funcionam como em
+    `optimize_prophet_params` (estudo persistente semeado e parada por estabilização).
+
     Args:
         y: série temporal univariada.
-        n_trials: número de tentativas da otimização.
+        n_trials: número de ordens distintas a avaliar.
         p_range, d_range, q_range: intervalos para p,d,q.
+        maxiter: limite de iterações do otimizador em cada ajuste.
+        divergence_factor: múltiplo da variância da série que caracteriza divergência.
+        n_jobs: número de processos da busca exaustiva (-1 usa todos os núcleos).
+        seed: semente do sampler TPE.
+        persist: se True, lê e grava o cache de ordens em disco.
+        dataset: nome do dataset; se informado, o estudo é persistente.
+        storage: arquivo journal ou URL do Optuna (padrão: `CACHE_DIR/optuna`).
+        patience: ordens sem melhora antes de parar (None = usa todo o orçamento).
+        min_delta: melhora relativa mínima considerada pelo `patience`.
+        return_report: se True, retorna também o relatório do estudo.
 
     Returns:
-        tuple: melhor ordem (p,d,q).
+        tuple: melhor ordem (p,d,q)
+        (ou tupla (ordem, relatório) quando `return_report=True`).
     """
-    def objective(trial):
-        p = trial.suggest_int("p", *p_range)
-        d = trial.suggest_int("d", *d_range)
-        q = trial.suggest_int("q", *q_range)
-        try:
-            model = ARIMA(y, order=(p,d,q))
-            model_fit = model.fit()
-            y_pred = model_fit.fittedvalues
-            mse = mean_squared_error(y, y_pred)
-        except:
-            mse = np.inf
-        return mse
-
-    study = optuna.create_study(direction='minimize')
-    study.optimize(objective, n_trials=n_trials)
-    
+    import optuna
+
+    search = ArimaOrderSearch(y, maxiter=maxiter, divergence_factor=divergence_factor,
+                              cache_dir=CACHE_DIR / "arima_orders" if persist else None)
+    distributions = {name: optuna.distributions.IntDistribution(*bounds)
+                     for name, bounds in zip("pdq", (p_range, d_range, q_range))}
+    space = list(itertools.product(*(range(lo, hi + 1) for lo, hi in (p_range, d_range, q_range))))
+    study, n_seeded = _create_study("arima", y, dataset, storage, seed,
+                                    p_range=p_range, d_range=d_range, q_range=q_range)
+    stopper = PlateauStopper(patience, min_delta)
+    n_before = len(study.trials) - n_seeded  # trials semeados ficam na fila (WAITING)
+    start = time.perf_counter()
+    misses_before = search.misses
+
+    def to_trial(order, result):
+        params = dict(zip("pdq", order))
+        if result["status"] == "diverged":
+            return optuna.trial.create_trial(params=params, distributions=distributions,
+                                             state=optuna.trial.TrialState.PRUNED)
+        return optuna.trial.create_trial(params=params, distributions=distributions,
+                                         value=result["mse"])
+
+    def tell(trial, result):
+        if result["status"] == "diverged":
+            study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+        else:
+            study.tell(trial, result["mse"])
+
+    if stopper.should_stop(study):
+        logger.info(f"Estudo '{study.study_name}' já estabilizado: nenhuma ordem nova avaliada")
+    elif len(space) <= n_trials:
+        logger.info(f"Espaço ARIMA com {len(space)} ordens: busca exaustiva")
+        # Estudo retomado: ordens já registradas não são adicionadas de novo. Os trials
+        # semeados (WAITING) não têm parâmetros até o `ask`, que os tira da fila; são
+        # avaliados junto com o restante do espaço
+        done = {tuple(t.params[k] for k in "pdq") for t in study.trials
+                if t.state.is_finished()}
+        waiting = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.WAITING,))
+        seeded = [study.ask(distributions) for _ in waiting]
+        seeded_orders = [tuple(trial.params[k] for k in "pdq") for trial in seeded]
+        space = [order for order in space if order not in done and order not in seeded_orders]
+        results = search.evaluate_many(seeded_orders + space, n_jobs=_resolve_n_jobs(n_jobs))
+        for trial, result in zip(seeded, results):
+            tell(trial, result)
+        for order, result in zip(space, results[len(seeded):]):
+            study.add_trial(to_trial(order, result))
+    else:
+        seen = set()
+        for _ in range(10 * n_trials):
+            if len(seen) >= n_trials or stopper.should_stop(study):
+                break
+            trial = study.ask(distributions)
+            order = (trial.params["p"], trial.params["d"], trial.params["q"])
+            result = search.evaluate(order)
+            seen.add(order)
+            tell(trial, result)
+    search.save()
+
+    # Estimativa: cada ajuste abortado ou reaproveitado do cache custaria um ajuste completo médio
+    evaluated = list(search.results.values())
+    fit_times = [r["elapsed"] for r in evaluated if r["status"] != "diverged"]
+    mean_fit = float(np.mean(fit_times)) if fit_times else 0.0
+    aborted = sum((max(mean_fit - r["elapsed"], 0.0) for r in evaluated
+                   if r["status"] == "diverged"), 0.0)
+    report = _study_report(study, time.perf_counter() - start, aborted + search.hits * mean_fit)
+    report.update({"cache_hits": search.hits, "fits": search.misses - misses_before,
+                   "n_new_trials": len(study.trials) - n_before, "n_seeded": n_seeded,
+                   "stopped_early": int(stopper.stopped)})
+
+    if not study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+        diverged = sorted(order for order, r in search.results.items()
+                          if r["status"] == "diverged")
+        raise ValueError(f"Nenhuma ordem ARIMA convergiu; ordens divergentes: {diverged}. "
+                         f"Revise os intervalos de p,d,q ou aumente `divergence_factor`.")
     best = study.best_params
-    return best["p"], best["d"], best["q"]
+    order = (best["p"], best["d"], best["q"])
+    if return_report:
+        return order, report
+    return order
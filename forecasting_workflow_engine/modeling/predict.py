@@ -0,0 +1,201 @@
+# forecasting_workflow_engine/modeling/predict.py
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.config import MODELS_DIR, REPORTS_DIR, configure_logging
+from forecasting_workflow_engine.modeling.serialization import load_model
+
+
+# Sufixos dos arquivos de modelo, em ordem de preferência
+MODEL_SUFFIXES = ("_model.json.gz", "_model.json", "_model.pkl")
+
+
+def resolve_model_path(model_name: str, models_dir: Path = MODELS_DIR) -> Path:
+    """
+    Localiza o arquivo de um modelo salvo em `models_dir`.
+    Aceita o nome completo do arquivo ou o prefixo (ex.: "air_passengers_prophet"),
+    dando preferência ao formato compacto sobre `.pkl`.
+    """
+    models_dir = Path(models_dir)
+    if (models_dir / model_name).is_file():
+        return models_dir / model_name
+    for suffix in MODEL_SUFFIXES:
+        candidate = models_dir / f"{model_name}{suffix}"
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Modelo '{model_name}' não encontrado em {models_dir}")
+
+
+def list_models(models_dir: Path = MODELS_DIR) -> list:
+    """Nomes (prefixos aceitos por `resolve_model_path`) dos modelos salvos em `models_dir`."""
+    names = set()
+    for path in Path(models_dir).glob("*_model.*"):
+        for suffix in MODEL_SUFFIXES:
+            if path.name.endswith(suffix):
+                names.add(path.name[:-len(suffix)])
+    return sorted(names)
+
+
+class ModelCache:
+    """
+    Cache LRU de modelos desserializados, com tamanho máximo `maxsize`.
+    Uma entrada é recarregada quando o arquivo do modelo muda (mtime).
+    """
+
+    def __init__(self, maxsize: int = 32, models_dir: Path = MODELS_DIR):
+        self.maxsize = maxsize
+        self.models_dir = Path(models_dir)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_name: str):
+        path = resolve_model_path(model_name, self.models_dir)
+        mtime = path.stat().st_mtime_ns
+        entry = self._entries.get(model_name)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            self._entries.move_to_end(model_name)
+            return entry[1]
+        self.misses += 1
+        forecaster = load_model(path)
+        self._entries[model_name] = (mtime, forecaster)
+        self._entries.move_to_end(model_name)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return forecaster
+
+
+def predict_many(requests, cache: ModelCache = None, intervals: str = None,
+                 interval_samples: int = 1000) -> pd.DataFrame:
+    """
+    Executa várias previsões agrupando as requisições por modelo.
+
+    Para cada modelo é feita uma única chamada de previsão com o maior horizonte
+    pedido; os horizontes menores são fatias desse mesmo vetor. Por padrão só a
+    previsão pontual é calculada.
+
+    Args:
+        requests: iterável de (nome_do_modelo, horizonte).
+        cache: `ModelCache` reaproveitado entre chamadas (um novo é criado se None).
+        intervals: None (sem intervalos), "analytic" ou "sample"
+            (ver `LazyForecaster.forecast_interval`).
+        interval_samples: trajetórias simuladas quando `intervals="sample"`.
+
+    Returns:
+        pd.DataFrame longo com colunas model, horizon, step e yhat
+        (mais yhat_lower e yhat_upper quando `intervals` é informado).
+    """
+    cache = cache or ModelCache()
+    by_model = {}
+    for model_name, horizon in requests:
+        by_model.setdefault(model_name, []).append(int(horizon))
+
+    model_col, horizon_col, step_col, values, lower, upper = [], [], [], [], [], []
+    for model_name, horizons in by_model.items():
+        forecaster = cache.get(model_name)
+        if intervals:
+            yhat, yhat_lower, yhat_upper = forecaster.forecast_interval(
+                max(horizons), method=intervals, n_samples=interval_samples)
+        else:
+            yhat = forecaster.forecast(max(horizons))
+        for horizon in horizons:
+            model_col.append(np.full(horizon, model_name, dtype=object))
+            horizon_col.append(np.full(horizon, horizon, dtype=np.int32))
+            step_col.append(np.arange(1, horizon + 1, dtype=np.int32))
+            values.append(yhat[:horizon])
+            if intervals:
+                lower.append(yhat_lower[:horizon])
+                upper.append(yhat_upper[:horizon])
+
+    columns = ["model", "horizon", "step", "yhat"]
+    if intervals:
+        columns += ["yhat_lower", "yhat_upper"]
+    if not values:
+        return pd.DataFrame(columns=columns)
+    result = pd.DataFrame({
+        "model": np.concatenate(model_col),
+        "horizon": np.concatenate(horizon_col),
+        "step": np.concatenate(step_col),
+        "yhat": np.concatenate(values),
+    })
+    if intervals:
+        result["yhat_lower"] = np.concatenate(lower)
+        result["yhat_upper"] = np.concatenate(upper)
+    return result
+
+
+def write_predictions(df: pd.DataFrame, output_path: Path) -> Path:
+    """
+    Grava as previsões de uma vez em formato colunar (Parquet). Sem pyarrow/fastparquet
+    instalado, grava CSV no mesmo caminho com extensão `.csv`.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        df.to_parquet(output_path, index=False)
+    except ImportError:
+        output_path = output_path.with_suffix(".csv")
+        logger.warning(f"Engine Parquet indisponível; gravando CSV em {output_path}")
+        df.to_csv(output_path, index=False)
+    return output_path
+
+
+def run_batch_inference(requests, output_path: Path = REPORTS_DIR / "predictions.parquet",
+                        cache: ModelCache = None, intervals: str = None,
+                        interval_samples: int = 1000) -> dict:
+    """
+    Pontua um lote de requisições (modelo, horizonte), grava o resultado e
+    reporta a vazão em previsões por segundo. `intervals` e `interval_samples`
+    são repassados a `predict_many`.
+    """
+    cache = cache or ModelCache()
+    requests = list(requests)
+    start = time.perf_counter()
+    predictions = predict_many(requests, cache, intervals, interval_samples)
+    elapsed = time.perf_counter() - start
+    output_path = write_predictions(predictions, output_path)
+    stats = {
+        "requests": len(requests),
+        "forecasts": len(predictions),
+        "elapsed_s": elapsed,
+        "forecasts_per_s": len(predictions) / elapsed if elapsed > 0 else float("inf"),
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "output_path": str(output_path),
+    }
+    logger.info(f"Inferência em lote: {stats}")
+    return stats
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    from typing import List, Optional
+
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def main(
+        models: List[str] = typer.Option(..., "--model"),
+        horizons: List[int] = typer.Option([12], "--horizon"),
+        output_path: Path = REPORTS_DIR / "predictions.parquet",
+        cache_size: int = 32,
+        intervals: Optional[str] = typer.Option(None, help="analytic ou sample"),
+        interval_samples: int = 1000
+    ):
+        requests = [(model_name, horizon) for model_name in models for horizon in horizons]
+        stats = run_batch_inference(requests, output_path, ModelCache(maxsize=cache_size),
+                                    intervals, interval_samples)
+        logger.success(f"Previsões gravadas em {stats['output_path']}")
+
+    configure_logging()
+    app()
@@ -0,0 +1,236 @@
+# forecasting_workflow_engine/modeling/serialization.py
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+FORMAT_VERSION = 1
+
+
+# -------------------------------
+# Serialização por backend
+# -------------------------------
+def _prophet_to_dict(model) -> dict:
+    """
+    Estado mínimo de um Prophet ajustado: configuração, escalas, changepoints,
+    sazonalidades e parâmetros do Stan. O histórico de treino é reduzido à última
+    observação (só usada para gerar datas futuras).
+    """
+    from prophet.serialize import model_to_json
+
+    doc = json.loads(model_to_json(model))
+    doc["history"] = model.history.tail(1).to_json(orient="table", index=False)
+    doc["history_dates"] = model.history_dates.tail(1).to_json(orient="split", date_format="iso")
+    return {
+        "backend": "prophet",
+        "freq": pd.infer_freq(model.history_dates) or "D",
+        "model": doc,
+    }
+
+
+def _prophet_from_dict(doc: dict):
+    from prophet.serialize import model_from_json
+
+    return model_from_json(json.dumps(doc["model"]))
+
+
+def _arima_results(model):
+    """Extrai o resultado statsmodels de um pmdarima.ARIMA ou de um ARIMAResults."""
+    return getattr(model, "arima_res_", model)
+
+
+def _arima_to_dict(model) -> dict:
+    """
+    Estado mínimo de um ARIMA/SARIMAX ajustado: especificação, parâmetros, última
+    observação e o estado previsto (média e covariância) antes dela. Reaplicar o filtro
+    de Kalman a partir desse estado reproduz exatamente as previsões do modelo original.
+    """
+    res = _arima_results(model)
+    if res.model.k_exog:
+        raise ValueError("Serialização compacta não suporta ARIMA com variáveis exógenas.")
+    n = res.nobs
+    init_kwds = res.model._get_init_kwds()
+    init_kwds.pop("exog", None)
+    init_kwds["trend_offset"] = init_kwds.get("trend_offset", 1) + n - 1
+    return {
+        "backend": "arima",
+        "model_class": type(res.model).__name__,
+        "init_kwds": init_kwds,
+        "params": np.asarray(res.params).tolist(),
+        "endog_tail": np.asarray(res.model.endog).ravel()[-1:].tolist(),
+        "state": res.predicted_state[:, n - 1].tolist(),
+        "state_cov": res.predicted_state_cov[:, :, n - 1].tolist(),
+        "nobs": int(n),
+    }
+
+
+def _arima_from_dict(doc: dict):
+    from statsmodels.tsa.arima.model import ARIMA
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    model_class = {"SARIMAX": SARIMAX, "ARIMA": ARIMA}[doc["model_class"]]
+    init_kwds = {k: tuple(v) if isinstance(v, list) else v for k, v in doc["init_kwds"].items()}
+    model = model_class(np.asarray(doc["endog_tail"]), **init_kwds)
+    model.initialize_known(np.asarray(doc["state"]), np.asarray(doc["state_cov"]))
+    return model.filter(np.asarray(doc["params"]))
+
+
+def _baseline_to_dict(model) -> dict:
+    """Configuração e estado final dos baselines (sem os valores ajustados no treino)."""
+    from forecasting_workflow_engine.modeling.baselines import STATE_ATTRS
+
+    return {
+        "backend": "baseline",
+        "method": model.method,
+        "season_length": model.season_length,
+        "state": {attr: np.asarray(getattr(model, attr)).tolist()
+                  for attr in STATE_ATTRS if hasattr(model, attr)},
+    }
+
+
+def _baseline_from_dict(doc: dict):
+    from forecasting_workflow_engine.modeling.baselines import BaselineForecaster
+
+    model = BaselineForecaster(doc["method"], season_length=doc["season_length"])
+    for attr, value in doc["state"].items():
+        setattr(model, attr, np.asarray(value))
+    return model
+
+
+_BACKENDS = {
+    "prophet": (_prophet_to_dict, _prophet_from_dict),
+    "arima": (_arima_to_dict, _arima_from_dict),
+    "baseline": (_baseline_to_dict, _baseline_from_dict),
+}
+
+
+def _backend_of(model) -> str:
+    name = type(model).__module__
+    if name.startswith("prophet"):
+        return "prophet"
+    if name.startswith(("pmdarima", "statsmodels")):
+        return "arima"
+    if name == "forecasting_workflow_engine.modeling.baselines":
+        return "baseline"
+    raise ValueError(f"Modelo do tipo '{type(model).__name__}' não suportado.")
+
+
+# -------------------------------
+# Preditor com carregamento tardio
+# -------------------------------
+class LazyForecaster:
+    """
+    Envolve um modelo salvo; o modelo só é reconstruído no primeiro uso.
+
+    `forecast(horizon)` devolve as previsões pontuais dos próximos `horizon`
+    períodos como np.ndarray, independente do backend, sem calcular intervalos;
+    `forecast_interval(horizon)` devolve também os limites do intervalo.
+    """
+
+    def __init__(self, doc: dict = None, model=None, backend: str = None):
+        self._doc = doc
+        self._model = model
+        self.backend = backend or doc["backend"]
+        self.metadata = (doc or {}).get("metadata", {})
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = _BACKENDS[self.backend][1](self._doc)
+        return self._model
+
+    def _future(self, horizon: int) -> pd.DataFrame:
+        model = self.model
+        freq = self._doc["freq"] if self._doc else (pd.infer_freq(model.history_dates) or "D")
+        return model.make_future_dataframe(periods=horizon, freq=freq, include_history=False)
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        from forecasting_workflow_engine.modeling.fast_predict import (
+            arima_point_forecast,
+            prophet_point_forecast,
+        )
+
+        if self.backend == "prophet":
+            return prophet_point_forecast(self.model, self._future(horizon))
+        if self.backend == "baseline":
+            return self.model.predict(horizon)[0]
+        return arima_point_forecast(self.model, horizon)
+
+    def forecast_interval(self, horizon: int, width: float = None, method: str = "analytic",
+                          n_samples: int = 1000) -> tuple:
+        """
+        (yhat, lower, upper) dos próximos `horizon` períodos. No Prophet, `method`
+        escolhe a aproximação analítica ou a simulação com `n_samples` trajetórias
+        (ver `fast_predict.prophet_intervals`); no ARIMA e nos baselines o intervalo é
+        sempre analítico. `width` padrão: o `interval_width` do Prophet ou 0.95.
+        """
+        from forecasting_workflow_engine.modeling.fast_predict import (
+            arima_intervals,
+            prophet_intervals,
+        )
+
+        if self.backend == "prophet":
+            return prophet_intervals(self.model, self._future(horizon), width, method, n_samples)
+        if self.backend == "baseline":
+            return tuple(a[0] for a in self.model.predict_interval(horizon, 0.95 if width is None
+                                                                   else width))
+        return arima_intervals(self.model, horizon, 0.95 if width is None else width)
+
+
+# -------------------------------
+# API pública
+# -------------------------------
+def save_model(model, path, compress: bool = True, metadata: dict = None) -> Path:
+    """
+    Salva o modelo no formato compacto (JSON, gzip opcional).
+
+    Args:
+        model: Prophet, pmdarima.ARIMA, resultado ARIMA/SARIMAX do statsmodels ou
+            `BaselineForecaster` (uma série).
+        path: caminho de destino; a extensão `.json`/`.json.gz` é ajustada conforme `compress`.
+        compress: se True, comprime com gzip.
+        metadata: dicionário extra salvo junto ao modelo.
+
+    Returns:
+        Path: caminho efetivamente gravado.
+    """
+    backend = _backend_of(model)
+    doc = _BACKENDS[backend][0](model)
+    doc["format_version"] = FORMAT_VERSION
+    doc["metadata"] = metadata or {}
+    payload = json.dumps(doc).encode()
+
+    path = Path(path)
+    stem = path.name.split(".")[0]
+    path = path.with_name(f"{stem}.json.gz" if compress else f"{stem}.json")
+    if compress:
+        # mtime=0: o mesmo modelo gera sempre os mesmos bytes (deduplicação no ArtifactStore)
+        payload = gzip.compress(payload, compresslevel=6, mtime=0)
+    path.write_bytes(payload)
+    logger.info(f"Modelo {backend} salvo em {path} ({len(payload) / 1024:.1f} KiB)")
+    return path
+
+
+def load_model(path) -> LazyForecaster:
+    """
+    Carrega um modelo salvo por `save_model` sem reconstruí-lo ainda.
+    Arquivos `.pkl` antigos (joblib) continuam suportados.
+    """
+    path = Path(path)
+    if path.suffix == ".pkl":
+        import joblib
+
+        model = joblib.load(path)
+        return LazyForecaster(model=model, backend=_backend_of(model))
+
+    payload = path.read_bytes()
+    if path.suffix == ".gz":
+        payload = gzip.decompress(payload)
+    doc = json.loads(payload)
+    if doc.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Versão de formato não suportada em {path}: "
+                         f"{doc.get('format_version')}")
+    return LazyForecaster(doc=doc)
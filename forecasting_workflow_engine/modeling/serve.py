@@ -0,0 +1,395 @@
+# forecasting_workflow_engine/modeling/serve.py
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from loguru import logger
+
+from forecasting_workflow_engine.config import MODELS_DIR, configure_logging
+from forecasting_workflow_engine.modeling.predict import (
+    ModelCache,
+    list_models,
+    resolve_model_path,
+)
+
+INTERVAL_METHODS = ("analytic", "sample")
+
+# Maior horizonte aceito por requisição
+MAX_HORIZON = 10_000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------
+# Estatísticas
+# -------------------------------
+class LatencyStats:
+    """
+    Latência das últimas `maxlen` requisições de previsão: p50/p99 e requisições
+    por segundo na janela de `window_s` segundos mais recente.
+    """
+
+    def __init__(self, maxlen: int = 100_000, window_s: int = 10):
+        self.window_s = window_s
+        self.latencies = deque(maxlen=maxlen)
+        # Contagem por segundo: [segundo, requisições]
+        self.per_second = deque(maxlen=window_s + 1)
+        self.total = 0
+        self.started = time.monotonic()
+        self.first_request = None
+
+    def add(self, latency: float):
+        now = time.monotonic()
+        self.latencies.append(latency)
+        self.total += 1
+        self.first_request = self.first_request or now
+        second = int(now)
+        if self.per_second and self.per_second[-1][0] == second:
+            self.per_second[-1][1] += 1
+        else:
+            self.per_second.append([second, 1])
+
+    def report(self) -> dict:
+        now = time.monotonic()
+        latencies = np.fromiter(self.latencies, dtype=float, count=len(self.latencies))
+        recent = sum(count for second, count in self.per_second if now - second <= self.window_s)
+        window = min(self.window_s, now - (self.first_request or now)) or 1.0
+        p50, p99 = (None, None)
+        if len(latencies):
+            p50, p99 = (np.percentile(latencies, [50, 99]) * 1e3).tolist()
+        return {"requests": self.total, "rps": recent / window, "p50_ms": p50, "p99_ms": p99,
+                "uptime_s": now - self.started}
+
+
+# -------------------------------
+# Servidor
+# -------------------------------
+class ForecastServer:
+    """
+    Serviço HTTP local (asyncio, sem dependências) que responde previsões dos
+    modelos salvos por `train()` em `models_dir`.
+
+    - Na partida, todos os modelos são carregados e a previsão até
+      `precompute_horizon` de cada um é calculada.
+    - Respostas prontas (JSON já codificado) ficam em um cache LRU por
+      (modelo, horizonte, intervalos); horizontes menores que a previsão guardada
+      do modelo são fatias dela, sem recalcular.
+    - Requisições que precisam de cálculo esperam até `batch_window_ms` e são
+      atendidas por uma única previsão com o maior horizonte do lote (e requisições
+      cobertas por um cálculo em andamento esperam por ele).
+    - A cada `poll_interval` s o mtime dos arquivos é verificado: modelo alterado
+      é recarregado e suas previsões em cache são descartadas; modelos novos entram.
+
+    Os cálculos rodam em uma única thread auxiliar (o `ModelCache` não é
+    compartilhado entre threads), sem bloquear o laço de eventos.
+
+    Rotas: `GET /forecast?model=<nome>&horizon=<h>[&intervals=analytic|sample]`,
+    `GET /models`, `GET /stats` (latência p50/p99, requisições/s, acertos de cache,
+    tamanho médio dos lotes) e `GET /health`.
+    """
+
+    def __init__(self, models_dir: Path = MODELS_DIR, batch_window_ms: float = 2.0,
+                 max_batch: int = 256, precompute_horizon: int = 30, poll_interval: float = 1.0,
+                 response_cache_size: int = 4096, interval_samples: int = 1000):
+        self.models_dir = Path(models_dir)
+        self.batch_window = batch_window_ms / 1e3
+        self.max_batch = max_batch
+        self.precompute_horizon = precompute_horizon
+        self.poll_interval = poll_interval
+        self.response_cache_size = response_cache_size
+        self.interval_samples = interval_samples
+        self.models = ModelCache(maxsize=2 ** 16, models_dir=self.models_dir)
+        self.latency = LatencyStats()
+        self.counters = {"response_hits": 0, "forecast_hits": 0, "computed": 0, "batches": 0,
+                         "batched_requests": 0, "reloads": 0}
+        self._versions = {}
+        self._forecasts = {}
+        self._responses = OrderedDict()
+        self._pending = {}
+        self._inflight = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+        self._server = None
+        self._watcher = None
+
+    # --- Versões (mtime) dos modelos ---
+    def _file_version(self, model: str) -> int:
+        return resolve_model_path(model, self.models_dir).stat().st_mtime_ns
+
+    def _version(self, model: str) -> int:
+        version = self._versions.get(model)
+        if version is None:
+            version = self._versions[model] = self._file_version(model)
+        return version
+
+    def _refresh(self) -> list:
+        """Atualiza as versões; retorna os modelos novos ou alterados."""
+        changed = []
+        names = list_models(self.models_dir)
+        for model in names:
+            try:
+                version = self._file_version(model)
+            except FileNotFoundError:
+                continue
+            if self._versions.get(model) != version:
+                if model in self._versions:
+                    self.counters["reloads"] += 1
+                    logger.info(f"Modelo '{model}' alterado: cache de previsões descartado")
+                self._versions[model] = version
+                for key in [k for k in self._forecasts if k[0] == model]:
+                    del self._forecasts[key]
+                changed.append(model)
+        for model in set(self._versions) - set(names):
+            del self._versions[model]
+        return changed
+
+    async def _warm(self, models: list):
+        for model in models:
+            try:
+                await self.forecast(model, self.precompute_horizon)
+            except Exception as exc:
+                logger.warning(f"Falha ao pré-calcular '{model}': {exc}")
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self._warm(self._refresh())
+
+    # --- Previsões ---
+    def _compute(self, model: str, intervals: str, horizon: int) -> tuple:
+        forecaster = self.models.get(model)
+        if intervals:
+            arrays = forecaster.forecast_interval(horizon, method=intervals,
+                                                  n_samples=self.interval_samples)
+        else:
+            arrays = (forecaster.forecast(horizon),)
+        return tuple(np.asarray(a, dtype=float) for a in arrays)
+
+    async def _run_batch(self, key: tuple, pending: list):
+        model, intervals = key
+        horizon = max(max(h for h, _ in pending), self.precompute_horizon)
+        version = self._version(model)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._compute, model, intervals, horizon)
+        self._inflight[key] = (horizon, version, future)
+        self.counters["batches"] += 1
+        self.counters["batched_requests"] += len(pending)
+        try:
+            arrays = await future
+        except Exception as exc:
+            for _, waiter in pending:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+        finally:
+            if self._inflight.get(key, (None, None, None))[2] is future:
+                del self._inflight[key]
+        self.counters["computed"] += 1
+        entry = self._forecasts.get(key)
+        if entry is None or entry[0] != version or len(entry[1][0]) < horizon:
+            self._forecasts[key] = (version, arrays)
+        for _, waiter in pending:
+            if not waiter.done():
+                waiter.set_result(arrays)
+
+    def _flush(self, key: tuple):
+        pending = self._pending.pop(key, None)
+        if pending:
+            asyncio.ensure_future(self._run_batch(key, pending))
+
+    async def _enqueue(self, model: str, intervals: str, horizon: int, version: int) -> tuple:
+        key = (model, intervals)
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] >= horizon and inflight[1] == version:
+            return await asyncio.shield(inflight[2])
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((horizon, waiter))
+        if len(pending) >= self.max_batch:
+            self._flush(key)
+        elif len(pending) == 1:
+            loop.call_later(self.batch_window, self._flush, key)
+        return await waiter
+
+    @staticmethod
+    def _encode(model: str, horizon: int, intervals: str, arrays: tuple) -> bytes:
+        doc = {"model": model, "horizon": horizon, "yhat": arrays[0][:horizon].tolist()}
+        if intervals:
+            doc["yhat_lower"] = arrays[1][:horizon].tolist()
+            doc["yhat_upper"] = arrays[2][:horizon].tolist()
+        return json.dumps(doc).encode()
+
+    async def forecast(self, model: str, horizon: int, intervals: str = None) -> bytes:
+        """Resposta JSON (já codificada) com a previsão de `horizon` passos de `model`."""
+        version = self._version(model)
+        response_key = (model, horizon, intervals)
+        cached = self._responses.get(response_key)
+        if cached is not None and cached[0] == version:
+            self._responses.move_to_end(response_key)
+            self.counters["response_hits"] += 1
+            return cached[1]
+
+        entry = self._forecasts.get((model, intervals))
+        if entry is not None and entry[0] == version and len(entry[1][0]) >= horizon:
+            self.counters["forecast_hits"] += 1
+            arrays = entry[1]
+        else:
+            arrays = await self._enqueue(model, intervals, horizon, version)
+        body = self._encode(model, horizon, intervals, arrays)
+        self._responses[response_key] = (version, body)
+        while len(self._responses) > self.response_cache_size:
+            self._responses.popitem(last=False)
+        return body
+
+    def stats(self) -> dict:
+        batches = self.counters["batches"]
+        return {**self.latency.report(), **self.counters,
+                "mean_batch_size": self.counters["batched_requests"] / batches if batches else 0.0,
+                "models": len(self._versions), "cached_responses": len(self._responses)}
+
+    # --- HTTP ---
+    async def _route(self, method: str, target: str) -> tuple:
+        if method != "GET":
+            raise HTTPError(405, f"Método {method} não suportado")
+        url = urlsplit(target)
+        if url.path == "/forecast":
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if "model" not in query:
+                raise HTTPError(400, "Parâmetro 'model' obrigatório")
+            try:
+                horizon = int(query.get("horizon", 12))
+            except ValueError:
+                raise HTTPError(400, "'horizon' deve ser inteiro") from None
+            if not 1 <= horizon <= MAX_HORIZON:
+                raise HTTPError(400, f"'horizon' deve estar entre 1 e {MAX_HORIZON}")
+            intervals = query.get("intervals") or None
+            if intervals is not None and intervals not in INTERVAL_METHODS:
+                raise HTTPError(400, f"'intervals' deve ser um de {INTERVAL_METHODS}")
+            try:
+                return await self.forecast(query["model"], horizon, intervals), True
+            except FileNotFoundError as exc:
+                raise HTTPError(404, str(exc)) from None
+        if url.path == "/stats":
+            return json.dumps(self.stats()).encode(), False
+        if url.path == "/models":
+            return json.dumps({"models": sorted(self._versions)}).encode(), False
+        if url.path == "/health":
+            return b'{"status": "ok"}', False
+        raise HTTPError(404, f"Rota {url.path} não encontrada")
+
+    @staticmethod
+    def _response(status: int, body: bytes, keep_alive: bool) -> bytes:
+        head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + body
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                headers = dict((k.strip().lower(), v.strip()) for k, v in
+                               (line.split(":", 1) for line in header_lines if ":" in line))
+                if int(headers.get("content-length", 0) or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+                keep_alive = headers.get("connection", "").lower() != "close"
+                is_forecast = False
+                try:
+                    method, target = request_line.split(" ")[:2]
+                    body, is_forecast = await self._route(method, target)
+                    status = 200
+                except HTTPError as exc:
+                    status, body = exc.status, json.dumps({"error": str(exc)}).encode()
+                except Exception as exc:
+                    logger.exception("Falha ao atender requisição")
+                    status, body = 500, json.dumps({"error": str(exc)}).encode()
+                writer.write(self._response(status, body, keep_alive))
+                await writer.drain()
+                if is_forecast:
+                    self.latency.add(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        """Carrega e pré-calcula os modelos e começa a aceitar conexões."""
+        start = time.perf_counter()
+        models = self._refresh()
+        await self._warm(models)
+        logger.info(f"{len(models)} modelos carregados e pré-calculados em "
+                    f"{time.perf_counter() - start:.2f}s")
+        self._watcher = asyncio.create_task(self._watch())
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info(f"Servindo previsões em http://{host}:{port}")
+        return self._server
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, **kwargs):
+    """Executa o `ForecastServer` até ser interrompido."""
+    server = ForecastServer(**kwargs)
+    await server.start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        logger.info(f"Estatísticas finais: {server.stats()}")
+        await server.close()
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def main(
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        models_dir: Path = MODELS_DIR,
+        batch_window_ms: float = 2.0,
+        max_batch: int = 256,
+        precompute_horizon: int = 30,
+        poll_interval: float = 1.0,
+        response_cache_size: int = 4096,
+        interval_samples: int = 1000
+    ):
+        try:
+            asyncio.run(serve(host, port, models_dir=models_dir, batch_window_ms=batch_window_ms,
+                              max_batch=max_batch, precompute_horizon=precompute_horizon,
+                              poll_interval=poll_interval, response_cache_size=response_cache_size,
+                              interval_samples=interval_samples))
+        except KeyboardInterrupt:
+            logger.success("Servidor encerrado")
+
+    configure_logging()
+    app()
@@ -0,0 +1,158 @@
+# forecasting_workflow_engine/modeling/study_store.py
+import hashlib
+import json
+from pathlib import Path
+
+from loguru import logger
+import numpy as np
+
+from forecasting_workflow_engine.config import CACHE_DIR
+
+STUDY_FILE = CACHE_DIR / "optuna" / "studies.journal"
+
+
+# -------------------------------
+# Armazenamento
+# -------------------------------
+def get_storage(path=None):
+    """
+    Storage persistente do Optuna em arquivo journal (append-only, seguro entre
+    processos e sem depender de banco de dados). Padrão: `CACHE_DIR/optuna`.
+    Uma URL ("sqlite:///...") é repassada ao Optuna como está.
+    """
+    if isinstance(path, str) and "://" in path:
+        return path
+    from optuna.storages import JournalStorage
+    from optuna.storages.journal import JournalFileBackend
+
+    path = STUDY_FILE if path is None else Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return JournalStorage(JournalFileBackend(str(path)))
+
+
+def series_features(y) -> dict:
+    """Descritores simples da série, usados para achar estudos de séries parecidas."""
+    y = np.asarray(y, dtype=float)
+    y = y[np.isfinite(y)]
+    diff = np.diff(y)
+    acf1 = 0.0
+    if len(diff) > 2 and diff.std() > 0:
+        acf1 = float(np.corrcoef(diff[:-1], diff[1:])[0, 1])
+    return {
+        "log_n": float(np.log(max(len(y), 1))),
+        "cv": float(y.std() / (abs(y.mean()) + 1e-12)) if len(y) else 0.0,
+        "acf1": acf1,
+    }
+
+
+def study_key(kind: str, dataset: str, y, **config) -> str:
+    """
+    Nome do estudo: '<modelo>:<dataset>:<digest>'. O digest cobre os dados e a
+    configuração que definem o objetivo (folds, sazonalidades, intervalos), então
+    retreinos com os mesmos dados continuam o mesmo estudo e dados novos abrem outro.
+    """
+    digest = hashlib.sha1(np.ascontiguousarray(y, dtype=float).tobytes())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return f"{kind}:{dataset}:{digest.hexdigest()[:12]}"
+
+
+# -------------------------------
+# Warm start
+# -------------------------------
+def _feature_distance(a: dict, b: dict) -> float:
+    return sum((a[k] - b.get(k, np.inf)) ** 2 for k in a) ** 0.5
+
+
+def _source_study(storage, name: str, features: dict):
+    """
+    Estudo de onde copiar os melhores trials: o mais recente do mesmo modelo e
+    dataset; sem ele, o de série mais parecida (`series_features`) do mesmo modelo.
+    """
+    import optuna
+
+    kind, dataset, _ = name.split(":", 2)
+    candidates = [s for s in optuna.get_all_study_summaries(storage, include_best_trial=False)
+                  if s.study_name != name and s.study_name.startswith(f"{kind}:")
+                  and "features" in s.user_attrs]
+    same = [s for s in candidates if s.study_name.startswith(f"{kind}:{dataset}:")]
+    if same:
+        return max(same, key=lambda s: s.datetime_start).study_name
+    if candidates:
+        closest = min(candidates,
+                      key=lambda s: _feature_distance(features, s.user_attrs["features"]))
+        return closest.study_name
+    return None
+
+
+def open_study(name: str, y, storage=None, n_seed: int = 3, **create_kwargs):
+    """
+    Abre (ou cria) o estudo persistente `name`. Um estudo novo recebe, via
+    `enqueue_trial`, os `n_seed` melhores trials do estudo de origem
+    (`_source_study`), que são avaliados primeiro nos dados atuais.
+
+    Returns:
+        tuple: (study, nome do estudo de origem ou None, trials semeados)
+    """
+    import optuna
+
+    storage = get_storage(storage)
+    study = optuna.create_study(study_name=name, storage=storage, load_if_exists=True,
+                                **create_kwargs)
+    if study.trials:
+        logger.info(f"Estudo '{name}' retomado com {len(study.trials)} trials")
+        return study, None, 0
+
+    features = series_features(y)
+    study.set_user_attr("features", features)
+    source = _source_study(storage, name, features)
+    if source is None:
+        return study, None, 0
+
+    complete = optuna.load_study(study_name=source, storage=storage).get_trials(
+        deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+    seeds = {json.dumps(t.params, sort_keys=True): t.params
+             for t in sorted(complete, key=lambda t: t.value)}
+    seeds = list(seeds.values())[:n_seed]
+    for params in seeds:
+        study.enqueue_trial(params, skip_if_exists=True)
+    logger.info(f"Estudo '{name}' semeado com {len(seeds)} trials de '{source}'")
+    return study, source, len(seeds)
+
+
+# -------------------------------
+# Parada adaptativa
+# -------------------------------
+class PlateauStopper:
+    """
+    Sinaliza parada quando o melhor valor não melhora mais que `min_delta`
+    (relativo) em `patience` trials seguidos (trials podados contam como sem melhora).
+    Pode ser usado como callback de `study.optimize` ou consultado com
+    `should_stop(study)` no laço ask/tell.
+    """
+
+    def __init__(self, patience: int = 5, min_delta: float = 1e-3):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.stopped = False
+
+    def should_stop(self, study) -> bool:
+        if not self.patience:
+            return False
+        from optuna.trial import TrialState
+
+        best, since = None, 0
+        for trial in study.get_trials(deepcopy=False,
+                                      states=(TrialState.COMPLETE, TrialState.PRUNED)):
+            value = trial.value if trial.state == TrialState.COMPLETE else None
+            if value is not None and (best is None or value < best - self.min_delta * abs(best)):
+                best, since = value, 0
+            else:
+                since += 1
+        self.stopped = best is not None and since >= self.patience
+        return self.stopped
+
+    def __call__(self, study, trial):
+        if self.should_stop(study):
+            logger.info(f"Estudo '{study.study_name}' estabilizou: sem melhora em "
+                        f"{self.patience} trials")
+            study.stop()
@@ -1,71 +1,173 @@
-from pmdarima import auto_arima
-import os
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
 import pandas as pd
 from loguru import logger
-import joblib
-import matplotlib.pyplot as plt
 
 from forecasting_workflow_engine.dataset import fetch_dataset
-from forecasting_workflow_engine.get_model import get_prophet_model
+from forecasting_workflow_engine.get_model import (
+    get_prophet_model,
+    load_backend,
+    prophet_fit_iterations,
+)
+from forecasting_workflow_engine.modeling.baselines import (
+    METHOD_PARAMS as BASELINE_METHODS,
+    SEASONAL_METHODS,
+)
 from forecasting_workflow_engine.modeling.evaluator import evaluate_forecast
+from forecasting_workflow_engine.modeling.fast_predict import prophet_point_forecast
 from forecasting_workflow_engine.modeling.hyperparam_optimization import optimize_prophet_params
+from forecasting_workflow_engine.modeling.serialization import save_model
 from forecasting_workflow_engine.plots import plot_forecast
+from forecasting_workflow_engine.profiling import reset as reset_spans, span, timed
+from forecasting_workflow_engine.stage_cache import StageCache, fingerprint
+from forecasting_workflow_engine.spectral import (
+    detect_seasonal_period,
+    prophet_seasonality,
+    arima_seasonality,
+)
 from forecasting_workflow_engine.experiments.mlflow_utils import (
     start_experiment,
+    end_run,
     log_metrics,
-    log_figure,
+    log_figure_async,
+    log_artifact,
     log_dataframe,
     log_dict,
-    log_model_file
+    log_model_file,
 )
-from forecasting_workflow_engine.config import MODELS_DIR
+from forecasting_workflow_engine.config import MODELS_DIR, configure_logging
 import warnings
 
 warnings.filterwarnings("ignore", category=FutureWarning,
                         message=".*force_all_finite.*")
 
+EXPERIMENT_NAME = "Forecasting"
+
+
+def _timestamped(fit):
+    """Envolve a etapa de ajuste para que o instante do ajuste seja guardado no cache com ela."""
+    def run():
+        return (*fit(), datetime.now(timezone.utc).isoformat())
+    return run
 
+
+def model_metadata(dataset_name: str, y_true, y_pred, last_date=None, n_updates: int = 0) -> dict:
+    """
+    Metadados salvos junto ao modelo: usados por `update()` para detectar drift
+    (RMSE de referência) e agendar o retreino completo. Só dependem dos dados e do
+    ajuste: um reajuste com o mesmo resultado gera um arquivo idêntico, que o
+    `ArtifactStore` não guarda de novo (o instante do ajuste vai para o run, no
+    parâmetro `model_trained_at`).
+    """
+    y_true, y_pred = np.asarray(y_true, dtype=float), np.asarray(y_pred, dtype=float)
+    return {
+        "dataset": dataset_name,
+        "n_obs": int(len(y_true)),
+        "n_updates": n_updates,
+        "last_date": None if last_date is None else pd.Timestamp(last_date).isoformat(),
+        "rmse": float(np.sqrt(np.nanmean((y_true - y_pred) ** 2))),
+    }
+
+
+@timed("train")
 def train(
     dataset_name: str,
     model_type: str = "Prophet",
     optimize_params: bool = True,
-    n_trials: int = 20
+    n_trials: int = 20,
+    n_jobs: int = 1,
+    detect_seasonality: bool = True,
+    persist_study: bool = True,
+    patience: int = 5,
+    force: bool = False
 ) -> dict:
     """
-    Treina Prophet ou AutoARIMA e registra logs no MLflow.
+    Treina Prophet, AutoARIMA ou um baseline clássico (`model_type` = "naive",
+    "snaive", "drift", "ses", "holt" ou "holt_winters"; ver `baselines`) e registra
+    logs no MLflow.
+    `n_jobs` controla quantos processos a otimização do Prophet usa (-1 = todos os núcleos);
+    os trials são sequenciais e só os folds da validação cruzada correm em paralelo,
+    então valores acima do número de folds não aceleram nada.
+    Com `detect_seasonality`, o período sazonal é estimado pelo espectro da série e
+    define as sazonalidades do Prophet, o `m` do AutoARIMA e o período dos baselines;
+    sem período, "snaive" e "holt_winters" são ajustados como "naive" e "holt".
+    Com `persist_study`, o estudo do Optuna fica em `CACHE_DIR/optuna` e é retomado
+    (ou semeado) nos retreinos; `patience` encerra a busca quando o MSE estabiliza.
+    Sazonalidade, estudo, ajuste/previsão e gráfico passam pelo `StageCache`:
+    com os mesmos dados, parâmetros, código e bibliotecas, as etapas vêm do cache
+    (`force=True` recalcula tudo) e os acertos/faltas são logados como `cache_*`.
+    Com a coleta de spans ligada (`profiling.enable()` ou FWE_PROFILE=1), o tempo e
+    a memória de cada etapa são logados como métricas `stage_*` ao encerrar o run
+    (`end_run`).
     """
+    # Spans de treinos anteriores no mesmo processo (workers do `train_many`, `update()`)
+    reset_spans()
+
     # --- Carrega dataset ---
     X, y = fetch_dataset(dataset_name)
     if "ds" not in X.columns:
         X = pd.DataFrame({"ds": X.iloc[:, 0]})
     y_series = y.squeeze()
+    cache = StageCache(force=force)
+    data_key = fingerprint(X["ds"].to_numpy(), y_series.to_numpy())
 
     # --- Inicia experimento MLflow seguro ---
     run_name = f"{dataset_name}_{model_type}"
-    start_experiment("Forecasting", run_name=run_name)
+    start_experiment(EXPERIMENT_NAME, run_name=run_name)
+
+    # --- Sazonalidade via espectro ---
+    period = None
+    if detect_seasonality:
+        with span("seasonality"):
+            period, energy_ratio = cache.run(
+                "seasonality", lambda: detect_seasonal_period(y_series.values), data_key)
+        logger.info(f"Período sazonal detectado: {period} (energia do pico: {energy_ratio:.2f})")
+        log_dict({"seasonal_period": period, "energy_ratio": energy_ratio}, "seasonality")
 
     # --- Treinamento ---
     if model_type.lower() == "prophet":
         logger.info("Treinando Prophet...")
 
         # Otimização de hiperparâmetros
-        prophet_params = None
+        seasonality = prophet_seasonality(X["ds"], period) if detect_seasonality else None
+        prophet_params, stan_init = None, None
         if optimize_params:
-            prophet_params = optimize_prophet_params(pd.DataFrame({"ds": X["ds"], "y": y_series}),
-                                                     n_trials=n_trials)
+            prophet_params, study_report = cache.run(
+                "optimize", lambda: optimize_prophet_params(
+                    pd.DataFrame({"ds": X["ds"], "y": y_series}),
+                    n_trials=n_trials, n_jobs=n_jobs, seasonality=seasonality,
+                    dataset=dataset_name if persist_study else None, patience=patience,
+                    return_report=True),
+                data_key, "prophet", n_trials, seasonality, persist_study, patience)
             logger.info(f"Hiperparâmetros ótimos: {prophet_params}")
+            # Parâmetros do Stan do melhor trial (último fold): aquecem o ajuste final
+            stan_init = study_report.get("stan_init")
+            log_metrics({f"study_{k}": v for k, v in study_report.items() if k != "stan_init"})
+
+        def fit_prophet():
+            model = get_prophet_model(params=prophet_params, seasonality=seasonality)
+            df_train = pd.DataFrame({"ds": X["ds"], "y": y_series})
+            with span("fit", model="prophet", warm=stan_init is not None):
+                model.fit(df_train, **({"init": stan_init} if stan_init is not None else {}))
+            # Só `yhat` é usado: sem a simulação de incerteza do `predict()`
+            with span("predict", model="prophet"):
+                y_pred = prophet_point_forecast(model, df_train["ds"])
+            return model, y_pred
 
-        model = get_prophet_model(params=prophet_params)
-        df_train = pd.DataFrame({"ds": X["ds"], "y": y_series})
-        model.fit(df_train)
-        forecast = model.predict(df_train)
-        y_pred = forecast["yhat"]
+        model, y_pred, trained_at = cache.run("fit", _timestamped(fit_prophet), data_key,
+                                              "prophet", prophet_params, seasonality, stan_init)
+        iterations = prophet_fit_iterations(model)
+        if iterations is not None:
+            log_metrics({"fit_stan_iterations": iterations})
 
         # Salva modelo
-        model_file = os.path.join(
-            MODELS_DIR, f"{dataset_name}_prophet_model.pkl")
-        joblib.dump(model, model_file)
-        log_model_file(model_file, artifact_name="prophet_model.pkl")
+        with span("save_model"):
+            model_file = save_model(model, MODELS_DIR / f"{dataset_name}_prophet_model.json.gz",
+                                    metadata=model_metadata(dataset_name, y_series, y_pred,
+                                                            X["ds"].max()))
+        log_model_file(str(model_file), artifact_name="prophet_model")
 
         # Loga parâmetros
         log_dict(prophet_params or {}, "prophet_params")
@@ -74,29 +176,71 @@ def train(
         logger.info("Treinando AutoARIMA...")
 
         # AutoARIMA
-        model_fit = auto_arima(
-            y_series.values,
-            start_p=1, start_q=1, max_p=5, max_q=5,
-            seasonal=False, stepwise=True, suppress_warnings=True,
-            error_action='ignore'
-        )
-        y_pred = model_fit.predict_in_sample()
+        seasonal_args = arima_seasonality(period) if detect_seasonality else {"seasonal": False}
+
+        def fit_arima():
+            auto_arima = load_backend("autoarima")
+            with span("fit", model="autoarima"):
+                model_fit = auto_arima(
+                    y_series.values,
+                    start_p=1, start_q=1, max_p=5, max_q=5,
+                    **seasonal_args, stepwise=True, suppress_warnings=True,
+                    error_action='ignore'
+                )
+            with span("predict", model="autoarima"):
+                y_pred = model_fit.predict_in_sample()
+            return model_fit, y_pred
+
+        model_fit, y_pred, trained_at = cache.run("fit", _timestamped(fit_arima), data_key,
+                                                  "autoarima", seasonal_args)
 
         # Salva modelo
-        model_file = os.path.join(
-            MODELS_DIR, f"{dataset_name}_autoarima_model.pkl")
-        joblib.dump(model_fit, model_file)
-        log_model_file(model_file, artifact_name="autoarima_model.pkl")
+        with span("save_model"):
+            model_file = save_model(model_fit,
+                                    MODELS_DIR / f"{dataset_name}_autoarima_model.json.gz",
+                                    metadata=model_metadata(dataset_name, y_series, y_pred,
+                                                            X["ds"].max()))
+        log_model_file(str(model_file), artifact_name="autoarima_model")
 
         # Loga parâmetros
         log_dict({"order": model_fit.order,
                  "seasonal_order": model_fit.seasonal_order}, "autoarima_params")
 
+    elif model_type.lower() in BASELINE_METHODS:
+        name = method = model_type.lower()
+        if method in SEASONAL_METHODS and not period:
+            # Sem período (não detectado ou detecção desligada): como o ARIMA, ajusta
+            # sem sazonalidade; o arquivo mantém o nome pedido
+            method = SEASONAL_METHODS[method]
+            logger.warning(f"Sem período sazonal para '{name}': usando '{method}'")
+        logger.info(f"Treinando baseline {method}...")
+
+        def fit_baseline():
+            model = load_backend(method)(season_length=period)
+            with span("fit", model=method):
+                model.fit(y_series.to_numpy(dtype=float))
+            return model, model.fitted_[0]
+
+        model, y_pred, trained_at = cache.run("fit", _timestamped(fit_baseline), data_key,
+                                              method, period)
+
+        # Salva modelo
+        with span("save_model"):
+            model_file = save_model(model, MODELS_DIR / f"{dataset_name}_{name}_model.json.gz",
+                                    metadata=model_metadata(dataset_name, y_series, y_pred,
+                                                            X["ds"].max()))
+        log_model_file(str(model_file), artifact_name=f"{name}_model")
+        log_dict({"method": method, "season_length": period, **model.get_params()},
+                 f"{name}_params")
+
     else:
         raise ValueError(f"Modelo '{model_type}' não suportado.")
+    # Instante do ajuste (guardado no cache com ele) fica no run, fora do arquivo do modelo
+    log_dict({"trained_at": trained_at}, "model")
 
     # --- Avaliação ---
-    metrics = evaluate_forecast(y_series.values, y_pred)
+    with span("metrics"):
+        metrics = evaluate_forecast(y_series.values, y_pred)
     log_metrics(metrics)
 
     # --- Log dataset e schema ---
@@ -105,10 +249,18 @@ def train(
     log_dict({col: str(dtype)
              for col, dtype in X.dtypes.items()}, "dataset_schema")
 
-    # --- Gráfico previsão vs real ---
-    fig = plot_forecast(X, y_series, y_pred,
-                        title=f"{dataset_name} - {model_type} Forecast")
-    log_figure(fig, "forecast_plot.png")
+    # --- Gráfico previsão vs real (renderizado na thread de logging) ---
+    # O envio termina no `end_run()` (ou na saída do processo)
+    title = f"{dataset_name} - {model_type} Forecast"
+    plot_file, plot_cached = cache.file("plot", "forecast_plot.png", data_key,
+                                        np.asarray(y_pred, dtype=float), title)
+    if plot_cached:
+        log_artifact(plot_file, stored=True)
+    else:
+        log_figure_async(partial(plot_forecast, X, y_series, np.asarray(y_pred), title=title),
+                         "forecast_plot.png", save_to=plot_file, stored=True)
+
+    log_metrics(cache.report())
 
     logger.success("Treinamento concluído")
     return metrics
@@ -127,12 +279,21 @@ if __name__ == "__main__":
         dataset_name: str = "air_passengers",
         model_type: str = "Prophet",
         optimize_params: bool = True,
-        n_trials: int = 20
+        n_trials: int = 20,
+        n_jobs: int = 1,
+        detect_seasonality: bool = True,
+        persist_study: bool = True,
+        patience: int = 5,
+        force: bool = False
     ):
         logger.info(
             f"Iniciando treinamento: {dataset_name} | Modelo: {model_type}")
         metrics = train(dataset_name=dataset_name, model_type=model_type,
-                        optimize_params=optimize_params, n_trials=n_trials)
+                        optimize_params=optimize_params, n_trials=n_trials, n_jobs=n_jobs,
+                        detect_seasonality=detect_seasonality, persist_study=persist_study,
+                        patience=patience, force=force)
+        end_run()
         logger.success(f"Métricas finais: {metrics}")
 
+    configure_logging()
     app()
@@ -0,0 +1,167 @@
+# forecasting_workflow_engine/modeling/update.py
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.config import MODELS_DIR, configure_logging
+from forecasting_workflow_engine.dataset import append_observations, fetch_dataset
+from forecasting_workflow_engine.experiments.mlflow_utils import end_run
+from forecasting_workflow_engine.get_model import get_prophet_model, prophet_stan_init
+from forecasting_workflow_engine.modeling.predict import resolve_model_path
+from forecasting_workflow_engine.modeling.serialization import load_model, save_model
+from forecasting_workflow_engine.modeling.train import train
+
+# Configuração do Prophet reaproveitada no ajuste incremental
+_PROPHET_CONFIG = (
+    "growth", "n_changepoints", "changepoint_range", "yearly_seasonality",
+    "weekly_seasonality", "daily_seasonality", "seasonality_mode",
+    "seasonality_prior_scale", "changepoint_prior_scale", "holidays_prior_scale",
+    "mcmc_samples", "interval_width", "uncertainty_samples",
+)
+
+
+def _model_prefix(dataset_name: str, model_type: str) -> str:
+    suffix = {"prophet": "prophet", "arima": "autoarima"}[model_type.lower()]
+    return f"{dataset_name}_{suffix}"
+
+
+def _append_arima(forecaster, y_new: np.ndarray):
+    """
+    Acrescenta observações ao estado do ARIMA sem reestimar ordem nem parâmetros.
+
+    `extend` parte do estado previsto ao fim da amostra (inicialização "known"), que é o
+    que o modelo restaurado guarda; `append` reinicializaria o filtro sobre o histórico
+    curto salvo. O `trend_offset` continua a contagem do tempo da tendência.
+    """
+    res = getattr(forecaster.model, "arima_res_", forecaster.model)
+    return res.extend(y_new, trend_offset=res.model.trend_offset + res.nobs)
+
+
+def _warm_start_prophet(forecaster, dataset_name: str):
+    """Reajusta o Prophet no histórico completo partindo dos parâmetros anteriores."""
+    old = forecaster.model
+    X, y = fetch_dataset(dataset_name)
+    df_train = pd.DataFrame({"ds": X.iloc[:, 0], "y": y.to_numpy()})
+    # Sazonalidades customizadas (ex.: detectadas pelo espectro) não fazem parte da config
+    extra = [{"name": name, **{key: s[key] for key in ("period", "fourier_order", "prior_scale",
+                                                       "mode", "condition_name")}}
+             for name, s in old.seasonalities.items() if name not in ("yearly", "weekly", "daily")]
+    model = get_prophet_model({name: getattr(old, name) for name in _PROPHET_CONFIG},
+                              seasonality={"extra_seasonalities": extra})
+    model.fit(df_train, init=prophet_stan_init(old))
+    return model
+
+
+def update(
+    dataset_name: str,
+    new_rows: pd.DataFrame,
+    model_type: str = "Arima",
+    drift_threshold: float = 3.0,
+    max_updates: int = 30
+) -> dict:
+    """
+    Atualiza o modelo salvo com novas observações sem retreinar do zero.
+
+    - ARIMA: as observações são acrescentadas ao estado do modelo (filtro de Kalman),
+      mantendo ordem e parâmetros.
+    - Prophet: novo ajuste no histórico completo iniciado dos parâmetros anteriores.
+
+    Um retreino completo (`train()` sem otimização) é feito quando o RMSE da previsão
+    do modelo atual sobre as novas observações passa de `drift_threshold` vezes o RMSE
+    de referência do treino (drift), ou quando o modelo já recebeu `max_updates`
+    atualizações incrementais.
+
+    Args:
+        dataset_name: nome do dataset em `DATASET_MAP`.
+        new_rows: DataFrame com a data na primeira coluna e o valor na segunda.
+        model_type: "Arima" ou "Prophet".
+        drift_threshold: múltiplo do RMSE de referência que caracteriza drift.
+        max_updates: número de atualizações incrementais antes de um retreino completo.
+
+    Returns:
+        dict: modo usado ("append", "warm_start" ou "full_retrain"), latência e diagnóstico.
+    """
+    start = time.perf_counter()
+    model_path = resolve_model_path(_model_prefix(dataset_name, model_type))
+    forecaster = load_model(model_path)
+    metadata = forecaster.metadata
+    n_updates = metadata.get("n_updates", 0) + 1
+
+    # O CSV do dataset é compartilhado entre modelos; o que é "novo" para este modelo
+    # é decidido pela última data vista no treino/atualização anterior
+    appended = append_observations(dataset_name, new_rows)
+    if metadata.get("last_date"):
+        dates = pd.to_datetime(new_rows.iloc[:, 0])
+        appended = new_rows[(dates > pd.Timestamp(metadata["last_date"])).to_numpy()]
+    y_new = appended.iloc[:, 1].to_numpy(dtype=float)
+    if len(y_new) == 0:
+        logger.info(f"Nenhuma observação nova para '{dataset_name}'")
+        return {"dataset": dataset_name, "model_type": model_type, "mode": "noop", "n_new": 0,
+                "forecast_rmse": None, "drift": False, "latency_s": time.perf_counter() - start}
+
+    # --- Drift: erro da previsão atual sobre as novas observações ---
+    forecast_rmse = float(np.sqrt(np.mean((forecaster.forecast(len(y_new)) - y_new) ** 2)))
+    reference_rmse = metadata.get("rmse")
+    drift = reference_rmse is not None and forecast_rmse > drift_threshold * reference_rmse
+
+    if drift or n_updates > max_updates:
+        reason = "drift" if drift else "agendamento"
+        logger.warning(f"Retreino completo de '{dataset_name}' ({reason})")
+        train(dataset_name=dataset_name, model_type=model_type, optimize_params=False)
+        end_run()
+        mode = "full_retrain"
+    else:
+        if forecaster.backend == "arima":
+            model = _append_arima(forecaster, y_new)
+            mode = "append"
+        else:
+            model = _warm_start_prophet(forecaster, dataset_name)
+            mode = "warm_start"
+        # Modelos antigos sem RMSE de referência passam a usar o erro desta atualização
+        metadata = {"rmse": forecast_rmse, **metadata, "n_updates": n_updates,
+                    "n_obs": metadata.get("n_obs", 0) + len(y_new),
+                    "last_date": pd.to_datetime(appended.iloc[:, 0]).max().isoformat(),
+                    "updated_at": datetime.now(timezone.utc).isoformat()}
+        save_model(model, MODELS_DIR / f"{_model_prefix(dataset_name, model_type)}_model.json.gz",
+                   metadata=metadata)
+
+    result = {
+        "dataset": dataset_name,
+        "model_type": model_type,
+        "mode": mode,
+        "n_new": int(len(y_new)),
+        "forecast_rmse": forecast_rmse,
+        "drift": bool(drift),
+        "latency_s": time.perf_counter() - start,
+    }
+    logger.info(f"Atualização concluída: {result}")
+    return result
+
+
+# -------------------------------
+# Executável via terminal
+# -------------------------------
+if __name__ == "__main__":
+    from pathlib import Path
+
+    import typer
+
+    app = typer.Typer()
+
+    @app.command()
+    def main(
+        dataset_name: str = "covid_us",
+        new_rows_file: Path = typer.Option(..., help="CSV com data e valor das novas observações"),
+        model_type: str = "Arima",
+        drift_threshold: float = 3.0,
+        max_updates: int = 30
+    ):
+        result = update(dataset_name, pd.read_csv(new_rows_file), model_type=model_type,
+                        drift_threshold=drift_threshold, max_updates=max_updates)
+        logger.success(f"Latência da atualização: {result['latency_s']:.3f}s ({result['mode']})")
+
+    configure_logging()
+    app()
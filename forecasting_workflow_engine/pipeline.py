@@ -1,15 +1,37 @@
 from loguru import logger
+from forecasting_workflow_engine import profiling
+from forecasting_workflow_engine.experiments.mlflow_utils import end_run
 from forecasting_workflow_engine.modeling.train import train
 
 def run_pipeline(dataset_name: str, model_type: str = "Prophet",
-                 optimize_params: bool = True, n_trials: int = 20):
+                 optimize_params: bool = True, n_trials: int = 20, n_jobs: int = 1,
+                 detect_seasonality: bool = True, persist_study: bool = True, patience: int = 5,
+                 profile: bool = False, trace_file=None, force: bool = False):
+    """
+    Executa o treinamento de ponta a ponta. Etapas cujas entradas não mudaram vêm do
+    cache de etapas (`stage_cache`); `force` recalcula tudo. Com `profile` (ou `trace_file`), as
+    etapas são instrumentadas e, com `trace_file`, exportadas em formato Chrome Trace
+    (incluindo a renderização do gráfico e os uploads ao MLflow). `persist_study` e
+    `patience` são repassados ao `train()` (estudo persistente e parada por estabilização).
+    """
     logger.info(f"Iniciando pipeline: {dataset_name} | Modelo: {model_type}")
+    if profile or trace_file:
+        profiling.enable()
     metrics = train(dataset_name=dataset_name, model_type=model_type,
-                    optimize_params=optimize_params, n_trials=n_trials)
+                    optimize_params=optimize_params, n_trials=n_trials, n_jobs=n_jobs,
+                    detect_seasonality=detect_seasonality, persist_study=persist_study,
+                    patience=patience, force=force)
+    end_run()
+    if trace_file:
+        logger.info(f"Trace das etapas salvo em {profiling.export_chrome_trace(trace_file)}")
     logger.success(f"Pipeline concluído. Métricas finais: {metrics}")
     return metrics
 
 if __name__ == "__main__":
+    from pathlib import Path
+    from typing import Optional
+
+    from forecasting_workflow_engine.config import configure_logging
     import typer
     app = typer.Typer()
 
@@ -18,8 +40,17 @@ if __name__ == "__main__":
         dataset_name: str = "air_passengers",
         model_type: str = "Prophet",
         optimize_params: bool = True,
-        n_trials: int = 20
+        n_trials: int = 20,
+        n_jobs: int = 1,
+        detect_seasonality: bool = True,
+        persist_study: bool = True,
+        patience: int = 5,
+        profile: bool = False,
+        trace_file: Optional[Path] = None,
+        force: bool = False
     ):
-        run_pipeline(dataset_name, model_type, optimize_params, n_trials)
+        run_pipeline(dataset_name, model_type, optimize_params, n_trials, n_jobs,
+                     detect_seasonality, persist_study, patience, profile, trace_file, force)
 
+    configure_logging()
     app()
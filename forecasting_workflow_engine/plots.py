@@ -1,25 +1,79 @@
 # plots.py
-import matplotlib.pyplot as plt
 import numpy as np
 from loguru import logger
-from scipy import signal
 
 
-def plot_forecast(df, y_true, y_pred, title="Forecast Plot"):
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """
+    Downsampling Largest-Triangle-Three-Buckets: escolhe `n_out` índices que preservam
+    o formato visual da série (picos e vales), em vez de amostrar a cada k pontos.
+
+    O primeiro e o último ponto são mantidos; cada bucket intermediário contribui com o
+    ponto que forma o maior triângulo com o ponto escolhido no bucket anterior e a
+    média do bucket seguinte. Pontos não finitos (ex.: o início NaN dos valores
+    ajustados dos baselines) não são desenhados e ficam de fora da seleção.
+
+    Returns:
+        np.ndarray: índices selecionados, em ordem crescente.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(finite) < len(y):
+        return finite[lttb(x[finite], y[finite], n_out)]
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    edges = np.append(edges, n)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2]
+        cx, cy = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if hi > lo else a
+        idx[i + 1] = a
+    return idx
+
+
+def plot_forecast(df, y_true, y_pred, title="Forecast Plot", max_points: int = 1000):
     """
     Gera um gráfico de previsão vs real e retorna a figura.
 
+    A figura é criada direto no canvas Agg (sem pyplot nem backend interativo), o que
+    permite renderizá-la fora da thread principal. Séries com mais de `max_points`
+    pontos são reduzidas por LTTB a esse orçamento (≈ largura da figura em pixels).
+
     Args:
         df: DataFrame com coluna 'ds'.
         y_true: Série real.
         y_pred: Série prevista.
         title: Título do gráfico.
+        max_points: pontos desenhados por linha (None desativa o downsampling).
     Returns:
         fig: Objeto matplotlib.figure.Figure
     """
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(df["ds"], y_true, label="Real")
-    ax.plot(df["ds"], y_pred, label="Predito")
+    import pandas as pd
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    ds = pd.to_datetime(df["ds"]).to_numpy()
+    y_true, y_pred = np.asarray(y_true, dtype=float), np.asarray(y_pred, dtype=float)
+    if max_points and len(ds) > max_points:
+        x = ds.astype("datetime64[ns]").astype(np.int64)
+        true_idx, pred_idx = lttb(x, y_true, max_points), lttb(x, y_pred, max_points)
+    else:
+        true_idx = pred_idx = slice(None)
+
+    fig = Figure(figsize=(10, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.plot(ds[true_idx], y_true[true_idx], label="Real")
+    ax.plot(ds[pred_idx], y_pred[pred_idx], label="Predito")
     ax.set_title(title)
     ax.set_xlabel("ds")
     ax.set_ylabel("y")
@@ -34,6 +88,8 @@ def plot_trend(y_series, window=12):
     """
     Plota a série original e a tendência estimada via média móvel.
     """
+    import matplotlib.pyplot as plt
+
     rolling_mean = y_series.rolling(window=window).mean()
     plt.figure(figsize=(12, 6))
     plt.plot(y_series, label="Original")
@@ -47,12 +103,8 @@ def plot_trend(y_series, window=12):
 
 
 # %%
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy import signal
-from loguru import logger
-
-def plot_periodogram(y_series, sampling_rate=1.0, title="Periodograma da Série Temporal", verbose=True):
+def plot_periodogram(y_series, sampling_rate=1.0, title="Periodograma da Série Temporal",
+                     verbose=True):
     """
     Plota e analisa o periodograma (densidade espectral de potência) de uma série temporal.
 
@@ -83,6 +135,9 @@ def plot_periodogram(y_series, sampling_rate=1.0, title="Periodograma da Série
     - **Distribuição uniforme** → indica ruído branco ou série não periódica.
     - **Baixa frequência dominante** → tendência ou ciclo de longo prazo.
     """
+    import matplotlib.pyplot as plt
+    from scipy import signal
+
     if hasattr(y_series, "values"):
         y_series = y_series.values
 
@@ -118,7 +173,8 @@ def plot_periodogram(y_series, sampling_rate=1.0, title="Periodograma da Série
         if energy_ratio > 0.4:
             interpretation = (
                 f"O gráfico mostra um pico dominante em frequência {dominant_freq:.3f}, "
-                f"indicando uma **sazonalidade forte** com período aproximado de {period:.2f} unidades de tempo."
+                f"indicando uma **sazonalidade forte** com período aproximado de "
+                f"{period:.2f} unidades de tempo."
             )
         elif 0.1 < energy_ratio <= 0.4:
             interpretation = (
@@ -127,8 +183,8 @@ def plot_periodogram(y_series, sampling_rate=1.0, title="Periodograma da Série
             )
         else:
             interpretation = (
-                "O espectro não apresenta picos marcantes, indicando uma série **dominada por ruído branco** "
-                "ou sem periodicidade clara."
+                "O espectro não apresenta picos marcantes, indicando uma série "
+                "**dominada por ruído branco** ou sem periodicidade clara."
             )
         logger.info(f"🧭 Interpretação automática: {interpretation}")
 
@@ -0,0 +1,187 @@
+# forecasting_workflow_engine/profiling.py
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Ativado por `enable()` ou pela variável de ambiente FWE_PROFILE=1
+_ENABLED = os.environ.get("FWE_PROFILE", "") not in ("", "0")
+_RECORDS = []
+_LOCK = threading.Lock()
+_STACK = threading.local()
+_ORIGIN_NS = time.perf_counter_ns()
+
+
+def enable(flag: bool = True):
+    """Liga (ou desliga) a coleta de spans no processo atual."""
+    global _ENABLED
+    _ENABLED = flag
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset():
+    """Descarta os spans já coletados."""
+    with _LOCK:
+        _RECORDS.clear()
+
+
+def records() -> list:
+    """Cópia dos spans concluídos (um dict por span)."""
+    with _LOCK:
+        return list(_RECORDS)
+
+
+def _cpu_seconds() -> float:
+    # Inclui filhos já aguardados (ex.: o CmdStan do Prophet)
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# -------------------------------
+# Spans
+# -------------------------------
+class _NullSpan:
+    """Span usado com a coleta desligada: não mede nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "start_ns", "cpu", "peak", "parent")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_STACK, "names", None)
+        if stack is None:
+            stack = _STACK.names = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.peak = _peak_rss_mb()
+        self.cpu = _cpu_seconds()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        cpu = _cpu_seconds() - self.cpu
+        peak = _peak_rss_mb()
+        _STACK.names.pop()
+        record = {
+            "name": self.name,
+            "parent": self.parent,
+            "start_s": (self.start_ns - _ORIGIN_NS) / 1e9,
+            "wall_s": (end_ns - self.start_ns) / 1e9,
+            "cpu_s": cpu,
+            "peak_rss_mb": peak,
+            "peak_rss_growth_mb": None if peak is None else peak - self.peak,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "error": exc_type.__name__ if exc_type else None,
+            **self.attrs,
+        }
+        with _LOCK:
+            _RECORDS.append(record)
+        return False
+
+
+def span(name: str, **attrs):
+    """
+    Mede uma etapa: tempo de parede, tempo de CPU (processo e filhos aguardados) e
+    pico de RSS do processo ao fim da etapa (com o quanto a etapa elevou esse pico).
+    Spans podem ser aninhados e usados em qualquer thread.
+
+    Com a coleta desligada retorna um contexto nulo compartilhado (custo de uma
+    chamada de função).
+
+        with span("fit", model="prophet"):
+            model.fit(df)
+    """
+    if not _ENABLED:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def timed(name: str = None):
+    """Decorador equivalente a envolver a função em `span(name)`."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -------------------------------
+# Exportação
+# -------------------------------
+def stage_metrics(prefix: str = "stage_") -> dict:
+    """
+    Agrega os spans por nome para logar como métricas do MLflow:
+    soma de parede e CPU, número de chamadas e maior pico de RSS.
+    """
+    metrics = {}
+    for record in records():
+        key = prefix + record["name"].replace(" ", "_")
+        metrics[f"{key}_wall_s"] = metrics.get(f"{key}_wall_s", 0.0) + record["wall_s"]
+        metrics[f"{key}_cpu_s"] = metrics.get(f"{key}_cpu_s", 0.0) + record["cpu_s"]
+        metrics[f"{key}_calls"] = metrics.get(f"{key}_calls", 0) + 1
+        if record["peak_rss_mb"] is not None:
+            metrics[f"{key}_peak_rss_mb"] = max(metrics.get(f"{key}_peak_rss_mb", 0.0),
+                                               record["peak_rss_mb"])
+    return metrics
+
+
+def export_chrome_trace(path) -> Path:
+    """
+    Grava os spans no formato Chrome Trace (eventos completos "X"), que pode ser
+    aberto em chrome://tracing ou no Perfetto.
+    """
+    reserved = {"name", "start_s", "wall_s", "pid", "tid"}
+    events = [{
+        "name": record["name"],
+        "ph": "X",
+        "ts": record["start_s"] * 1e6,
+        "dur": record["wall_s"] * 1e6,
+        "pid": record["pid"],
+        "tid": record["tid"],
+        "args": {k: v for k, v in record.items() if k not in reserved},
+    } for record in records()]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str))
+    return path
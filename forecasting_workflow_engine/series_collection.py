@@ -0,0 +1,197 @@
+# forecasting_workflow_engine/series_collection.py
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.config import CACHE_DIR, PROCESSED_DATA_DIR
+
+COLLECTION_CACHE_DIR = CACHE_DIR / "collections"
+
+# nome -> (arquivo, coluna do id, coluna de data, coluna de valor).
+# Coleções não registradas são procuradas em PROCESSED_DATA_DIR/<nome>.csv|.parquet
+# com as colunas padrão abaixo.
+COLLECTIONS = {}
+DEFAULT_COLUMNS = ("series_id", "timestamp", "value")
+
+
+class SeriesCollection:
+    """
+    Muitas séries em formato compacto: datas (int64 ns) e valores (float32) em dois
+    buffers contíguos, ordenados por série e data, e `offsets` com o início de cada
+    série (a série i ocupa `offsets[i]:offsets[i + 1]`). Acessar uma série devolve
+    views dos buffers, sem criar DataFrames.
+    """
+
+    def __init__(self, ids: list, offsets: np.ndarray, timestamps: np.ndarray, values: np.ndarray):
+        self.ids = list(ids)
+        self.offsets = offsets
+        self.timestamps = timestamps
+        self.values = values
+        self.index = {series_id: i for i, series_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, series_id) -> bool:
+        return series_id in self.index
+
+    def __iter__(self):
+        for series_id in self.ids:
+            yield (series_id, *self.series(series_id))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def series(self, series_id):
+        """(datas datetime64[ns], valores float32) da série, como views dos buffers."""
+        try:
+            i = self.index[series_id]
+        except KeyError:
+            raise KeyError(f"Série '{series_id}' não encontrada na coleção.") from None
+        window = slice(self.offsets[i], self.offsets[i + 1])
+        return self.timestamps[window].view("datetime64[ns]"), self.values[window]
+
+    def save(self, directory: Path, **meta):
+        """Grava os buffers como `.npy` e os ids/metadados em `collection.json`."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ("offsets", "timestamps", "values"):
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        (directory / "collection.json").write_text(json.dumps({"ids": self.ids, **meta}))
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: str = "r") -> "SeriesCollection":
+        directory = Path(directory)
+        meta = json.loads((directory / "collection.json").read_text())
+        buffers = (np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+                   for name in ("offsets", "timestamps", "values"))
+        return cls(meta["ids"], *buffers)
+
+
+# -------------------------------
+# Leitura em streaming
+# -------------------------------
+def _iter_chunks(path: Path, columns: list, chunksize: int):
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        id_col, time_col, value_col = columns
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize,
+                               dtype={id_col: str, time_col: str, value_col: np.float32})
+
+
+def read_long_format(
+    path,
+    id_col: str = "series_id",
+    time_col: str = "timestamp",
+    value_col: str = "value",
+    chunksize: int = 1_000_000
+) -> SeriesCollection:
+    """
+    Lê um arquivo longo (id, data, valor) em blocos e agrupa as linhas por série.
+
+    Em cada bloco só os valores distintos de data são convertidos (datas se repetem
+    entre séries), os ids viram códigos inteiros e os valores são lidos como float32.
+    Ao final, uma única ordenação por (série, data) produz os buffers contíguos;
+    o pico de memória é ~16 bytes por linha, sem um DataFrame por série.
+
+    Args:
+        path: arquivo .csv ou .parquet.
+        id_col, time_col, value_col: nomes das colunas.
+        chunksize: linhas por bloco.
+
+    Returns:
+        SeriesCollection
+    """
+    path = Path(path)
+    id_codes = {}
+    codes, stamps, values = [], [], []
+    for chunk in _iter_chunks(path, [id_col, time_col, value_col], chunksize):
+        time_codes, time_uniques = pd.factorize(chunk[time_col])
+        if len(time_uniques) == 0:
+            # Bloco sem nenhuma data: nada a indexar (e `time_codes` é todo -1)
+            continue
+        chunk_codes, chunk_ids = pd.factorize(chunk[id_col])
+        mapping = np.fromiter((id_codes.setdefault(str(i), len(id_codes)) for i in chunk_ids),
+                              dtype=np.int32, count=len(chunk_ids))
+        parsed = pd.to_datetime(time_uniques, format="ISO8601").to_numpy(dtype="datetime64[ns]")
+        chunk_stamps = parsed.view(np.int64)[time_codes]
+
+        keep = (chunk_codes >= 0) & (time_codes >= 0)
+        keep &= chunk_stamps != np.iinfo(np.int64).min  # NaT
+        codes.append(mapping[chunk_codes[keep]])
+        stamps.append(chunk_stamps[keep])
+        values.append(chunk[value_col].to_numpy(dtype=np.float32)[keep])
+
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int32)
+    stamps = np.concatenate(stamps) if stamps else np.empty(0, dtype=np.int64)
+    values = np.concatenate(values) if values else np.empty(0, dtype=np.float32)
+
+    order = np.lexsort((stamps, codes))
+    offsets = np.zeros(len(id_codes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(id_codes)), out=offsets[1:])
+    logger.info(f"{len(values)} linhas de {path.name} agrupadas em {len(id_codes)} séries")
+    return SeriesCollection(list(id_codes), offsets, stamps[order], values[order])
+
+
+# -------------------------------
+# Fonte de datasets
+# -------------------------------
+def _collection_source(name: str):
+    if name in COLLECTIONS:
+        path, *columns = COLLECTIONS[name]
+        return Path(path), columns
+    for suffix in (".parquet", ".csv"):
+        path = PROCESSED_DATA_DIR / f"{name}{suffix}"
+        if path.exists():
+            return path, list(DEFAULT_COLUMNS)
+    raise ValueError(f"Coleção '{name}' não encontrada em {PROCESSED_DATA_DIR}.")
+
+
+def register_collection(name: str, path, id_col: str = "series_id",
+                        time_col: str = "timestamp", value_col: str = "value"):
+    """Registra um arquivo longo como coleção, acessível como '<nome>:<id>' em `fetch_dataset`."""
+    COLLECTIONS[name.lower()] = (str(path), id_col, time_col, value_col)
+
+
+@lru_cache(maxsize=8)
+def _load_cached(path: Path, mtime_ns: int, size: int, columns: tuple) -> SeriesCollection:
+    """
+    Coleção pronta a partir do cache binário (memory-map), refeito quando o arquivo
+    de origem muda. Memoizado por (arquivo, mtime, tamanho).
+    """
+    cache_dir = COLLECTION_CACHE_DIR / path.stem
+    meta_file = cache_dir / "collection.json"
+    meta = json.loads(meta_file.read_text()) if meta_file.exists() else {}
+    version = (meta.get("mtime_ns"), meta.get("size"), meta.get("columns"))
+    if version != (mtime_ns, size, list(columns)):
+        read_long_format(path, *columns).save(cache_dir, mtime_ns=mtime_ns, size=size,
+                                              columns=list(columns), source=str(path))
+        logger.info(f"Cache da coleção {path.name} gravado em {cache_dir}")
+    return SeriesCollection.load(cache_dir)
+
+
+def load_collection(name: str) -> SeriesCollection:
+    """Coleção pelo nome: lida do arquivo longo na primeira vez, depois do cache."""
+    path, columns = _collection_source(name.lower())
+    stat = path.stat()
+    return _load_cached(path, stat.st_mtime_ns, stat.st_size, tuple(columns))
+
+
+def fetch_series(collection: str, series_id: str):
+    """(X, y) de uma série da coleção, no mesmo formato de `fetch_dataset`."""
+    ds, values = load_collection(collection).series(series_id)
+    return pd.DataFrame({"ds": np.array(ds)}), pd.Series(values.astype(float), name="y")
+
+
+def series_names(collection: str) -> list:
+    """Nomes '<coleção>:<id>' de todas as séries, prontos para `train_many`."""
+    return [f"{collection}:{series_id}" for series_id in load_collection(collection).ids]
@@ -0,0 +1,132 @@
+# forecasting_workflow_engine/spectral.py
+import numpy as np
+import pandas as pd
+
+# Acima deste tamanho o espectro é estimado por Welch (média de segmentos)
+WELCH_MIN_LENGTH = 4096
+
+
+def _prepare(Y, diff: int = 0) -> np.ndarray:
+    """
+    Matriz (séries x tempo) float, com NaN preenchidos pela média da série,
+    `diff` diferenciações e remoção de tendência linear por série (vetorizada).
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    if np.isnan(Y).any():
+        Y = np.where(np.isnan(Y), np.nanmean(Y, axis=1, keepdims=True), Y)
+    if diff:
+        Y = np.diff(Y, n=diff, axis=1)
+    t = np.arange(Y.shape[1], dtype=float)
+    t_c = t - t.mean()
+    slope = (Y - Y.mean(axis=1, keepdims=True)) @ t_c / (t_c @ t_c)
+    return Y - Y.mean(axis=1, keepdims=True) - slope[:, None] * t_c
+
+
+def batch_periodogram(Y, sampling_rate: float = 1.0, diff: int = 0, nperseg: int = None):
+    """
+    Densidade espectral de potência de várias séries de mesmo tamanho, sem gráficos.
+
+    Séries curtas usam o periodograma via rFFT em lote (uma FFT para a matriz inteira);
+    séries com mais de `WELCH_MIN_LENGTH` pontos usam Welch, que reduz a variância
+    do estimador. A frequência zero é descartada.
+
+    Args:
+        Y: vetor 1-D ou matriz (séries x tempo).
+        sampling_rate: taxa de amostragem.
+        diff: número de diferenciações antes da análise.
+        nperseg: tamanho dos segmentos do Welch (padrão: n // 8).
+
+    Returns:
+        tuple: (freqs [n_freqs], power [n_series, n_freqs])
+    """
+    Y = _prepare(Y, diff)
+    n = Y.shape[1]
+    if n > WELCH_MIN_LENGTH:
+        from scipy import signal
+
+        freqs, power = signal.welch(Y, fs=sampling_rate, nperseg=nperseg or n // 8,
+                                    detrend=False, axis=-1)
+    else:
+        freqs = np.fft.rfftfreq(n, d=1.0 / sampling_rate)
+        power = (2.0 / (sampling_rate * n)) * np.abs(np.fft.rfft(Y, axis=-1)) ** 2
+    return freqs[1:], power[:, 1:]
+
+
+def dominant_periods(Y, sampling_rate: float = 1.0, diff: int = 0,
+                     min_period: float = 2.0, max_period: float = None) -> dict:
+    """
+    Período dominante e fração de energia do pico para cada série.
+
+    Só são considerados períodos entre `min_period` e `max_period`
+    (padrão: metade do tamanho da série, ao menos dois ciclos observados).
+
+    Returns:
+        dict com arrays (uma posição por série): 'frequency', 'period' e 'energy_ratio'.
+    """
+    freqs, power = batch_periodogram(Y, sampling_rate, diff)
+    n = np.atleast_2d(Y).shape[1]
+    max_period = max_period or n / 2
+    periods = 1.0 / freqs
+    valid = (periods >= min_period) & (periods <= max_period)
+    masked = np.where(valid[None, :], power, -np.inf)
+    idx = np.argmax(masked, axis=1)
+    peak = power[np.arange(len(power)), idx]
+    total = power.sum(axis=1)
+    return {
+        "frequency": freqs[idx],
+        "period": periods[idx],
+        "energy_ratio": np.divide(peak, total, out=np.zeros_like(peak), where=total > 0),
+    }
+
+
+def detect_seasonal_period(y, min_energy: float = 0.1, diff: int = 1, **kwargs):
+    """
+    Detecta o período sazonal (em número de observações) de uma série. Por padrão a
+    série é diferenciada uma vez, para que a tendência não domine as baixas frequências.
+
+    Returns:
+        tuple: (período ou None quando o pico concentra menos que `min_energy` da
+        energia total, fração de energia do pico)
+    """
+    result = dominant_periods(y, diff=diff, **kwargs)
+    if result["energy_ratio"][0] < min_energy:
+        return None, float(result["energy_ratio"][0])
+    return int(round(result["period"][0])), float(result["energy_ratio"][0])
+
+
+# -------------------------------
+# Configuração dos modelos
+# -------------------------------
+_PROPHET_BUILTIN = {"daily_seasonality": 1.0, "weekly_seasonality": 7.0,
+                    "yearly_seasonality": 365.25}
+
+
+def prophet_seasonality(ds, period) -> dict:
+    """
+    Converte o período detectado (em observações) em sazonalidades do Prophet:
+    ativa a sazonalidade embutida correspondente (diária, semanal ou anual, com 10%
+    de tolerância) ou cria uma sazonalidade customizada; as demais ficam desligadas.
+    """
+    config = {name: False for name in _PROPHET_BUILTIN}
+    config["extra_seasonalities"] = []
+    if not period:
+        return config
+    step_days = pd.Series(pd.to_datetime(ds)).diff().median() / pd.Timedelta(days=1)
+    period_days = period * step_days
+    for name, days in _PROPHET_BUILTIN.items():
+        if abs(period_days - days) <= 0.1 * days:
+            config[name] = True
+            return config
+    config["extra_seasonalities"].append(
+        {"name": f"period_{period}", "period": float(period_days), "fourier_order": 5})
+    return config
+
+
+def arima_seasonality(period, max_m: int = 52) -> dict:
+    """
+    Argumentos sazonais do auto_arima. Períodos acima de `max_m` ficam sem termo
+    sazonal, pois o custo do SARIMA cresce rapidamente com m.
+    """
+    if period and 1 < period <= max_m:
+        return {"seasonal": True, "m": int(period)}
+    return {"seasonal": False}
@@ -0,0 +1,204 @@
+# forecasting_workflow_engine/stage_cache.py
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from forecasting_workflow_engine.config import CACHE_DIR
+
+STAGE_CACHE_DIR = CACHE_DIR / "stages"
+
+# Tamanho máximo do cache (MB); ao passar dele, as entradas usadas há mais tempo saem
+MAX_CACHE_MB = float(os.environ.get("FWE_STAGE_CACHE_MB", "1024"))
+
+# Bibliotecas cujas versões entram na chave de todas as etapas
+LIBRARIES = ("numpy", "pandas", "prophet", "pmdarima", "statsmodels", "optuna",
+             "scikit-learn", "torch")
+
+_VALUE_FILE = "value.pkl"
+
+
+# -------------------------------
+# Chaves
+# -------------------------------
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash do código-fonte do pacote: qualquer alteração invalida o cache."""
+    digest = hashlib.sha256()
+    package = Path(__file__).resolve().parent
+    for path in sorted(package.rglob("*.py")):
+        digest.update(str(path.relative_to(package)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def library_versions() -> dict:
+    versions = {}
+    for name in LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def _update(digest, obj):
+    if isinstance(obj, np.ndarray):
+        digest.update(f"ndarray{obj.dtype}{obj.shape}".encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(f"{type(obj).__name__}{list(getattr(obj, 'columns', [obj.name]))}".encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, dict):
+        digest.update(b"{")
+        for key in sorted(obj, key=str):
+            _update(digest, str(key))
+            _update(digest, obj[key])
+        digest.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"[")
+        for item in obj:
+            _update(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(json.dumps(obj, default=str).encode())
+
+
+def fingerprint(*inputs) -> str:
+    """sha256 de valores aninhados (arrays, DataFrames, dicts, listas, escalares)."""
+    digest = hashlib.sha256()
+    for obj in inputs:
+        _update(digest, obj)
+    return digest.hexdigest()
+
+
+# -------------------------------
+# Cache
+# -------------------------------
+class StageCache:
+    """
+    Cache local de etapas endereçado por conteúdo. A chave de cada etapa é o hash
+    do nome da etapa, das suas entradas, da versão do código (`code_version`) e
+    das versões das bibliotecas; passar a chave (ou a saída) de uma etapa como
+    entrada da seguinte faz com que só o que está a jusante de uma mudança seja
+    recalculado.
+
+    Cada entrada é um diretório `<etapa>/<chave>/` com o valor em pickle e/ou
+    arquivos gravados pela etapa. O mtime do diretório marca o último uso; quando o
+    total passa de `max_mb`, as entradas usadas há mais tempo são removidas.
+
+    Args:
+        root: diretório do cache.
+        max_mb: tamanho máximo em MB.
+        force: se True, recalcula todas as etapas (e regrava o cache).
+    """
+
+    def __init__(self, root: Path = STAGE_CACHE_DIR, max_mb: float = MAX_CACHE_MB,
+                 force: bool = False):
+        self.root = Path(root)
+        self.max_bytes = int(max_mb * 2 ** 20)
+        self.force = force
+        self.stats = {}
+
+    def key(self, stage: str, *inputs) -> str:
+        return fingerprint(stage, code_version(), library_versions(), *inputs)
+
+    def _entry(self, stage: str, key: str) -> Path:
+        return self.root / stage / key[:32]
+
+    def _count(self, stage: str, hit: bool, saved_s: float = 0.0):
+        stats = self.stats.setdefault(stage, {"hits": 0, "misses": 0, "saved_s": 0.0})
+        stats["hits" if hit else "misses"] += 1
+        stats["saved_s"] += saved_s
+
+    def run(self, stage: str, compute, *inputs):
+        """
+        Retorna a saída de `compute()` para estas entradas, do cache quando possível.
+        A saída precisa ser serializável com pickle.
+        """
+        entry = self._entry(stage, self.key(stage, *inputs))
+        value_file = entry / _VALUE_FILE
+        if not self.force and value_file.exists():
+            try:
+                with open(value_file, "rb") as f:
+                    doc = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                logger.warning(f"Entrada corrompida do cache ignorada: {entry}")
+            else:
+                os.utime(entry)
+                self._count(stage, True, doc["elapsed"])
+                return doc["value"]
+
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+        entry.mkdir(parents=True, exist_ok=True)
+        temp_file = entry / f".{_VALUE_FILE}.{os.getpid()}"
+        with open(temp_file, "wb") as f:
+            pickle.dump({"value": value, "elapsed": elapsed}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, value_file)
+        self._count(stage, False)
+        self.evict()
+        return value
+
+    def file(self, stage: str, file_name: str, *inputs) -> tuple:
+        """
+        Caminho de um arquivo produzido por uma etapa (ex.: um gráfico) e se ele já
+        existe no cache. Em caso de falta, a etapa deve gravá-lo nesse caminho.
+
+        Returns:
+            tuple: (Path, hit)
+        """
+        entry = self._entry(stage, self.key(stage, *inputs))
+        path = entry / file_name
+        hit = not self.force and path.exists()
+        if hit:
+            os.utime(entry)
+        else:
+            entry.mkdir(parents=True, exist_ok=True)
+            path.unlink(missing_ok=True)
+        self._count(stage, hit)
+        return path, hit
+
+    def _entries(self) -> list:
+        if not self.root.exists():
+            return []
+        return [entry for stage in self.root.iterdir() if stage.is_dir()
+                for entry in stage.iterdir() if entry.is_dir()]
+
+    def evict(self) -> int:
+        """Remove as entradas usadas há mais tempo até o cache caber em `max_bytes`."""
+        sizes = {entry: sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                 for entry in self._entries()}
+        total, removed = sum(sizes.values()), 0
+        for entry in sorted(sizes, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+            removed += 1
+        if removed:
+            logger.info(f"Cache de etapas: {removed} entradas antigas removidas")
+        return removed
+
+    def report(self) -> dict:
+        """Loga acertos/faltas por etapa e retorna os totais (para métricas do MLflow)."""
+        for stage, stats in self.stats.items():
+            status = "hit" if not stats["misses"] else "miss"
+            logger.info(f"Cache [{stage}]: {status} ({stats['hits']} hits, "
+                        f"{stats['misses']} misses)")
+        hits = sum(s["hits"] for s in self.stats.values())
+        misses = sum(s["misses"] for s in self.stats.values())
+        saved = sum(s["saved_s"] for s in self.stats.values())
+        logger.info(f"Cache de etapas: {hits} hits, {misses} misses, ~{saved:.1f}s economizados")
+        return {"cache_hits": hits, "cache_misses": misses, "cache_time_saved_s": saved}
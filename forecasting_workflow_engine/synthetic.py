@@ -0,0 +1,71 @@
+# forecasting_workflow_engine/synthetic.py
+import numpy as np
+import pandas as pd
+
+# Sazonalidades padrão (período em passos, amplitude) para séries diárias
+DEFAULT_SEASONALITIES = ((7.0, 5.0), (365.25, 10.0))
+
+
+def generate_series(
+    n_series: int = 1,
+    length: int = 365,
+    freq: str = "D",
+    start: str = "2000-01-01",
+    level: float = 100.0,
+    slope: float = 0.05,
+    seasonalities=DEFAULT_SEASONALITIES,
+    noise: float = 1.0,
+    n_changepoints: int = 3,
+    seed: int = None,
+    dtype=np.float64
+):
+    """
+    Gera séries sintéticas (tendência + várias sazonalidades + ruído + changepoints),
+    todas de uma vez em uma matriz (séries x tempo), sem acesso à rede.
+
+    A tendência é linear por partes: em `n_changepoints` posições aleatórias a
+    inclinação muda. Cada sazonalidade é uma senoide com o período dado (em passos)
+    e amplitude/fase sorteadas por série em torno da amplitude informada.
+    A matriz ocupa `n_series * length * itemsize` bytes; use `dtype=np.float32` para
+    os maiores tamanhos.
+
+    Args:
+        n_series: número de séries.
+        length: número de passos por série.
+        freq: frequência das datas (pandas).
+        start: primeira data.
+        level, slope: nível e inclinação iniciais médios.
+        seasonalities: pares (período, amplitude).
+        noise: desvio padrão do ruído gaussiano.
+        n_changepoints: mudanças de inclinação por série.
+        seed: semente do gerador.
+        dtype: tipo da matriz de saída.
+
+    Returns:
+        tuple: (ds: pd.DatetimeIndex [length], Y: np.ndarray [n_series, length])
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(length, dtype=dtype)
+    shape = (n_series, 1)
+
+    Y = (level * (1 + 0.1 * rng.standard_normal(shape))).astype(dtype)
+    Y = Y + (slope * (1 + 0.5 * rng.standard_normal(shape))).astype(dtype) * t
+    for _ in range(n_changepoints):
+        cut = rng.integers(1, max(length, 2), size=shape)
+        delta = (slope * rng.normal(0.0, 1.0, size=shape)).astype(dtype)
+        Y += delta * np.maximum(t - cut, 0)
+    for period, amplitude in seasonalities:
+        amp = (amplitude * rng.uniform(0.5, 1.5, size=shape)).astype(dtype)
+        phase = rng.uniform(0, 2 * np.pi, size=shape).astype(dtype)
+        Y += amp * np.sin(2 * np.pi * t / dtype(period) + phase)
+    if noise:
+        Y += rng.standard_normal((n_series, length), dtype=np.float32).astype(dtype) * dtype(noise)
+
+    ds = pd.date_range(start, periods=length, freq=freq)
+    return ds, Y
+
+
+def synthetic_frame(length: int = 365, seed: int = None, **kwargs) -> pd.DataFrame:
+    """Uma série sintética no formato do Prophet (colunas 'ds' e 'y')."""
+    ds, Y = generate_series(n_series=1, length=length, seed=seed, **kwargs)
+    return pd.DataFrame({"ds": ds, "y": Y[0]})
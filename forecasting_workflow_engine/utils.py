@@ -1,6 +1,4 @@
 # forecasting_workflow_engine/utils.py
-import torch
-
 def get_device(verbose: bool = True):
     """
     Retorna o dispositivo de execução disponível para PyTorch.
@@ -23,6 +21,8 @@ def get_device(verbose: bool = True):
     - PyTorch Documentation: https://pytorch.org/docs/stable/tensor_attributes.html#torch-device
     - Best practices for GPU usage in deep learning.
     """
+    import torch
+
     if torch.cuda.is_available():
         device = torch.device("cuda")
         if verbose: